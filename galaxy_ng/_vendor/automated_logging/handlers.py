@@ -1,8 +1,11 @@
 import re
+import sys
+import traceback
 from collections import OrderedDict
 from datetime import timedelta
-from logging import Handler, LogRecord
+from logging import Handler, LogRecord, raiseExceptions
 from pathlib import Path
+from queue import Full, Queue
 from threading import Thread
 from typing import Dict, Any, TYPE_CHECKING, List, Optional, Union, Type, Tuple
 
@@ -20,14 +23,47 @@ if TYPE_CHECKING:
         ModelRelationshipModification,
     )
 
+# number of recently created objects remembered, so that they are
+# updated instead of inserted twice and found by get_or_create
+# before the writer thread saved them.
+RECENT_OBJECTS = 10000
+
 
 class DatabaseHandler(Handler):
+    """
+    Saves the events to the database in batches of ``batch`` instances,
+    each batch with one ``bulk_create`` per model.
+
+    With ``threading`` the batches are handed to a single writer thread
+    through a queue of at most ``queue_size`` batches. When the queue is full
+    the logging call waits up to ``timeout`` seconds for the writer before
+    the batch is dropped and counted in ``dropped``.
+    """
+
     def __init__(
-        self, *args, batch: Optional[int] = 1, threading: bool = False, **kwargs
+        self,
+        *args,
+        batch: Optional[int] = 1,
+        threading: bool = False,
+        queue_size: int = 100,
+        timeout: float = 1.0,
+        **kwargs,
     ):
         self.limit = batch or 1
         self.threading = threading
         self.instances = OrderedDict()
+        self.timeout = timeout
+
+        self.queue = Queue(maxsize=queue_size)
+        self.writer = None
+
+        self.recent = OrderedDict()
+        self.lookups = OrderedDict()
+        self.lost = False
+
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
         super(DatabaseHandler, self).__init__(*args, **kwargs)
 
     @staticmethod
@@ -51,6 +87,99 @@ class DatabaseHandler(Handler):
                     created_at__lte=current - config.request.max_age
                 ).delete()
 
+    def _remember(self, cache: OrderedDict, key, value) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > RECENT_OBJECTS:
+            cache.popitem(last=False)
+
+    def _split(self, instances: List[Model]) -> Tuple[Dict[Type[Model], List], List]:
+        """
+        Split a batch into the new instances, grouped by model, and the
+        instances that were already inserted (by this or a previous batch).
+        """
+        inserts = OrderedDict()
+        updates = []
+        for instance in instances:
+            if not instance._state.adding or instance.pk in self.recent:
+                updates.append(instance)
+            else:
+                inserts.setdefault(type(instance), []).append(instance)
+                self._remember(self.recent, instance.pk, True)
+        return inserts, updates
+
+    def _write(self, inserts, updates, config, clear) -> None:
+        """
+        Insert every model of a batch in one query.
+        Foreign keys are only checked at the end of the transaction,
+        so the models can be inserted in any order.
+        """
+        from django.db import transaction
+
+        with transaction.atomic():
+            for model, instances in inserts.items():
+                model.objects.bulk_create(instances)
+            for instance in updates:
+                instance.save(force_update=True)
+
+            if clear:
+                self._clear(config)
+
+        self.written += len(updates) + sum(len(i) for i in inserts.values())
+
+    def _write_now(self, inserts, updates, config, clear) -> None:
+        """
+        Write a batch in the calling thread.
+        A failed batch is counted and lost, like in the writer thread.
+        """
+        try:
+            self._write(inserts, updates, config, clear)
+        except Exception:
+            self.failed += len(updates) + sum(len(i) for i in inserts.values())
+            # the recent objects of the batch were never saved
+            self.lost = True
+            self.recent.clear()
+            self.lookups.clear()
+            if raiseExceptions:
+                traceback.print_exc(file=sys.stderr)
+
+    def _run_writer(self) -> None:
+        """ single thread saving the batches of the queue, in order """
+        from django.db import close_old_connections, connection
+
+        try:
+            while True:
+                batch = self.queue.get()
+                try:
+                    if batch is None:
+                        return
+
+                    close_old_connections()
+                    self._write(*batch)
+                except Exception:
+                    self.failed += len(batch[1]) + sum(len(i) for i in batch[0].values())
+                    self.lost = True
+                    if raiseExceptions:
+                        traceback.print_exc(file=sys.stderr)
+                finally:
+                    self.queue.task_done()
+        finally:
+            connection.close()
+
+    def _enqueue(self, batch) -> None:
+        if self.writer is None or not self.writer.is_alive():
+            self.writer = Thread(
+                target=self._run_writer, name='automated_logging', daemon=True
+            )
+            self.writer.start()
+
+        try:
+            self.queue.put(batch, timeout=self.timeout)
+        except Full:
+            inserts, updates = batch[0], batch[1]
+            self.dropped += len(updates) + sum(len(i) for i in inserts.values())
+            self.lost = True
+
     def save(self, instance=None, commit=True, clear=True):
         """
         Internal save procedure.
@@ -59,9 +188,14 @@ class DatabaseHandler(Handler):
 
         :return: None
         """
-        from django.db import transaction
         from automated_logging.settings import settings
 
+        if self.lost:
+            # the recent objects of a dropped or failed batch were never saved
+            self.lost = False
+            self.recent.clear()
+            self.lookups.clear()
+
         if instance:
             self.instances[instance.pk] = instance
         if len(self.instances) < self.limit:
@@ -72,25 +206,43 @@ class DatabaseHandler(Handler):
         if not commit:
             return instance
 
-        def database(instances, config):
-            """ wrapper so that we can actually use threading """
-            with transaction.atomic():
-                [i.save() for k, i in instances.items()]
-
-                if clear:
-                    self._clear(config)
-                instances.clear()
+        inserts, updates = self._split(self.instances.values())
+        self.instances = OrderedDict()
 
         if self.threading:
-            thread = Thread(
-                group=None, target=database, args=(self.instances, settings)
-            )
-            thread.start()
+            self._enqueue((inserts, updates, settings, clear))
         else:
-            database(self.instances, settings)
+            self._write_now(inserts, updates, settings, clear)
 
         return instance
 
+    def flush(self) -> None:
+        """ save the pending instances and wait for the writer thread """
+        self.acquire()
+        try:
+            if self.instances:
+                from automated_logging.settings import settings
+
+                inserts, updates = self._split(self.instances.values())
+                self.instances = OrderedDict()
+                if self.threading:
+                    self._enqueue((inserts, updates, settings, False))
+                else:
+                    # flush is also called on shutdown, when the database may be gone
+                    self._write_now(inserts, updates, settings, False)
+        finally:
+            self.release()
+
+        if self.writer is not None and self.writer.is_alive():
+            self.queue.join()
+
+    def close(self) -> None:
+        self.flush()
+        if self.writer is not None and self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+        super(DatabaseHandler, self).close()
+
     def get_or_create(self, target: Type[Model], **kwargs) -> Tuple[Model, bool]:
         """
         proxy for "get_or_create" from django,
@@ -100,12 +252,20 @@ class DatabaseHandler(Handler):
         :type target: Model to be get_or_create
         :type kwargs: properties to be used to find and create the new object
         """
+        key = (target, tuple(sorted(
+            (k, v.pk if isinstance(v, Model) else v) for k, v in kwargs.items()
+        )))
+        if key in self.lookups:
+            # created recently, maybe not saved by the writer yet
+            return self.lookups[key], False
+
         created = False
         try:
             instance = target.objects.get(**kwargs)
         except ObjectDoesNotExist:
             instance = target(**kwargs)
             self.save(instance, commit=False, clear=False)
+            self._remember(self.lookups, key, instance)
             created = True
 
         return instance, created
@@ -1,3 +1,4 @@
+import fnmatch
 import re
 import typing
 from collections import namedtuple
@@ -150,6 +151,27 @@ class SearchString(String):
         return Search('glob', output)
 
 
+class Pattern(SearchString):
+    """
+    SearchString that is compiled into a case insensitive regular expression
+    when the settings are loaded, instead of being interpreted on every match.
+
+    Use ``pattern.match(candidate)``, which behaves like candidate_in_scope:
+    globs and plain strings need to match the whole candidate, regular
+    expressions its beginning.
+    """
+
+    def _deserialize(self, value, attr, data, **kwargs) -> typing.Pattern:
+        search = super()._deserialize(value, attr, data, **kwargs)
+
+        if search.type == 'glob':
+            return re.compile(fnmatch.translate(search.value), re.IGNORECASE)
+        elif search.type == 'plain':
+            return re.compile(f'{re.escape(search.value)}\\Z', re.IGNORECASE)
+
+        return re.compile(search.value, re.IGNORECASE)
+
+
 class MissingNested(Nested):
     """
     Modified marshmallow Nested, that is defaulting missing to loading an empty
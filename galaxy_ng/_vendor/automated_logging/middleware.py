@@ -1,8 +1,11 @@
 import logging
+import random
 import threading
-from typing import NamedTuple, Optional, TYPE_CHECKING
+from typing import NamedTuple, Optional, Set, TYPE_CHECKING
 
-from django.http import HttpRequest, HttpResponse
+from django.core.exceptions import RequestDataTooBig
+from django.http import FileResponse, HttpRequest, HttpResponse
+from django.http.request import RawPostDataException
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import AbstractUser
@@ -16,6 +19,16 @@ RequestInformation = NamedTuple(
     ],
 )
 
+DataCapture = NamedTuple(
+    'DataCapture',
+    [
+        ('enabled', Set[str]),
+        ('max_size', Optional[int]),
+        # filled while a streaming response is sent
+        ('streamed', bytearray),
+    ],
+)
+
 
 class AutomatedLoggingMiddleware:
     """
@@ -64,12 +77,89 @@ class AutomatedLoggingMiddleware:
         """
         self.save(request)
 
+        capture = self.data_capture(request)
+        request._dal_capture = capture
+        if capture and 'request' in capture.enabled:
+            size = int(request.META.get('CONTENT_LENGTH') or 0)
+            if capture.max_size is None or size <= capture.max_size:
+                # buffer the body, so that it can still be read after the view consumed it
+                try:
+                    request.body
+                except (RawPostDataException, RequestDataTooBig):
+                    pass
+
         response = self.get_response(request)
 
+        if capture and 'response' in capture.enabled:
+            self.capture_stream(response, capture)
+
         self.save(request, response)
 
         return response
 
+    @staticmethod
+    def data_capture(request) -> Optional[DataCapture]:
+        """
+        Decides if and how much of the request and response bodies are going
+        to be recorded, with the first data rule matching the path of the
+        request and the sample rate.
+
+        :param request: Django Request
+        :return: Optional[DataCapture]
+        """
+        from automated_logging.settings import settings
+
+        data = settings.request.data
+        if not data.enabled and not data.rules:
+            return None
+
+        enabled, sample_rate, max_size = data.enabled, data.sample_rate, data.max_size
+        for rule in data.rules:
+            if rule.pattern.match(request.path):
+                if rule.enabled is not None:
+                    enabled = rule.enabled
+                if rule.sample_rate is not None:
+                    sample_rate = rule.sample_rate
+                if rule.max_size is not None:
+                    max_size = rule.max_size
+                break
+
+        if not enabled or random.random() >= sample_rate:
+            return None
+
+        return DataCapture(enabled, max_size, bytearray())
+
+    @staticmethod
+    def capture_stream(response, capture: DataCapture) -> None:
+        """
+        Records the first max_size bytes of a streaming response while
+        it is sent, instead of buffering it. File responses are left alone,
+        to not lose the file wrapper of the server.
+
+        :param response: Django Response
+        :param capture: DataCapture of the request
+        :return: -
+        """
+        if (
+            not getattr(response, 'streaming', False)
+            or getattr(response, 'is_async', False)
+            or isinstance(response, FileResponse)
+        ):
+            return
+
+        def tee(content):
+            for chunk in content:
+                missing = (
+                    len(chunk)
+                    if capture.max_size is None
+                    else capture.max_size - len(capture.streamed)
+                )
+                if missing > 0:
+                    capture.streamed.extend(chunk[:missing])
+                yield chunk
+
+        response.streaming_content = tee(response.streaming_content)
+
     def process_exception(self, request, exception):
         """
         Exception proceeds the same as __call__ and therefore should
@@ -7,7 +7,7 @@ from functools import lru_cache
 from logging import INFO, NOTSET, CRITICAL
 from pprint import pprint
 
-from marshmallow.fields import Boolean, Integer
+from marshmallow.fields import Boolean, Float, Integer, List, Nested
 from marshmallow.validate import OneOf, Range
 
 from automated_logging.helpers.schemas import (
@@ -16,6 +16,7 @@ from automated_logging.helpers.schemas import (
     SearchString,
     MissingNested,
     BaseSchema,
+    Pattern,
     Search,
     Duration,
 )
@@ -34,11 +35,35 @@ class RequestExcludeSchema(BaseSchema):
     status = Set(Integer(validate=Range(min=0)), missing={200})
 
 
+class RequestDataRuleSchema(BaseSchema):
+    """
+    Configuration schema for a rule of RequestDataSchema, that overrides
+    which bodies are recorded, how often and how much of them for the paths
+    matching the pattern. Options that are not set are taken from
+    RequestDataSchema.
+    """
+
+    pattern = Pattern(required=True)
+
+    enabled = Set(
+        LowerCaseString(validate=OneOf(['request', 'response'])),
+        missing=None,
+        allow_none=True,
+    )
+    sample_rate = Float(missing=None, allow_none=True, validate=Range(min=0, max=1))
+    max_size = Integer(missing=None, allow_none=True, validate=Range(min=0))
+
+
 class RequestDataSchema(BaseSchema):
     """
     Configuration schema for request data that is only used in RequestSchema
     and is used to enable data collection, ignore keys that are going to be omitted
     mask keys (their value is going to be replaced with <REDACTED>)
+
+    sample_rate is the share of requests whose bodies are recorded and
+    bodies are truncated to max_size bytes (None disables the limit),
+    request bodies larger than max_size are not recorded at all.
+    The first of the rules matching the path of a request applies to it.
     """
 
     enabled = Set(
@@ -56,6 +81,11 @@ class RequestDataSchema(BaseSchema):
         missing={'application/json'},
     )
 
+    sample_rate = Float(missing=1.0, validate=Range(min=0, max=1))
+    max_size = Integer(missing=64 * 1024, allow_none=True, validate=Range(min=0))
+
+    rules = List(Nested(RequestDataRuleSchema), missing=list)
+
 
 class RequestSchema(BaseSchema):
     """
@@ -57,17 +57,27 @@ def request_finished_signal(sender, **kwargs) -> None:
     if not settings.request.data.query:
         request.uri = urllib.parse.urlparse(request.uri).path
 
-    if 'request' in settings.request.data.enabled:
+    # decided by the middleware, with the data rules and the sample rate
+    capture = getattr(environ.request, '_dal_capture', None)
+
+    if capture and 'request' in capture.enabled:
         request_context = RequestContext()
-        request_context.content = environ.request.body
+        # the middleware only buffers bodies up to max_size, but the view
+        # may have read a larger one, which is not recorded at all
+        body = getattr(environ.request, '_body', None)
+        if body is not None and (capture.max_size is None or len(body) <= capture.max_size):
+            request_context.content = body
         request_context.type = environ.request.content_type
 
         request.request = request_context
 
-    if 'response' in settings.request.data.enabled:
+    if capture and 'response' in capture.enabled and environ.response:
         response_context = RequestContext()
-        response_context.content = environ.response.content
-        response_context.type = environ.response['Content-Type']
+        if environ.response.streaming:
+            response_context.content = bytes(capture.streamed)
+        else:
+            response_context.content = environ.response.content[: capture.max_size]
+        response_context.type = environ.response.get('Content-Type', '')
 
         request.response = response_context
 
@@ -79,10 +89,14 @@ def request_finished_signal(sender, **kwargs) -> None:
     request.method = environ.request.method.upper()
     request.context_type = environ.request.content_type
 
-    try:
-        function = resolve(environ.request.path).func
-    except Http404:
-        function = None
+    # the view has already been resolved by django while handling the request
+    match = getattr(environ.request, 'resolver_match', None)
+    if match is None:
+        try:
+            match = resolve(environ.request.path)
+        except Http404:
+            pass
+    function = match.func if match else None
 
     request.application = Application(name=None)
     if function:
@@ -2,15 +2,23 @@
 File handles every signal related to the saving/deletion of django models.
 """
 
+import json
 import logging
 from collections import namedtuple
 from datetime import datetime
 from pprint import pprint
 from typing import Any
 
+from django.apps import apps
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
-from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models.signals import (
+    class_prepared,
+    post_init,
+    pre_save,
+    post_save,
+    post_delete,
+)
 from django.dispatch import receiver
 
 from automated_logging.models import (
@@ -46,12 +54,172 @@ def normalize_save_value(value: Any):
     return repr(value)
 
 
+_tracked_fields = {}
+
+
+def tracked_fields(instance, sender) -> frozenset:
+    """
+    The attnames of the concrete fields of the model that are not excluded,
+    cached per model until the settings are reloaded.
+
+    :param instance: model instance
+    :param sender: model class
+    :return: attnames
+    """
+    settings.load()
+    cached = _tracked_fields.get(sender)
+    if cached is None or cached[0] is not settings.loaded:
+        attnames = frozenset(
+            field.attname
+            for field in sender._meta.concrete_fields
+            if not field_exclusion(field.attname, instance, sender)
+        )
+        cached = _tracked_fields[sender] = (settings.loaded, attnames)
+    return cached[1]
+
+
+class Serialized(str):
+    """
+    Snapshot of a value that can be changed in place
+    (e.g. the dictionaries of a JSONField), kept as its JSON representation.
+    """
+
+    @classmethod
+    def of(cls, value) -> 'Serialized':
+        return cls(json.dumps(value, default=repr))
+
+    def load(self):
+        return json.loads(self)
+
+    def matches(self, value) -> bool:
+        """ whether the value still serializes to the snapshot """
+        if not isinstance(value, (dict, list)):
+            return False
+        try:
+            return self.of(value) == self
+        except (TypeError, ValueError):
+            return False
+
+
+def take_snapshot(instance, fields=None) -> None:
+    """
+    Remember the loaded values of the tracked fields of the instance,
+    pre_save compares them with the values being saved.
+    Deferred fields that haven't been loaded are not part of the snapshot.
+
+    Dictionaries and lists are serialized, so that changing them in place
+    is noticed without reading them again from the database, those that
+    can't be serialized are left out and read again in pre_save.
+    Values reloaded with refresh_from_db don't update the snapshot.
+
+    :param instance: model instance
+    :param fields: only update the snapshot of these attnames
+    :return: None
+    """
+    values = instance.__dict__
+    snapshot = values.setdefault('_dal_snapshot', {})
+    for name in tracked_fields(instance, instance.__class__):
+        if name in values and (fields is None or name in fields):
+            value = values[name]
+            if isinstance(value, (dict, list)):
+                try:
+                    value = Serialized.of(value)
+                except (TypeError, ValueError):
+                    snapshot.pop(name, None)
+                    continue
+            snapshot[name] = value
+
+
+def snapshot_values(instance, snapshot) -> dict:
+    """
+    The previous values of the snapshot, serialized values are only
+    loaded again if the current value doesn't serialize the same way.
+
+    :param instance: model instance
+    :param snapshot: snapshot taken by take_snapshot
+    :return: previous values
+    """
+    values = instance.__dict__
+    old = dict(snapshot)
+    for name, value in snapshot.items():
+        if isinstance(value, Serialized):
+            current = values.get(name)
+            old[name] = current if value.matches(current) else value.load()
+    return old
+
+
+def is_insert(instance, raw=False) -> bool:
+    """
+    Whether saving the instance inserts it, like Model._save_table decides.
+    An instance that isn't loaded from the database with a primary key
+    that was set explicitly may be updated instead, unless the primary key
+    has a default.
+
+    :param instance: model instance
+    :param raw: raw save (e.g. loaddata)
+    :return: bool
+    """
+    if not instance._state.adding:
+        return False
+    if instance.pk is None:
+        return True
+    return not raw and instance._meta.pk.has_default()
+
+
+def post_init_signal(sender, instance, **kwargs) -> None:
+    """
+    Takes the snapshot of instances of tracked models when they are
+    created or loaded from the database.
+
+    :param sender: model class
+    :param instance: model instance
+    :param kwargs: required by django
+    :return: None
+    """
+    if lazy_model_exclusion(instance, Operation.MODIFY, sender):
+        return
+
+    take_snapshot(instance)
+
+
+def connect_post_init(sender) -> None:
+    """
+    Only instances of models that are tracked when they are registered
+    pay for a snapshot, the others are fetched again in pre_save.
+
+    :param sender: model class
+    :return: None
+    """
+    if not model_exclusion(sender, sender._meta, Operation.MODIFY):
+        post_init.connect(post_init_signal, sender=sender, weak=False)
+
+
+@receiver(class_prepared, weak=False)
+def class_prepared_signal(sender, **kwargs) -> None:
+    """
+    Models that are registered after the signals have been loaded.
+
+    :param sender: model class
+    :param kwargs: required by django
+    :return: None
+    """
+    connect_post_init(sender)
+
+
+for model in apps.get_models():
+    connect_post_init(model)
+
+
 @receiver(pre_save, weak=False)
 @transaction.atomic
 def pre_save_signal(sender, instance, **kwargs) -> None:
     """
-    Compares the current instance and old instance (fetched via the pk)
-    and generates a dictionary of changes
+    Compares the current instance with its snapshot, taken when the
+    instance was loaded or last saved, and generates a dictionary of changes.
+
+    The old instance is only fetched via the pk when there is no snapshot,
+    for example when the model was excluded while the instance was loaded,
+    or when an instance that wasn't loaded is saved with an existing pk.
 
     :param sender:
     :param instance:
@@ -63,20 +231,34 @@ def pre_save_signal(sender, instance, **kwargs) -> None:
     instance._meta.dal.event = None
 
     operation = Operation.MODIFY
-    try:
-        pre = sender.objects.get(pk=instance.pk)
-    except ObjectDoesNotExist:
-        # __dict__ is used on pre, therefore we need to create a function
-        # that uses __dict__ too, but returns nothing.
-
-        pre = lambda _: None
+    snapshot = instance.__dict__.get('_dal_snapshot')
+    if is_insert(instance, kwargs.get('raw', False)):
+        old = {}
         operation = Operation.CREATE
+    elif snapshot is not None and not instance._state.adding:
+        old = snapshot_values(instance, snapshot)
+        # fields that were deferred when the instance was loaded
+        fetch = [
+            name
+            for name in tracked_fields(instance, sender)
+            if name in instance.__dict__ and name not in old
+        ]
+        if fetch:
+            old.update(
+                sender.objects.filter(pk=instance.pk).values(*fetch).first() or {}
+            )
+    else:
+        try:
+            old = sender.objects.get(pk=instance.pk).__dict__
+        except ObjectDoesNotExist:
+            old = {}
+            operation = Operation.CREATE
 
     excluded = lazy_model_exclusion(instance, operation, instance.__class__)
     if excluded:
         return
 
-    old, new = pre.__dict__, instance.__dict__
+    new = instance.__dict__
 
     previously = set(
         k for k in old.keys() if not k.startswith('_') and old[k] is not None
@@ -255,6 +437,14 @@ def post_save_signal(
             m for m in instance._meta.dal.modifications if m.field.name in update_fields
         ]
 
+    # the saved values are what the next save is compared with
+    take_snapshot(
+        instance,
+        fields=None
+        if update_fields is None
+        else {instance._meta.get_field(f).attname for f in update_fields},
+    )
+
     post_processor(status, sender, instance, update_fields, suffix)
 
 
@@ -5,10 +5,14 @@ import logging
 import logging.config
 from datetime import timedelta
 import time
+from unittest import mock
 
+from django.db import DatabaseError, connection
 from django.http import JsonResponse
+from django.test.utils import CaptureQueriesContext
 from marshmallow import ValidationError
 
+from automated_logging.handlers import DatabaseHandler
 from automated_logging.helpers.exceptions import CouldNotConvertError
 from automated_logging.models import ModelEvent, RequestEvent, UnspecifiedEvent
 from automated_logging.tests.models import OrdinaryTest
@@ -105,3 +109,61 @@ class TestDatabaseHandlerTestCase(BaseTestCase):
 
         config['handlers']['db']['batch'] = 1
         logging.config.dictConfig(config)
+
+    def test_batching_bulk_inserts(self):
+        from django.conf import settings
+
+        logger = logging.getLogger(__name__)
+
+        config = settings.LOGGING
+
+        config['handlers']['db']['batch'] = 10
+        logging.config.dictConfig(config)
+
+        self.clear()
+        for _ in range(9):
+            logger.info('Only a Sith deals in absolutes.')
+
+        with CaptureQueriesContext(connection) as queries:
+            logger.info('I will do what I must.')
+
+        inserts = [
+            q['sql']
+            for q in queries.captured_queries
+            if q['sql'].startswith('INSERT')
+            and UnspecifiedEvent._meta.db_table in q['sql']
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(UnspecifiedEvent.objects.count(), 10)
+
+        config['handlers']['db']['batch'] = 1
+        logging.config.dictConfig(config)
+
+    def test_full_queue_drops_batches(self):
+        handler = DatabaseHandler(threading=True, queue_size=1, timeout=0)
+        # a writer that never consumes the queue
+        handler.writer = mock.Mock(**{'is_alive.return_value': True})
+
+        event = UnspecifiedEvent(message='Hello there.')
+        handler._enqueue(({UnspecifiedEvent: [event]}, [], None, False))
+        self.assertEqual(handler.dropped, 0)
+
+        handler._enqueue(({UnspecifiedEvent: [event, event]}, [], None, False))
+        self.assertEqual(handler.dropped, 2)
+        self.assertTrue(handler.lost)
+
+    def test_failed_write_is_lost(self):
+        handler = DatabaseHandler(threading=False)
+        handler.recent['pk'] = True
+        handler.lookups['key'] = 'value'
+
+        event = UnspecifiedEvent(message='Hello there.')
+        with mock.patch.object(handler, '_write', side_effect=DatabaseError), mock.patch(
+            'automated_logging.handlers.raiseExceptions', False
+        ):
+            handler._write_now({UnspecifiedEvent: [event, event]}, [], None, False)
+
+        self.assertEqual(handler.failed, 2)
+        self.assertTrue(handler.lost)
+        self.assertEqual(handler.recent, {})
+        self.assertEqual(handler.lookups, {})
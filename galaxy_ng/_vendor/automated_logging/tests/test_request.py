@@ -2,7 +2,7 @@
 import json
 from copy import deepcopy
 
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 
 from automated_logging.models import RequestEvent
 from automated_logging.tests.base import BaseTestCase, USER_CREDENTIALS
@@ -148,6 +148,87 @@ class DataRecordingRequestsTestCase(BaseTestCase):
         self.assertEqual(event.response.content.decode(), response)
         self.assertEqual(event.request.content.decode(), request)
 
+    def test_payload_max_size(self):
+        from django.conf import settings
+        from automated_logging.settings import settings as conf
+
+        self.bypass_request_restrictions()
+
+        settings.AUTOMATED_LOGGING['request']['data']['max_size'] = 10
+        conf.load.cache_clear()
+
+        self.request('GET', self.view, data=json.dumps({'X': 'Y' * 20}))
+
+        event = RequestEvent.objects.get()
+        self.assertEqual(event.response.content, json.dumps({'test': 'example'})[:10].encode())
+        # request bodies over the limit are not buffered
+        self.assertIsNone(event.request.content)
+
+    def test_payload_max_size_read_by_view(self):
+        from django.conf import settings
+        from automated_logging.settings import settings as conf
+
+        self.bypass_request_restrictions()
+
+        settings.AUTOMATED_LOGGING['request']['data']['max_size'] = 10
+        conf.load.cache_clear()
+
+        def view(request):
+            return JsonResponse({'length': len(request.body)})
+
+        self.request('GET', view, data=json.dumps({'X': 'Y' * 20}))
+
+        event = RequestEvent.objects.get()
+        # the body read by the view is still larger than the limit
+        self.assertIsNone(event.request.content)
+
+    def test_payload_rules(self):
+        from django.conf import settings
+        from automated_logging.settings import settings as conf
+
+        self.bypass_request_restrictions()
+
+        settings.AUTOMATED_LOGGING['request']['data']['rules'] = [
+            {'pattern': 're:^/$', 'sample_rate': 0},
+        ]
+        conf.load.cache_clear()
+
+        self.request('GET', self.view, data=json.dumps({'X': 'Y'}))
+
+        event = RequestEvent.objects.get()
+        self.assertIsNone(event.request)
+        self.assertIsNone(event.response)
+
+        RequestEvent.objects.all().delete()
+        settings.AUTOMATED_LOGGING['request']['data']['rules'] = [
+            {'pattern': 'plain:/', 'enabled': ['response']},
+        ]
+        conf.load.cache_clear()
+
+        self.request('GET', self.view, data=json.dumps({'X': 'Y'}))
+
+        event = RequestEvent.objects.get()
+        self.assertIsNone(event.request)
+        self.assertEqual(event.response.content.decode(), json.dumps({'test': 'example'}))
+
+    def test_streaming_payload(self):
+        from django.conf import settings
+        from automated_logging.settings import settings as conf
+
+        self.bypass_request_restrictions()
+
+        settings.AUTOMATED_LOGGING['request']['data']['max_size'] = 5
+        conf.load.cache_clear()
+
+        def view(request):
+            return StreamingHttpResponse(iter([b'abc', b'def', b'ghi']))
+
+        response = self.request('GET', view)
+        self.assertEqual(b''.join(response.streaming_content), b'abcdefghi')
+
+        event = RequestEvent.objects.get()
+        self.assertEqual(event.response.content, b'abcde')
+
     def test_exclusion_by_application(self):
         self.request('GET', self.view)
         self.assertEqual(RequestEvent.objects.count(), 0)
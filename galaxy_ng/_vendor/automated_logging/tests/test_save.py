@@ -5,9 +5,13 @@ from django.http import JsonResponse
 
 from automated_logging.helpers import Operation
 from automated_logging.models import ModelEvent
-from automated_logging.tests.base import BaseTestCase, USER_CREDENTIALS
+from automated_logging.tests.base import BaseTestCase, USER_CREDENTIALS, User
 from automated_logging.tests.helpers import random_string
-from automated_logging.tests.models import OrdinaryTest
+from automated_logging.tests.models import (
+    FullClassBasedExclusionTest,
+    OrdinaryTest,
+    PartialClassBasedExclusionTest,
+)
 
 
 class LoggedOutSaveModificationsTestCase(BaseTestCase):
@@ -98,6 +102,130 @@ class LoggedOutSaveModificationsTestCase(BaseTestCase):
         relationships = event.relationships.all()
         self.assertEqual(relationships.count(), 0)
 
+    def test_modify_loaded_instance(self):
+        """
+        test if modifying an instance loaded from the database
+        compares it with its snapshot instead of fetching it again
+        :return:
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        previous, current = random_string(10), random_string(10)
+
+        OrdinaryTest.objects.create(random=previous)
+        instance = OrdinaryTest.objects.get()
+
+        ModelEvent.objects.all().delete()
+
+        instance.random = current
+        with CaptureQueriesContext(connection) as queries:
+            instance.save()
+
+        table = OrdinaryTest._meta.db_table
+        self.assertFalse(
+            any(
+                q['sql'].startswith('SELECT') and table in q['sql']
+                for q in queries.captured_queries
+            )
+        )
+
+        events = ModelEvent.objects.all()
+        self.assertEqual(events.count(), 1)
+
+        modifications = events[0].modifications.all()
+        self.assertEqual(modifications.count(), 1)
+        self.assertEqual(modifications[0].previous, previous)
+        self.assertEqual(modifications[0].current, current)
+
+        # the snapshot is refreshed on save, saving again changes nothing
+        ModelEvent.objects.all().delete()
+        instance.save()
+        self.assertEqual(ModelEvent.objects.count(), 0)
+
+    def test_snapshot_only_has_tracked_fields(self):
+        """
+        test if excluded fields are not part of the snapshot
+        :return:
+        """
+        PartialClassBasedExclusionTest.objects.create(random=random_string(10))
+        instance = PartialClassBasedExclusionTest.objects.get()
+
+        self.assertIn('random2', instance.__dict__['_dal_snapshot'])
+        self.assertNotIn('random', instance.__dict__['_dal_snapshot'])
+
+    def test_snapshot_only_of_tracked_models(self):
+        """
+        test if instances of excluded models don't get a snapshot
+        :return:
+        """
+        FullClassBasedExclusionTest.objects.create(random=random_string(10))
+        OrdinaryTest.objects.create(random=random_string(10))
+
+        self.assertNotIn(
+            '_dal_snapshot', FullClassBasedExclusionTest.objects.get().__dict__
+        )
+        self.assertIn('_dal_snapshot', OrdinaryTest.objects.get().__dict__)
+
+    def test_modify_value_in_place(self):
+        """
+        test if changing a dictionary in place is compared with the
+        serialized snapshot instead of fetching it again
+        :return:
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        instance = OrdinaryTest.objects.create(random=random_string(10))
+        instance.random = {'value': 1}
+        instance.save()
+
+        ModelEvent.objects.all().delete()
+
+        instance.random['other'] = 2
+        with CaptureQueriesContext(connection) as queries:
+            instance.save()
+
+        table = OrdinaryTest._meta.db_table
+        self.assertFalse(
+            any(
+                q['sql'].startswith('SELECT') and table in q['sql']
+                for q in queries.captured_queries
+            )
+        )
+
+        events = ModelEvent.objects.all()
+        self.assertEqual(events.count(), 1)
+
+        modifications = events[0].modifications.all()
+        self.assertEqual(modifications.count(), 1)
+        self.assertEqual(modifications[0].previous, repr({'value': 1}))
+        self.assertEqual(modifications[0].current, repr({'value': 1, 'other': 2}))
+
+    def test_modify_instance_with_existing_pk(self):
+        """
+        test if saving a new instance with the pk of an existing one
+        is logged as a modification of the existing one
+        :return:
+        """
+        previous, current = self.user.username, random_string(10)
+
+        values = {f.attname: getattr(self.user, f.attname) for f in User._meta.concrete_fields}
+        values['username'] = current
+
+        ModelEvent.objects.all().delete()
+
+        User(**values).save()
+
+        events = ModelEvent.objects.filter(entry__mirror__name=User.__name__)
+        self.assertEqual(events.count(), 1)
+        self.assertEqual(events[0].operation, int(Operation.MODIFY))
+
+        modifications = events[0].modifications.all()
+        self.assertEqual(modifications.count(), 1)
+        self.assertEqual(modifications[0].previous, previous)
+        self.assertEqual(modifications[0].current, current)
+
     def test_honor_save(self):
         """
         test if saving honors the only attribute
@@ -1,5 +1,7 @@
+import contextlib
 import logging
 import os
+import time
 
 from django.conf import settings
 from django.contrib.auth.models import Permission
@@ -22,6 +24,7 @@ from pulp_ansible.app.serializers import CollectionVersionCopyMoveSerializer
 from galaxy_ng.app import models
 from galaxy_ng.app.api.v1.models import LegacyNamespace
 from galaxy_ng.app.api.v1.models import LegacyRole
+from galaxy_ng.app.common.metrics import access_policy_evaluation_seconds
 from galaxy_ng.app.constants import COMMUNITY_DOMAINS
 from galaxy_ng.app.utils.rbac import get_v3_namespace_owners
 
@@ -49,6 +52,35 @@ def get_view_urlpattern(view):
     return view.urlpattern()
 
 
+def get_view_metrics_label(view, request=None):
+    """
+    Get the label identifying a view in the prometheus metrics.
+
+    Uses the view urlpattern when the view has one, the url name (or route) otherwise, so
+    the number of labels is bounded by the number of url patterns. Never raises, it runs
+    in the middleware and in the access policy of every request.
+
+    Args:
+        view: The view or viewset (class or instance) being requested.
+        request: The request, used to look up the url name.
+
+    Returns:
+        str: the label for the view
+    """
+    # urlpattern() fails on viewsets without endpoint_pieces, like the upload viewset
+    with contextlib.suppress(Exception):
+        urlpattern = get_view_urlpattern(view)
+        if urlpattern:
+            return urlpattern
+
+    resolver_match = getattr(request, "resolver_match", None)
+    if resolver_match is not None:
+        if resolver_match.url_name:
+            return resolver_match.view_name
+        return resolver_match.route or resolver_match.view_name
+    return "unresolved"
+
+
 def has_model_or_object_permissions(user, permission, obj):
     return user.has_perm(permission) or user.has_perm(permission, obj)
 
@@ -121,6 +153,15 @@ class AccessPolicyBase(AccessPolicyFromDB):
 
     NAME = None
 
+    def has_permission(self, request, view):
+        start = time.perf_counter()
+        try:
+            return super().has_permission(request, view)
+        finally:
+            access_policy_evaluation_seconds.labels(
+                view=get_view_metrics_label(view, request)
+            ).observe(time.perf_counter() - start)
+
     @classmethod
     def get_access_policy(cls, view):
         statements = GALAXY_STATEMENTS
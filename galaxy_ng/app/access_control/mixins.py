@@ -1,9 +1,13 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 from django.core.exceptions import BadRequest
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework.exceptions import ValidationError
 
+from pulpcore.plugin.models.role import GroupRole, UserRole
 from pulpcore.plugin.util import (
     assign_role,
     remove_role,
@@ -14,11 +18,57 @@ from pulpcore.plugin.util import (
 from django_lifecycle import hook
 
 
+def _load_object_roles(role_model, field, objs):
+    """The roles of each object by its pk, as ``{group or user: [role names]}``."""
+    if not objs:
+        return {}
+
+    ctype = ContentType.objects.get_for_model(objs[0], for_concrete_model=True)
+    object_roles = role_model.objects.filter(
+        role__permissions__content_type=ctype,
+        content_type=ctype,
+        object_id__in=[str(obj.pk) for obj in objs],
+    ).select_related(field, "role")
+
+    res = defaultdict(lambda: defaultdict(set))
+    for object_role in object_roles:
+        res[object_role.object_id][getattr(object_role, field)].add(object_role.role.name)
+    return {
+        obj.pk: {k: list(v) for k, v in res[str(obj.pk)].items()}
+        for obj in objs
+    }
+
+
+def prefetch_groups(objs):
+    """Load the groups of all the objects with a single query.
+
+    ``groups`` then returns the loaded groups instead of querying them for each object.
+    """
+    objs = list(objs)
+    groups = _load_object_roles(GroupRole, "group", objs)
+    for obj in objs:
+        obj._prefetched_groups = groups[obj.pk]
+
+
+def prefetch_users(objs):
+    """Load the users of all the objects with a single query.
+
+    ``users`` then returns the loaded users instead of querying them for each object.
+    """
+    objs = list(objs)
+    users = _load_object_roles(UserRole, "user", objs)
+    for obj in objs:
+        obj._prefetched_users = users[obj.pk]
+
+
 class GroupModelPermissionsMixin:
     _groups = None
+    _prefetched_groups = None
 
     @property
     def groups(self):
+        if self._prefetched_groups is not None:
+            return self._prefetched_groups
         return get_groups_with_perms_attached_roles(
             self, include_model_permissions=False, for_concrete_model=True)
 
@@ -28,6 +78,8 @@ class GroupModelPermissionsMixin:
 
     @transaction.atomic
     def _set_groups(self, groups):
+        self._prefetched_groups = None
+
         # Can't add permissions to objects that haven't been
         # saved. When creating new objects, save group data to _groups where it
         # can be picked up by the post save hook.
@@ -66,9 +118,12 @@ class GroupModelPermissionsMixin:
 
 class UserModelPermissionsMixin:
     _users = None
+    _prefetched_users = None
 
     @property
     def users(self):
+        if self._prefetched_users is not None:
+            return self._prefetched_users
         return get_users_with_perms_attached_roles(
             self, include_model_permissions=False, for_concrete_model=True, with_group_users=False)
 
@@ -78,6 +133,8 @@ class UserModelPermissionsMixin:
 
     @transaction.atomic
     def _set_users(self, users):
+        self._prefetched_users = None
+
         if self._state.adding:
             self._users = users
         else:
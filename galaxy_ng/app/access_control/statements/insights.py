@@ -22,6 +22,9 @@ _signature_upload_statements = [
 ]
 
 _INSIGHTS_STATEMENTS = {
+    # CollectionViewSet is not overridden: uploads, including the chunked
+    # upload actions (retrieve_upload, upload_chunk, commit_upload), use the
+    # standalone statements, with the entitlements check added below.
     **copy.deepcopy(STANDALONE_STATEMENTS),
 
     'content/ansible/collection_signatures': _signature_upload_statements,
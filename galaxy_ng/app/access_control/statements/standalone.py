@@ -55,6 +55,12 @@ _collection_statements = [
         "effect": "allow",
         "condition": ["can_create_collection", "v3_can_view_repo_content"],
     },
+    {
+        "action": ["retrieve_upload", "upload_chunk", "commit_upload"],
+        "principal": "authenticated",
+        "effect": "allow",
+        "condition": ["can_create_collection", "v3_can_view_repo_content"],
+    },
     {
         "action": "update",
         "principal": "authenticated",
@@ -9,6 +9,7 @@ from rest_framework import serializers
 import semantic_version
 
 from .base import Serializer
+from galaxy_ng.app.access_control.mixins import prefetch_groups, prefetch_users
 from galaxy_ng.app.api.v3.serializers.namespace import NamespaceSummarySerializer
 from galaxy_ng.app.models import Namespace
 
@@ -175,6 +176,19 @@ class CollectionVersionSummarySerializer(CollectionVersionSignStateMixin, Serial
     sign_state = serializers.SerializerMethodField()
 
 
+class _CollectionListSerializer(serializers.ListSerializer):
+    """Loads the namespaces of all the serialized collections, with their groups and users."""
+
+    def to_representation(self, data):
+        data = list(data)
+        self.child.namespaces = Namespace.objects.select_related(
+            "last_created_pulp_metadata"
+        ).in_bulk({obj.namespace for obj in data}, field_name="name")
+        prefetch_groups(self.child.namespaces.values())
+        prefetch_users(self.child.namespaces.values())
+        return super().to_representation(data)
+
+
 class _CollectionSerializer(Serializer):
     """ Serializer for pulp_ansible CollectionViewSet.
     Uses CollectionVersion object to serialize associated Collection data.
@@ -186,9 +200,17 @@ class _CollectionSerializer(Serializer):
     download_count = serializers.IntegerField(default=0)
     latest_version = serializers.SerializerMethodField()
 
+    # namespaces by name, set when serializing a list of collections
+    namespaces = None
+
+    class Meta:
+        list_serializer_class = _CollectionListSerializer
+
     @extend_schema_field(NamespaceSummarySerializer)
     def get_namespace(self, obj):
-        namespace = Namespace.objects.get(name=obj.namespace)
+        namespace = (self.namespaces or {}).get(obj.namespace)
+        if namespace is None:
+            namespace = Namespace.objects.get(name=obj.namespace)
         return NamespaceSummarySerializer(namespace, context=self.context).data
 
 
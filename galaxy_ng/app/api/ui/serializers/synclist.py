@@ -1,12 +1,17 @@
 import logging
+from functools import reduce
+from operator import or_
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Q
 from django.db.utils import IntegrityError
+from django.utils.encoding import smart_str
 from django.utils.translation import gettext_lazy as _
 from pulp_ansible.app.models import AnsibleRepository, Collection
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.relations import MANY_RELATION_KWARGS
 
 from galaxy_ng.app import models
 from galaxy_ng.app.access_control.fields import GroupPermissionField
@@ -21,13 +26,70 @@ class SyncListCollectionSummarySerializer(serializers.Serializer):
     name = serializers.CharField(max_length=64)
 
 
+class ManySlugRelatedField(serializers.ManyRelatedField):
+    """Looks up all the slugs of the list with a single query."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        slug_field = self.child_relation.slug_field
+        objects = {
+            smart_str(getattr(obj, slug_field)): obj
+            for obj in self.child_relation.get_queryset().filter(
+                **{f"{slug_field}__in": [smart_str(value) for value in data]}
+            )
+        }
+        for value in data:
+            if smart_str(value) not in objects:
+                self.child_relation.fail(
+                    'does_not_exist', slug_name=slug_field, value=smart_str(value)
+                )
+        return [objects[smart_str(value)] for value in data]
+
+
+class BulkSlugRelatedField(serializers.SlugRelatedField):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManySlugRelatedField(**list_kwargs)
+
+
 class SyncListSerializer(serializers.ModelSerializer):
-    namespaces = serializers.SlugRelatedField(
+    """Synclist, with its collections and namespaces.
+
+    collections and namespaces replace the synclist ones, the add_* and
+    remove_* fields only add or remove the listed ones, for PATCH requests
+    that only send the changes.
+    """
+
+    namespaces = BulkSlugRelatedField(
         many=True, slug_field="name", queryset=models.Namespace.objects.all()
     )
 
     collections = SyncListCollectionSummarySerializer(many=True)
 
+    add_namespaces = BulkSlugRelatedField(
+        many=True, slug_field="name", queryset=models.Namespace.objects.all(),
+        write_only=True, required=False,
+    )
+    remove_namespaces = BulkSlugRelatedField(
+        many=True, slug_field="name", queryset=models.Namespace.objects.all(),
+        write_only=True, required=False,
+    )
+
+    add_collections = SyncListCollectionSummarySerializer(
+        many=True, write_only=True, required=False
+    )
+    remove_collections = SyncListCollectionSummarySerializer(
+        many=True, write_only=True, required=False
+    )
+
     groups = GroupPermissionField()
 
     def _get_repository(self, repository_id):
@@ -47,10 +109,35 @@ class SyncListSerializer(serializers.ModelSerializer):
             data["upstream_repository"] = AnsibleRepository.objects.get(name=default_repo_name)
         return super().to_internal_value(data)
 
+    @staticmethod
+    def _get_collections(collections_data, errmsg, synclist_name):
+        """Get the collections of a list of namespace and name with a single query."""
+        if not collections_data:
+            return []
+
+        query = reduce(or_, (
+            Q(namespace=data["namespace"], name=data["name"]) for data in collections_data
+        ))
+        collections = {(c.namespace, c.name): c for c in Collection.objects.filter(query)}
+
+        for data in collections_data:
+            if (data["namespace"], data["name"]) not in collections:
+                raise ValidationError(
+                    errmsg.format(
+                        namespace=data["namespace"],
+                        name=data["name"],
+                        synclist=synclist_name,
+                    )
+                )
+        return [collections[(data["namespace"], data["name"])] for data in collections_data]
+
     @transaction.atomic
     def create(self, validated_data):
         collections_data = validated_data.pop("collections")
         namespaces_data = validated_data.pop("namespaces")
+        for field in ("add_collections", "remove_collections",
+                      "add_namespaces", "remove_namespaces"):
+            validated_data.pop(field, None)
 
         # Match repository to upstream_repository
         # TODO: remove after SyncList no longer has FK to repositories
@@ -64,24 +151,8 @@ class SyncListSerializer(serializers.ModelSerializer):
         except IntegrityError as exc:
             raise ValidationError(_("Synclist already exists: %s") % exc)
 
-        collections = []
-        for collection_data in collections_data:
-            try:
-                collections.append(Collection.objects.get(**collection_data))
-            except Collection.DoesNotExist:
-                errmsg = (
-                    _('Collection "{namespace}.{name}" not found '
-                      'while creating synclist {synclist}')
-                )
-                raise ValidationError(
-                    errmsg.format(
-                        namespace=collection_data["namespace"],
-                        name=collection_data["name"],
-                        synclist=instance.name,
-                    )
-                )
-        instance.collections.clear()
-        instance.collections.set(collections)
+        errmsg = _('Collection "{namespace}.{name}" not found while creating synclist {synclist}')
+        instance.collections.set(self._get_collections(collections_data, errmsg, instance.name))
 
         instance.namespaces.add(*namespaces_data)
 
@@ -89,8 +160,6 @@ class SyncListSerializer(serializers.ModelSerializer):
 
     @transaction.atomic
     def update(self, instance, validated_data):
-        collections_data = validated_data.get("collections", [])
-
         groups_data = validated_data.get("groups")
         if groups_data:
             instance.groups = groups_data
@@ -98,28 +167,31 @@ class SyncListSerializer(serializers.ModelSerializer):
         namespaces_data = validated_data.get("namespaces")
         if namespaces_data is not None:
             instance.namespaces.set(namespaces_data)
+        if validated_data.get("add_namespaces"):
+            instance.namespaces.add(*validated_data["add_namespaces"])
+        if validated_data.get("remove_namespaces"):
+            instance.namespaces.remove(*validated_data["remove_namespaces"])
 
         instance.policy = validated_data.get("policy", instance.policy)
 
         instance.name = validated_data.get("name", instance.name)
 
-        new_collections = []
-        for collection_data in collections_data:
-            try:
-                new_collections.append(Collection.objects.get(**collection_data))
-            except Collection.DoesNotExist:
-                errmsg = (
-                    _('Collection "{namespace}.{name}" not found '
-                      'while updating synclist {synclist}')
-                )
-                raise ValidationError(
-                    errmsg.format(
-                        namespace=collection_data["namespace"],
-                        name=collection_data["name"],
-                        synclist=instance.name,
-                    )
+        errmsg = _('Collection "{namespace}.{name}" not found while updating synclist {synclist}')
+        # a PATCH without collections keeps them
+        if "collections" in validated_data:
+            instance.collections.set(
+                self._get_collections(validated_data["collections"], errmsg, instance.name)
+            )
+        if validated_data.get("add_collections"):
+            instance.collections.add(
+                *self._get_collections(validated_data["add_collections"], errmsg, instance.name)
+            )
+        if validated_data.get("remove_collections"):
+            instance.collections.remove(
+                *self._get_collections(
+                    validated_data["remove_collections"], errmsg, instance.name
                 )
-        instance.collections.set(new_collections)
+            )
 
         instance.save()
 
@@ -136,6 +208,10 @@ class SyncListSerializer(serializers.ModelSerializer):
             "distribution",
             "collections",
             "namespaces",
+            "add_collections",
+            "remove_collections",
+            "add_namespaces",
+            "remove_namespaces",
             "groups",
         ]
 
@@ -1,11 +1,57 @@
+from django.conf import settings
+from django.core.cache import cache
 from galaxy_ng.app.access_control import access_policy
-from random import sample
+from random import randrange
 from rest_framework.response import Response
 from pulp_ansible.app.models import CollectionVersion, AnsibleDistribution
 from galaxy_ng.app.models import Namespace
-from galaxy_ng.app import settings
 from galaxy_ng.app.api import base as api_base
 
+COLLECTION_COUNT_CACHE_KEY = "galaxy_ng:landing_page:collections:{}:{}"
+PARTNER_COUNT_CACHE_KEY = "galaxy_ng:landing_page:partners"
+
+
+def get_collection_count(base_path):
+    """Count the highest collection versions of a distribution.
+
+    The count is cached per repository version, a new version of the
+    repository is counted again.
+    """
+    ttl = settings.get("GALAXY_LANDING_PAGE_STATS_CACHE_TTL", 0)
+    repository = AnsibleDistribution.objects.select_related("repository").get(
+        base_path=base_path
+    ).repository
+    repository_version = repository.latest_version()
+    cache_key = COLLECTION_COUNT_CACHE_KEY.format(repository.pk, repository_version.number)
+
+    count = cache.get(cache_key) if ttl > 0 else None
+    if count is None:
+        count = CollectionVersion.objects.filter(
+            pk__in=repository_version.content, is_highest=True
+        ).count()
+        if ttl > 0:
+            cache.set(cache_key, count, ttl)
+    return count
+
+
+def get_partner_count():
+    ttl = settings.get("GALAXY_LANDING_PAGE_STATS_CACHE_TTL", 0)
+
+    count = cache.get(PARTNER_COUNT_CACHE_KEY) if ttl > 0 else None
+    if count is None:
+        count = Namespace.objects.count()
+        if ttl > 0:
+            cache.set(PARTNER_COUNT_CACHE_KEY, count, ttl)
+    return count
+
+
+def get_random_partner(partner_count):
+    """Pick a namespace at a random offset of the primary key index."""
+    namespaces = Namespace.objects.order_by("pk")
+    offset = randrange(partner_count)
+    # the cached count can be higher than the number of namespaces left
+    return namespaces[offset:offset + 1].first() or namespaces.first()
+
 
 class LandingPageView(api_base.APIView):
     permission_classes = [access_policy.LandingPageAccessPolicy]
@@ -14,18 +60,13 @@ class LandingPageView(api_base.APIView):
     def get(self, request, *args, **kwargs):
         golden_name = settings.GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH
 
-        distro = AnsibleDistribution.objects.get(base_path=golden_name)
-        repository_version = distro.repository.latest_version()
-        collection_count = CollectionVersion.objects.filter(
-            pk__in=repository_version.content, is_highest=True
-        ).count()
-
-        partner_count = Namespace.objects.count()
+        collection_count = get_collection_count(golden_name)
+        partner_count = get_partner_count()
 
         # If there are no partners dont show the recommendation for it
         recommendations = {}
-        if partner_count > 0:
-            namespace = sample(list(Namespace.objects.all()), 1)[0]
+        namespace = get_random_partner(partner_count) if partner_count > 0 else None
+        if namespace is not None:
             recommendations = {
                 "recs": [
                     {
@@ -1,4 +1,3 @@
-from galaxy_ng.app import models
 from pulpcore.plugin.util import get_objects_for_user
 
 from .namespace import NamespaceViewSet
@@ -10,5 +9,5 @@ class MyNamespaceViewSet(NamespaceViewSet):
             self.request.user,
             ('galaxy.change_namespace', 'galaxy.upload_to_namespace'),
             any_perm=True,
-            qs=models.Namespace.objects.all()
+            qs=super().get_queryset()
         )
@@ -43,7 +43,7 @@ class UserViewSet(
 ):
     serializer_class = serializers.UserSerializer
     model = auth_models.User
-    queryset = auth_models.User.objects.all()
+    queryset = auth_models.User.objects.prefetch_related("groups", "social_auth")
     filter_backends = (DjangoFilterBackend,)
     filterset_class = UserFilter
     permission_classes = [access_policy.UserAccessPolicy]
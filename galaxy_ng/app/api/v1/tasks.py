@@ -9,12 +9,11 @@ import uuid
 
 from django.db import transaction
 
-from ansible.module_utils.compat.version import LooseVersion
-
 from galaxy_importer.config import Config
 from galaxy_importer.legacy_role import import_legacy_role
 
 from galaxy_ng.app.models.auth import User
+from galaxy_ng.app.common.instrumentation import instrument_task, task_items, task_phase
 from galaxy_ng.app.models import Namespace
 from galaxy_ng.app.utils.galaxy import upstream_role_iterator
 from galaxy_ng.app.utils.legacy import process_namespace
@@ -25,6 +24,7 @@ from galaxy_ng.app.api.v1.models import LegacyNamespace
 from galaxy_ng.app.api.v1.models import LegacyRole
 from galaxy_ng.app.api.v1.models import LegacyRoleDownloadCount
 from galaxy_ng.app.api.v1.models import LegacyRoleImport
+from galaxy_ng.app.api.v1.utils import loose_version
 from galaxy_ng.app.api.v1.utils import sort_versions
 from galaxy_ng.app.api.v1.utils import parse_version_tag
 
@@ -197,7 +197,7 @@ def normalize_versions(versions):
         if not version.get('tag'):
             versions.remove(version)
             continue
-        lver = LooseVersion(version['tag'].lower())
+        lver = loose_version(version['tag'].lower())
         if not any(isinstance(x, int) for x in lver.version):
             versions.remove(version)
 
@@ -267,6 +267,7 @@ def compute_all_versions(this_role, gitrepo):
     return versions
 
 
+@instrument_task("legacy_role_import")
 def legacy_role_import(
     request_username=None,
     github_user=None,
@@ -405,8 +406,9 @@ def legacy_role_import(
 
         # process the checkout ...
         logger.info('===== CLONING REPO =====')
-        gitrepo, github_reference, last_commit = \
-            do_git_checkout(clone_url, checkout_path, github_reference)
+        with task_phase("clone"):
+            gitrepo, github_reference, last_commit = \
+                do_git_checkout(clone_url, checkout_path, github_reference)
         logger.info('')
 
         # relevant data for this new role version ...
@@ -423,8 +425,11 @@ def legacy_role_import(
         # Parse legacy role with galaxy-importer.
         logger.info('===== LOADING ROLE =====')
         try:
-            importer_config = Config()
-            result = import_legacy_role(checkout_path, namespace.name, importer_config, logger)
+            with task_phase("load"):
+                importer_config = Config()
+                result = import_legacy_role(
+                    checkout_path, namespace.name, importer_config, logger
+                )
         except Exception as e:
             logger.info('')
             logger.error(f'Role loading failed! {str(e)}')
@@ -533,7 +538,8 @@ def legacy_role_import(
         # set the enumerated versions ...
         logger.info('')
         logger.info('===== COMPUTING ROLE VERSIONS ====')
-        new_versions = compute_all_versions(this_role, gitrepo)
+        with task_phase("versions"):
+            new_versions = compute_all_versions(this_role, gitrepo)
         new_full_metadata['versions'] = new_versions
         logger.info('')
 
@@ -548,7 +554,9 @@ def legacy_role_import(
             logger.info('')
 
         logger.info('==== SAVING ROLE ====')
-        this_role.save()
+        with task_phase("persist"):
+            this_role.save()
+        task_items(1)
 
     # bind the role to the import log model
     if import_model:
@@ -561,6 +569,7 @@ def legacy_role_import(
     return this_role
 
 
+@instrument_task("legacy_sync_from_upstream")
 def legacy_sync_from_upstream(
     baseurl=None,
     github_user=None,
@@ -610,7 +619,13 @@ def legacy_sync_from_upstream(
         'limit': limit,
         'start_page': start_page,
     }
-    for ns_data, rdata, rversions in upstream_role_iterator(**iterator_kwargs):
+    upstream_roles = iter(upstream_role_iterator(**iterator_kwargs))
+    while True:
+        with task_phase("fetch"):
+            upstream_role = next(upstream_roles, None)
+        if upstream_role is None:
+            break
+        ns_data, rdata, rversions = upstream_role
 
         # processing a namespace should make owners and set rbac as needed ...
         if ns_data['name'] not in nsmap:
@@ -690,14 +705,16 @@ def legacy_sync_from_upstream(
         new_full_metadata['versions'] = normalize_versions(new_full_metadata['versions'])
         new_full_metadata['versions'] = sort_versions(new_full_metadata['versions'])
 
-        if dict(this_role.full_metadata) != new_full_metadata:
-            with transaction.atomic():
-                this_role.full_metadata = new_full_metadata
-                this_role.save()
+        with task_phase("write"):
+            if dict(this_role.full_metadata) != new_full_metadata:
+                with transaction.atomic():
+                    this_role.full_metadata = new_full_metadata
+                    this_role.save()
 
-        with transaction.atomic():
-            counter, _ = LegacyRoleDownloadCount.objects.get_or_create(legacyrole=this_role)
-            counter.count = role_download_count
-            counter.save()
+            with transaction.atomic():
+                counter, _ = LegacyRoleDownloadCount.objects.get_or_create(legacyrole=this_role)
+                counter.count = role_download_count
+                counter.save()
+        task_items(1)
 
     logger.debug('STOP LEGACY SYNC!')
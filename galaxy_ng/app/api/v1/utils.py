@@ -1,5 +1,10 @@
 import semantic_version
-from ansible.module_utils.compat.version import LooseVersion
+
+
+def loose_version(value):
+    """ansible-core's LooseVersion, imported on use to keep ansible out of the startup."""
+    from ansible.module_utils.compat.version import LooseVersion
+    return LooseVersion(value)
 
 
 def parse_version_tag(value):
@@ -31,7 +36,7 @@ def sort_versions(versions):
     try:
         sorted_versions = sorted(
             versions,
-            key=lambda x: LooseVersion(
+            key=lambda x: loose_version(
                 get_version_tag(x).lower()
             )
         )
@@ -1,4 +1,7 @@
 from .collection import (
+    CollectionChunkedUploadSerializer,
+    CollectionUploadChunkSerializer,
+    CollectionUploadCommitSerializer,
     CollectionUploadSerializer,
 )
 
@@ -26,6 +29,9 @@ from .execution_environment import (
 )
 
 __all__ = (
+    'CollectionChunkedUploadSerializer',
+    'CollectionUploadChunkSerializer',
+    'CollectionUploadCommitSerializer',
     'CollectionUploadSerializer',
     'GroupSummarySerializer',
     'NamespaceSerializer',
@@ -1,6 +1,9 @@
+import hashlib
 import logging
 import mimetypes
+import re
 
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError, _get_error_details
 
@@ -9,6 +12,9 @@ from galaxy_ng.app.api.utils import parse_collection_filename
 
 log = logging.getLogger(__name__)
 
+CONTENT_RANGE_PATTERN = r"^bytes (\d+)-(\d+)/(\d+|[*])$"
+SHA256_PATTERN = r"^[0-9a-fA-F]{64}$"
+
 
 class CollectionUploadSerializer(Serializer):
     """
@@ -46,3 +52,83 @@ class CollectionUploadSerializer(Serializer):
             "mimetype": (mimetypes.guess_type(filename)[0] or 'application/octet-stream')
         })
         return data
+
+
+class CollectionChunkedUploadSerializer(Serializer):
+    """
+    A serializer for starting and describing a resumable, chunked collection upload.
+    """
+
+    id = serializers.UUIDField(source="upload_id", read_only=True)
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(source="upload.size", min_value=1)
+    received = serializers.SerializerMethodField()
+
+    class Meta():
+        ref_name = "CollectionChunkedUploadSerializer"
+
+    def validate_filename(self, value):
+        try:
+            self.context["filename_tuple"] = parse_collection_filename(value)
+        except ValueError as exc:
+            raise ValidationError(_get_error_details(exc, default_code='invalid'))
+        return value
+
+    def get_received(self, obj):
+        """Return the byte ranges already stored, so a client knows where to resume."""
+        return [
+            {"offset": offset, "size": size}
+            for offset, size in obj.upload.chunks.order_by("offset").values_list("offset", "size")
+        ]
+
+
+class CollectionUploadChunkSerializer(Serializer):
+    """
+    A serializer for a single chunk of a resumable collection upload.
+
+    The position of the chunk is read from the ``Content-Range`` request header.
+    """
+
+    file = serializers.FileField(write_only=True)
+    sha256 = serializers.CharField(required=False, allow_null=True, write_only=True)
+
+    class Meta():
+        ref_name = "CollectionUploadChunkSerializer"
+
+    def validate(self, data):
+        data = super().validate(data)
+
+        content_range = self.context["request"].META.get("HTTP_CONTENT_RANGE", "")
+        match = re.match(CONTENT_RANGE_PATTERN, content_range)
+        if not match:
+            raise ValidationError(_("Invalid or missing content range header."))
+
+        start, end = int(match[1]), int(match[2])
+        if (end - start + 1) != data["file"].size:
+            raise ValidationError(_("Chunk size does not match content range."))
+
+        if end > self.context["upload"].size - 1:
+            raise ValidationError(_("End byte is greater than upload size."))
+
+        if data.get("sha256"):
+            hasher = hashlib.sha256()
+            for block in data["file"].chunks():
+                hasher.update(block)
+            if hasher.hexdigest() != data["sha256"]:
+                raise ValidationError(_("Checksum does not match chunk upload."))
+
+        data["start"] = start
+        return data
+
+
+class CollectionUploadCommitSerializer(Serializer):
+    """
+    A serializer for finishing a resumable collection upload.
+    """
+
+    sha256 = serializers.RegexField(
+        SHA256_PATTERN, error_messages={"invalid": _("Invalid sha256 digest.")}
+    )
+
+    class Meta():
+        ref_name = "CollectionUploadCommitSerializer"
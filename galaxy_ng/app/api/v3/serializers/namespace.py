@@ -18,6 +18,7 @@ from galaxy_ng.app.access_control.fields import (
     UserPermissionField,
     MyPermissionsField
 )
+from galaxy_ng.app.access_control.mixins import prefetch_groups, prefetch_users
 from galaxy_ng.app.api.base import RelatedFieldsBaseSerializer
 
 log = logging.getLogger(__name__)
@@ -75,6 +76,16 @@ class NamespaceLinkSerializer(serializers.ModelSerializer):
         return url
 
 
+class NamespaceListSerializer(serializers.ListSerializer):
+    """Loads the groups and users of all the serialized namespaces with two queries."""
+
+    def to_representation(self, data):
+        data = list(data)
+        prefetch_groups(data)
+        prefetch_users(data)
+        return super().to_representation(data)
+
+
 class NamespaceSerializer(serializers.ModelSerializer):
     links = NamespaceLinkSerializer(many=True, required=False)
     groups = GroupPermissionField(required=False)
@@ -104,6 +115,7 @@ class NamespaceSerializer(serializers.ModelSerializer):
             'metadata_sha256',
             'avatar_sha256',
         )
+        list_serializer_class = NamespaceListSerializer
 
     # replace with a NamespaceNameSerializer and validate_name() ?
     def validate_name(self, name):
@@ -183,3 +195,4 @@ class NamespaceSummarySerializer(NamespaceSerializer):
         )
 
         read_only_fields = ('name', )
+        list_serializer_class = NamespaceListSerializer
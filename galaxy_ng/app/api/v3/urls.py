@@ -83,6 +83,27 @@ container_paths = [
     ),
 ]
 
+# resumable, chunked alternative to the one-shot collection upload
+chunked_upload_paths = [
+    path(
+        "",
+        viewsets.CollectionChunkedUploadViewSet.as_view({"post": "create"}),
+        name="collection-artifact-chunked-upload",
+    ),
+    path(
+        "<uuid:pk>/",
+        viewsets.CollectionChunkedUploadViewSet.as_view(
+            {"get": "retrieve_upload", "put": "upload_chunk"}
+        ),
+        name="collection-artifact-chunked-upload-detail",
+    ),
+    path(
+        "<uuid:pk>/commit/",
+        viewsets.CollectionChunkedUploadViewSet.as_view({"post": "commit_upload"}),
+        name="collection-artifact-chunked-upload-commit",
+    ),
+]
+
 plugin_paths = [
 
     # At the moment Automation Hub on console.redhat.com has a nonstandard configuration
@@ -102,6 +123,10 @@ plugin_paths = [
         viewsets.CollectionUploadViewSet.as_view({"post": "create"}),
         name="collection-artifact-upload",
     ),
+    path(
+        "ansible/content/<path:distro_base_path>/collections/artifacts/uploads/",
+        include(chunked_upload_paths),
+    ),
 ]
 
 if settings.GALAXY_FEATURE_FLAGS['execution_environments']:
@@ -142,6 +167,7 @@ urlpatterns = [
         viewsets.CollectionUploadViewSet.as_view({"post": "create"}),
         name="collection-artifact-upload",
     ),
+    path("artifacts/collections/uploads/", include(chunked_upload_paths)),
 
     # This is the same endpoint as `artifacts/collections/`. It can't be redirected because
     # redirects break on collection publish.
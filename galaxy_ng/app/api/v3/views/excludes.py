@@ -1,6 +1,6 @@
 import yaml
-from django.core.exceptions import ObjectDoesNotExist
 from django.conf import settings
+from django.utils.cache import parse_etags
 
 from galaxy_ng.app import models
 from galaxy_ng.app.access_control import access_policy
@@ -10,28 +10,19 @@ from rest_framework.renderers import (
     BrowsableAPIRenderer,
     JSONRenderer
 )
+from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from yaml.dumper import SafeDumper
 
 
-def get_synclist_excludes(base_path):
-    """Get SyncList that has same name as distro base_path"""
-    try:
-        synclist = models.SyncList.objects.get(name=base_path, policy="exclude")
-        return synclist.collections.all()
-    except ObjectDoesNotExist:
-        return None
-
-
-def serialize_collection_queryset(queryset):
-    """Serialize a Queryset in to a JSONable format."""
-    return queryset is not None and [
-        {
-            "name": "{collection.namespace}.{collection.name}".format(collection=collection)
-        }
-        for collection in queryset.all()
-    ] or []
+def get_synclist(base_path):
+    """Get the exclude SyncList that has same name as distro base_path, without its data."""
+    return (
+        models.SyncList.objects.filter(name=base_path, policy="exclude")
+        .only("pk", "excludes_version")
+        .first()
+    )
 
 
 class RequirementsFileRenderer(BaseRenderer):
@@ -79,8 +70,19 @@ class ExcludesView(api_base.APIView):
     def get(self, request: Request, *args, **kwargs):
         """
         Returns a list of excludes for a given distro.
+
+        The ETag changes with the excludes, clients sending it back in
+        If-None-Match get a 304 until then.
         """
         base_path = self.kwargs.get('path', settings.ANSIBLE_DEFAULT_DISTRIBUTION_PATH)
-        queryset = get_synclist_excludes(base_path)
-        collections_to_exclude = serialize_collection_queryset(queryset)
-        return Response({"collections": collections_to_exclude})
+        synclist = get_synclist(base_path)
+        version = synclist.excludes_etag if synclist else "none"
+
+        etag = f'"{version}-{request.accepted_renderer.format}"'
+        headers = {"ETag": etag}
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        names = synclist.get_excludes() if synclist else []
+        return Response({"collections": [{"name": name} for name in names]}, headers=headers)
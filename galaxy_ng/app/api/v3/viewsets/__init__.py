@@ -1,5 +1,6 @@
 from .collection import (
     CollectionArtifactDownloadView,
+    CollectionChunkedUploadViewSet,
     CollectionUploadViewSet,
     CollectionVersionMoveViewSet,
     CollectionVersionCopyViewSet,
@@ -25,6 +26,7 @@ from .execution_environments import (
 
 __all__ = (
     'CollectionArtifactDownloadView',
+    'CollectionChunkedUploadViewSet',
     'CollectionUploadViewSet',
     'CollectionVersionMoveViewSet',
     'CollectionVersionCopyViewSet',
@@ -1,10 +1,14 @@
 import logging
+import time
+from urllib.parse import parse_qs, urlparse
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db.models import Q, Sum
 from django.http import HttpResponseRedirect, StreamingHttpResponse
-from django.shortcuts import redirect
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import extend_schema
@@ -16,10 +20,12 @@ from pulp_ansible.app.models import (
 
 )
 
-from pulpcore.plugin.models import Content, SigningService, Task, TaskGroup
+from pulpcore.plugin.constants import TASK_STATES
+from pulpcore.plugin.models import Content, SigningService, Task, TaskGroup, Upload
 from pulpcore.plugin.serializers import AsyncOperationResponseSerializer
 from pulpcore.plugin.tasking import dispatch
-from rest_framework import status
+from pulpcore.plugin.util import get_url
+from rest_framework import serializers, status
 from rest_framework.exceptions import APIException, NotFound
 from rest_framework.response import Response
 from pulp_ansible.app.tasks.copy import copy_collection
@@ -27,7 +33,13 @@ from pulp_ansible.app.tasks.copy import copy_collection
 from galaxy_ng.app import models
 from galaxy_ng.app.access_control import access_policy
 from galaxy_ng.app.api import base as api_base
-from galaxy_ng.app.api.v3.serializers import CollectionUploadSerializer
+from galaxy_ng.app.api.utils import parse_collection_filename
+from galaxy_ng.app.api.v3.serializers import (
+    CollectionChunkedUploadSerializer,
+    CollectionUploadChunkSerializer,
+    CollectionUploadCommitSerializer,
+    CollectionUploadSerializer,
+)
 from galaxy_ng.app.common import metrics
 from galaxy_ng.app.common.parsers import AnsibleGalaxy29MultiPartParser
 from galaxy_ng.app.constants import DeploymentMode
@@ -41,39 +53,29 @@ from galaxy_ng.app.tasks import (
 
 log = logging.getLogger(__name__)
 
+# a committed upload can be committed again when the import task didn't succeed,
+# a successful import removes the upload
+_COMMITTABLE = Q(committed=False) | Q(task__state__in=[TASK_STATES.FAILED, TASK_STATES.CANCELED])
 
-class CollectionUploadViewSet(api_base.LocalSettingsMixin,
-                              pulp_ansible_views.CollectionUploadViewSet):
-    permission_classes = [access_policy.CollectionAccessPolicy]
-    parser_classes = [AnsibleGalaxy29MultiPartParser]
-    serializer_class = CollectionUploadSerializer
-
-    def _dispatch_upload_collection_task(self, args=None, kwargs=None, repository=None):
-        """Dispatch a pulp task started on upload of collection version."""
-        context = super().get_serializer_context()
-        request = context.get("request", None)
-
-        kwargs = kwargs or {}
-        kwargs["general_args"] = args
-        kwargs["username"] = request.user.username
-        kwargs["repository_pk"] = repository.pk
-        kwargs['filename_ns'] = self.kwargs.get('filename_ns')
-
-        task_group = TaskGroup.objects.create(description=f"Import collection to {repository.name}")
 
-        if settings.GALAXY_REQUIRE_CONTENT_APPROVAL:
-            return dispatch(import_to_staging, kwargs=kwargs, task_group=task_group)
+def _dispatch_import_task(kwargs, repository, exclusive_resources=None):
+    """Dispatch the galaxy import task for an uploaded collection artifact."""
+    task_group = TaskGroup.objects.create(description=f"Import collection to {repository.name}")
 
-        return dispatch(import_and_auto_approve, kwargs=kwargs, task_group=task_group)
+    if settings.GALAXY_REQUIRE_CONTENT_APPROVAL:
+        import_task = import_to_staging
+    else:
+        import_task = import_and_auto_approve
 
-    # Wrap super().create() so we can create a galaxy_ng.app.models.CollectionImport based on the
-    # the import task and the collection artifact details
+    return dispatch(
+        import_task,
+        kwargs=kwargs,
+        task_group=task_group,
+        exclusive_resources=exclusive_resources,
+    )
 
-    def _get_data(self, request):
-        serializer = CollectionUploadSerializer(data=request.data, context={'request': request})
-        serializer.is_valid(raise_exception=True)
 
-        return serializer.validated_data
+class CollectionUploadPathMixin:
 
     def _get_path(self):
         """Use path from '/content/<path>/v3/' or
@@ -95,6 +97,36 @@ class CollectionUploadViewSet(api_base.LocalSettingsMixin,
 
         return path
 
+
+class CollectionUploadViewSet(CollectionUploadPathMixin,
+                              api_base.LocalSettingsMixin,
+                              pulp_ansible_views.CollectionUploadViewSet):
+    permission_classes = [access_policy.CollectionAccessPolicy]
+    parser_classes = [AnsibleGalaxy29MultiPartParser]
+    serializer_class = CollectionUploadSerializer
+
+    def _dispatch_upload_collection_task(self, args=None, kwargs=None, repository=None):
+        """Dispatch a pulp task started on upload of collection version."""
+        context = super().get_serializer_context()
+        request = context.get("request", None)
+
+        kwargs = kwargs or {}
+        kwargs["general_args"] = args
+        kwargs["username"] = request.user.username
+        kwargs["repository_pk"] = repository.pk
+        kwargs['filename_ns'] = self.kwargs.get('filename_ns')
+
+        return _dispatch_import_task(kwargs, repository)
+
+    # Wrap super().create() so we can create a galaxy_ng.app.models.CollectionImport based on the
+    # the import task and the collection artifact details
+
+    def _get_data(self, request):
+        serializer = CollectionUploadSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+
+        return serializer.validated_data
+
     @extend_schema(
         description="Create an artifact and trigger an asynchronous task to create "
         "Collection content from it.",
@@ -156,6 +188,177 @@ class CollectionUploadViewSet(api_base.LocalSettingsMixin,
         )
 
 
+class CollectionChunkedUploadViewSet(CollectionUploadPathMixin, api_base.GenericViewSet):
+    """Resumable collection uploads.
+
+    ``create`` starts an upload, ``upload_chunk`` stores the chunk described by the
+    ``Content-Range`` header straight into the artifact storage, ``retrieve_upload``
+    lists the byte ranges received so far so an interrupted client can resume and
+    ``commit_upload`` dispatches the same import task as the one-shot upload.
+    """
+    permission_classes = [access_policy.CollectionAccessPolicy]
+    serializer_class = CollectionChunkedUploadSerializer
+
+    def get_queryset(self):
+        return models.CollectionUpload.objects.filter(
+            user=self.request.user
+        ).select_related("upload", "namespace")
+
+    def _get_collection_upload(self):
+        if not hasattr(self, "_collection_upload"):
+            self._collection_upload = get_object_or_404(self.get_queryset(), pk=self.kwargs["pk"])
+        return self._collection_upload
+
+    def _is_committable(self, collection_upload):
+        return models.CollectionUpload.objects.filter(
+            _COMMITTABLE, pk=collection_upload.pk
+        ).exists()
+
+    def _get_data(self, request):
+        if self.action == "create":
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            return {
+                "filename": serializer.context["filename_tuple"],
+                "artifact_filename": serializer.validated_data["filename"],
+                "size": serializer.validated_data["upload"]["size"],
+            }
+
+        collection_upload = self._get_collection_upload()
+        return {"filename": parse_collection_filename(collection_upload.filename)}
+
+    def _get_path(self):
+        if self.action == "create":
+            return super()._get_path()
+        return self._get_collection_upload().distro_base_path
+
+    @extend_schema(
+        description="Start a resumable, chunked collection upload.",
+        summary="Start a collection upload",
+        request=CollectionChunkedUploadSerializer,
+        responses={201: CollectionChunkedUploadSerializer},
+    )
+    def create(self, request, *args, **kwargs):
+        data = self._get_data(request)
+        filename = data["filename"]
+        namespace = get_object_or_404(models.Namespace, name=filename.namespace)
+
+        upload = Upload.objects.create(size=data["size"])
+        collection_upload = models.CollectionUpload.objects.create(
+            upload=upload,
+            namespace=namespace,
+            user=request.user,
+            filename=data["artifact_filename"],
+            distro_base_path=self._get_path(),
+        )
+
+        serializer = self.get_serializer(collection_upload)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def retrieve_upload(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self._get_collection_upload())
+        return Response(serializer.data)
+
+    @extend_schema(
+        description="Store a chunk of a collection upload, the position of the chunk "
+        "is given by the Content-Range header.",
+        summary="Upload a collection chunk",
+        request=CollectionUploadChunkSerializer,
+        responses={200: CollectionChunkedUploadSerializer},
+    )
+    def upload_chunk(self, request, *args, **kwargs):
+        collection_upload = self._get_collection_upload()
+        if not self._is_committable(collection_upload):
+            raise serializers.ValidationError(_("Upload has already been committed."))
+
+        serializer = CollectionUploadChunkSerializer(
+            data=request.data,
+            context={"request": request, "upload": collection_upload.upload},
+        )
+        serializer.is_valid(raise_exception=True)
+
+        collection_upload.append(
+            serializer.validated_data["file"], serializer.validated_data["start"]
+        )
+
+        return Response(self.get_serializer(collection_upload).data)
+
+    @extend_schema(
+        description="Finish a chunked collection upload and trigger an asynchronous task "
+        "to create Collection content from it.",
+        summary="Commit a collection upload",
+        request=CollectionUploadCommitSerializer,
+        responses={202: AsyncOperationResponseSerializer},
+    )
+    def commit_upload(self, request, *args, **kwargs):
+        collection_upload = self._get_collection_upload()
+        filename = parse_collection_filename(collection_upload.filename)
+
+        serializer = CollectionUploadCommitSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        path = collection_upload.distro_base_path
+        repository = get_object_or_404(AnsibleDistribution, base_path=path).repository
+
+        upload = collection_upload.upload
+        received = upload.chunks.aggregate(size=Sum("size"))["size"] or 0
+        if received != upload.size:
+            raise serializers.ValidationError(
+                _("Upload is incomplete, received {received} of {size} bytes.").format(
+                    received=received, size=upload.size
+                )
+            )
+
+        # claim the upload, a concurrent commit of the same upload gets no row
+        committed = models.CollectionUpload.objects.filter(
+            _COMMITTABLE, pk=collection_upload.pk
+        ).update(committed=True)
+        if not committed:
+            raise serializers.ValidationError(_("Upload has already been committed."))
+
+        # same payload pulp_ansible builds for a one-shot upload, with the chunks
+        # referenced by the upload instead of an already created artifact; the
+        # whole file sha256 is checked when the chunks are assembled by the task.
+        kwargs = {
+            "general_args": (
+                CollectionVersion._meta.app_label, "CollectionVersionUploadSerializer"
+            ),
+            "username": request.user.username,
+            "repository_pk": repository.pk,
+            "filename_ns": filename.namespace,
+            "data": {
+                "upload": get_url(collection_upload.upload),
+                "sha256": serializer.validated_data["sha256"],
+                "repository": get_url(repository),
+                "expected_namespace": filename.namespace,
+                "expected_name": filename.name,
+                "expected_version": filename.version,
+            },
+            "context": {"filename": collection_upload.filename},
+        }
+        try:
+            task = _dispatch_import_task(kwargs, repository, exclusive_resources=[upload])
+        except Exception:
+            models.CollectionUpload.objects.filter(pk=collection_upload.pk).update(
+                committed=False
+            )
+            raise
+        models.CollectionUpload.objects.filter(pk=collection_upload.pk).update(task=task)
+
+        pulp_collection_import = PulpCollectionImport.objects.create(task_id=task.pk)
+        models.CollectionImport.objects.create(
+            task_id=pulp_collection_import,
+            created_at=task.pulp_created,
+            namespace=collection_upload.namespace,
+            name=filename.name,
+            version=filename.version,
+        )
+
+        import_obj_url = reverse("galaxy:api:v3:collection-imports-detail",
+                                 kwargs={'pk': str(task.pk), 'path': path})
+        return Response(data={'task': import_obj_url}, status=status.HTTP_202_ACCEPTED)
+
+
 class CollectionArtifactDownloadView(api_base.APIView):
     permission_classes = [access_policy.CollectionAccessPolicy]
     action = 'download'
@@ -166,13 +369,39 @@ class CollectionArtifactDownloadView(api_base.APIView):
     def _get_ansible_distribution(self, base_path):
         return AnsibleDistribution.objects.get(base_path=base_path)
 
+    def _get_preauthenticated_url(self, distro_base_path, filename, url):
+        """Return the content guard signed url, reusing a recently signed one if cached.
+
+        Signed urls are cached per distribution and filename for
+        GALAXY_COLLECTION_DOWNLOAD_URL_CACHE_TTL seconds, never longer than
+        the ``expires`` value embedded by the content guard (if any).
+        """
+        ttl = settings.get("GALAXY_COLLECTION_DOWNLOAD_URL_CACHE_TTL", 0)
+        cache_key = f"galaxy_ng:download_url:{distro_base_path}:{filename}"
+
+        if ttl > 0:
+            signed_url = cache.get(cache_key)
+            if signed_url is not None:
+                return signed_url
+
+        distribution = self._get_ansible_distribution(distro_base_path)
+        signed_url = distribution.content_guard.cast().preauthenticate_url(url)
+
+        if ttl > 0:
+            expires = parse_qs(urlparse(signed_url).query).get("expires")
+            if expires and expires[0].isdigit():
+                ttl = min(ttl, int(expires[0]) - int(time.time()) - 1)
+            if ttl > 0:
+                cache.set(cache_key, signed_url, ttl)
+
+        return signed_url
+
     def get(self, request, *args, **kwargs):
         metrics.collection_artifact_download_attempts.inc()
 
         distro_base_path = self.kwargs['distro_base_path']
         filename = self.kwargs['filename']
         prefix = settings.CONTENT_PATH_PREFIX.strip('/')
-        distribution = self._get_ansible_distribution(distro_base_path)
 
         if settings.ANSIBLE_COLLECT_DOWNLOAD_LOG:
             pulp_ansible_views.CollectionArtifactDownloadView.log_download(
@@ -190,6 +419,7 @@ class CollectionArtifactDownloadView(api_base.APIView):
                 distro_base_path=distro_base_path,
                 filename=filename,
             )
+            distribution = self._get_ansible_distribution(distro_base_path)
             response = self._get_tcp_response(
                 distribution.content_guard.cast().preauthenticate_url(url)
             )
@@ -218,7 +448,7 @@ class CollectionArtifactDownloadView(api_base.APIView):
                 distro_base_path=distro_base_path,
                 filename=filename,
             )
-            return redirect(distribution.content_guard.cast().preauthenticate_url(url))
+            return redirect(self._get_preauthenticated_url(distro_base_path, filename, url))
 
 
 class CollectionRepositoryMixing:
@@ -43,7 +43,9 @@ class NamespaceFilter(filterset.FilterSet):
 
 class NamespaceViewSet(api_base.ModelViewSet):
     lookup_field = "name"
-    queryset = models.Namespace.objects.all()
+    queryset = models.Namespace.objects.select_related(
+        "last_created_pulp_metadata"
+    ).prefetch_related("links")
     serializer_class = serializers.NamespaceSerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = NamespaceFilter
@@ -1,8 +1,10 @@
 import base64
+import hashlib
 import json
 import logging
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 
 from pulpcore.plugin.util import get_objects_for_group
@@ -17,6 +19,7 @@ from galaxy_ng.app.models.auth import Group, User
 DEFAULT_UPSTREAM_REPO_NAME = settings.GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH
 RH_ACCOUNT_SCOPE = 'rh-identity-account'
 SYNCLIST_DEFAULT_POLICY = 'exclude'
+IDENTITY_CACHE_KEY = 'galaxy_ng:rh_identity:{}'
 
 
 log = logging.getLogger(__name__)
@@ -57,6 +60,20 @@ class RHIdentityAuthentication(BaseAuthentication):
         first_name = user.get('first_name', '')
         last_name = user.get('last_name', '')
 
+        ttl = settings.get("GALAXY_RH_IDENTITY_CACHE_TTL", 0)
+        org_id = identity.get('org_id') or identity.get('internal', {}).get('org_id')
+        cache_key = self._identity_cache_key(
+            account, org_id, username, email, first_name, last_name
+        )
+
+        if ttl > 0:
+            user_id = cache.get(cache_key)
+            if user_id is not None:
+                try:
+                    return User.objects.get(pk=user_id), {'rh_identity': header}
+                except User.DoesNotExist:
+                    pass
+
         group, _ = self._ensure_group(RH_ACCOUNT_SCOPE, account)
 
         user = self._ensure_user(
@@ -69,8 +86,17 @@ class RHIdentityAuthentication(BaseAuthentication):
 
         self._ensure_synclists(group)
 
+        if ttl > 0:
+            transaction.on_commit(lambda: cache.set(cache_key, user.pk, ttl))
+
         return user, {'rh_identity': header}
 
+    @staticmethod
+    def _identity_cache_key(*identity):
+        """Key of an identity, changing user details provision the user again."""
+        digest = hashlib.sha256(json.dumps(identity).encode()).hexdigest()
+        return IDENTITY_CACHE_KEY.format(digest)
+
     def _ensure_group(self, account_scope, account):
         """Create a auto group for the account and create a synclist distribution"""
 
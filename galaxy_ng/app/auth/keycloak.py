@@ -1,6 +1,11 @@
+import hashlib
+import hmac
+import os
+
 from requests import post as requests_post
 
 from django.conf import settings
+from django.core.cache import cache
 
 from rest_framework.authentication import BasicAuthentication
 
@@ -12,9 +17,64 @@ from social_core.backends.keycloak import KeycloakOAuth2
 
 from gettext import gettext as _
 
+from galaxy_ng.app.common import metrics
+from galaxy_ng.app.models.auth import User
+
+CREDENTIALS_CACHE_KEY = "galaxy_ng:keycloak_basic_auth:{}"
+# scrypt cost of the cached password hashes, a few tens of milliseconds
+CREDENTIALS_SCRYPT_PARAMS = {"n": 2 ** 14, "r": 8, "p": 1}
+
+
+def _hash_password(password, salt):
+    return hashlib.scrypt(password.encode(), salt=salt, **CREDENTIALS_SCRYPT_PARAMS)
+
 
 class KeycloakBasicAuth(BasicAuthentication):
+    """Basic authentication checking the credentials with a keycloak password grant.
+
+    Successful credentials are remembered as a salted scrypt hash for
+    GALAXY_KEYCLOAK_BASIC_AUTH_CACHE_TTL seconds, never longer than the
+    lifetime of the access token keycloak returned, so that the following
+    requests of the same client don't wait for keycloak.
+    """
+
+    @staticmethod
+    def _cache_key(userid):
+        return CREDENTIALS_CACHE_KEY.format(hashlib.sha256(userid.encode()).hexdigest())
+
+    def _get_cached_user(self, userid, password):
+        cached = cache.get(self._cache_key(userid))
+        if cached is None:
+            metrics.keycloak_basic_auth_cache.labels(result="miss").inc()
+            return None
+
+        user_id, salt, digest = cached
+        if not hmac.compare_digest(_hash_password(password, salt), digest):
+            metrics.keycloak_basic_auth_cache.labels(result="mismatch").inc()
+            return None
+
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        if user is None:
+            cache.delete(self._cache_key(userid))
+            metrics.keycloak_basic_auth_cache.labels(result="miss").inc()
+            return None
+
+        metrics.keycloak_basic_auth_cache.labels(result="hit").inc()
+        return user
+
+    def _cache_credentials(self, userid, password, user, ttl):
+        salt = os.urandom(16)
+        cache.set(
+            self._cache_key(userid), (user.pk, salt, _hash_password(password, salt)), ttl
+        )
+
     def authenticate_credentials(self, userid, password, request=None):
+        ttl = settings.get("GALAXY_KEYCLOAK_BASIC_AUTH_CACHE_TTL", 0)
+        if ttl > 0:
+            user = self._get_cached_user(userid, password)
+            if user is not None:
+                return (user, None)
+
         payload = {
             'client_id': settings.SOCIAL_AUTH_KEYCLOAK_KEY,
             'client_secret': settings.SOCIAL_AUTH_KEYCLOAK_SECRET,
@@ -43,7 +103,8 @@ class KeycloakBasicAuth(BasicAuthentication):
                 strategy = load_strategy(request)
                 backend = KeycloakOAuth2(strategy)
 
-                token_data = backend.user_data(response.json()['access_token'])
+                token = response.json()
+                token_data = backend.user_data(token['access_token'])
 
                 # The django social auth strategy uses data from the JWT token in the
                 # KeycloackOAuth2
@@ -54,10 +115,16 @@ class KeycloakBasicAuth(BasicAuthentication):
                 if user is None:
                     raise exceptions.AuthenticationFailed(_("Authentication failed."))
 
+                ttl = min(ttl, token.get('expires_in') or ttl)
+                if ttl > 0:
+                    self._cache_credentials(userid, password, user, ttl)
+
                 return (user, None)
             except AttributeError:
                 pass
 
         else:
+            # the password may have been changed or the user disabled in keycloak
+            cache.delete(self._cache_key(userid))
             # If keycloak basic auth fails, try regular basic auth.
             return super().authenticate_credentials(userid, password, request)
@@ -12,14 +12,15 @@ class GalaxyLDAPSettings(LDAPSettings):
     _mirror_groups = None
     _cached_groups = None
 
+    # names of the LDAP and current groups of the user logging in, set by the backend
+    login_group_names = None
+
     @property
     def MIRROR_GROUPS(self):
         log.debug("Cached LDAP groups: %s", str(self._cached_groups))
         if settings.get("GALAXY_LDAP_MIRROR_ONLY_EXISTING_GROUPS"):
-            self._cached_groups = (
-                self._cached_groups
-                or set(Group.objects.all().values_list("name", flat=True))
-            )
+            if self._cached_groups is None:
+                self._cached_groups = self._get_existing_groups()
             if isinstance(self._mirror_groups, (set, frozenset)):
                 return self._mirror_groups.union(self._cached_groups)
             else:
@@ -31,6 +32,18 @@ class GalaxyLDAPSettings(LDAPSettings):
     def MIRROR_GROUPS(self, val):
         self._mirror_groups = val
 
+    def _get_existing_groups(self):
+        """
+        Names of the existing groups that can be mirrored.
+
+        Mirroring only looks at the groups the user is in, in LDAP or in the
+        db, so during a login only those are looked up instead of every group.
+        """
+        groups = Group.objects.all()
+        if self.login_group_names is not None:
+            groups = groups.filter(name__in=self.login_group_names)
+        return frozenset(groups.values_list("name", flat=True))
+
 
 class GalaxyLDAPBackend(LDAPBackend):
     """
@@ -40,3 +53,16 @@ class GalaxyLDAPBackend(LDAPBackend):
 
     def __init__(self):
         self.settings = GalaxyLDAPSettings(self.settings_prefix, self.default_settings)
+
+    def get_or_build_user(self, username, ldap_user):
+        user, built = super().get_or_build_user(username, ldap_user)
+
+        # called before the groups are mirrored, a backend is used for a single login
+        if settings.get("GALAXY_LDAP_MIRROR_ONLY_EXISTING_GROUPS"):
+            names = set(ldap_user.group_names)
+            if not built:
+                names.update(user.groups.values_list("name", flat=True))
+            self.settings.login_group_names = names
+            self.settings._cached_groups = None
+
+        return user, built
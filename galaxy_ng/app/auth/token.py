@@ -1,39 +1,92 @@
 import datetime
+import hashlib
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.models import Token
 from rest_framework import exceptions
 
+from galaxy_ng.app.models.auth import User
+
+TOKEN_CACHE_KEY = "galaxy_ng:token:{}"
+
+
+def token_cache_key(key):
+    """Cache key of a token, the token itself is not stored in the cache."""
+    return TOKEN_CACHE_KEY.format(hashlib.sha256(key.encode()).hexdigest())
+
+
+def invalidate_token_cache(key):
+    cache.delete(token_cache_key(key))
+
 
 class ExpiringTokenAuthentication(TokenAuthentication):
+    """Token authentication, expiring the tokens of keycloak users.
+
+    The user id and expiration of valid tokens are cached for
+    GALAXY_TOKEN_CACHE_TTL seconds, so that authenticated requests load the
+    user with a single query and skip the keycloak expiration lookups. The
+    cache is local to each process: that query still checks that the token
+    exists and the user is active, so deleted or regenerated tokens and
+    deactivated users are rejected right away by every process.
+    """
 
     def authenticate_credentials(self, key):
+        ttl = settings.get("GALAXY_TOKEN_CACHE_TTL", 0)
+
+        if ttl > 0:
+            cached = cache.get(token_cache_key(key))
+            if cached is not None:
+                return self._authenticate_cached(key, *cached)
+
         try:
-            token = Token.objects.get(key=key)
+            token = Token.objects.select_related("user").get(key=key)
         except Token.DoesNotExist:
             raise exceptions.AuthenticationFailed('Invalid token')
 
         if not token.user.is_active:
             raise exceptions.AuthenticationFailed('User inactive or deleted')
 
-        # Token expiration only for SOCIAL AUTH users
-        if hasattr(token.user, 'social_auth'):
-            from social_django.models import UserSocialAuth
-            try:
-                token.user.social_auth.get(provider="keycloak")
-                utc_now = timezone.now()
-                # Set default to one day expiration
-                try:
-                    expiry = int(settings.get('GALAXY_TOKEN_EXPIRATION'))
-                    if token.created < utc_now - datetime.timedelta(minutes=expiry):
-                        raise exceptions.AuthenticationFailed('Token has expired')
-                except ValueError:
-                    pass
-                except TypeError:
-                    pass
-            except UserSocialAuth.DoesNotExist:
-                pass
+        expires = self._get_expiration(token)
+        if expires is not None and expires <= timezone.now():
+            raise exceptions.AuthenticationFailed('Token has expired')
+
+        if ttl > 0:
+            cache.set(token_cache_key(key), (token.user_id, token.created, expires), ttl)
 
         return (token.user, token)
+
+    def _authenticate_cached(self, key, user_id, created, expires):
+        if expires is not None and expires <= timezone.now():
+            invalidate_token_cache(key)
+            raise exceptions.AuthenticationFailed('Token has expired')
+
+        try:
+            user = User.objects.get(pk=user_id, is_active=True, auth_token__key=key)
+        except User.DoesNotExist:
+            invalidate_token_cache(key)
+            raise exceptions.AuthenticationFailed('Invalid token or user inactive')
+
+        return (user, Token(key=key, user=user, created=created))
+
+    @staticmethod
+    def _get_expiration(token):
+        """Token expiration only for SOCIAL AUTH users"""
+        if not hasattr(token.user, 'social_auth'):
+            return None
+
+        from social_django.models import UserSocialAuth
+        try:
+            token.user.social_auth.get(provider="keycloak")
+        except UserSocialAuth.DoesNotExist:
+            return None
+
+        # Set default to one day expiration
+        try:
+            expiry = int(settings.get('GALAXY_TOKEN_EXPIRATION'))
+        except (ValueError, TypeError):
+            return None
+
+        return token.created + datetime.timedelta(minutes=expiry)
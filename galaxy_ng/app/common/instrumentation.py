@@ -0,0 +1,129 @@
+"""Duration, phase timing, throughput and query count metrics for galaxy_ng tasks.
+
+The metrics are exported to prometheus and, when running in a pulp worker, saved
+as progress reports of the task:
+
+    @instrument_task("legacy_role_import")
+    def legacy_role_import(...):
+        with task_phase("clone"):
+            ...
+        task_items(1)
+"""
+
+import contextlib
+import contextvars
+import functools
+import logging
+import time
+
+from django.db import connection
+from pulpcore.plugin.constants import TASK_STATES
+from pulpcore.plugin.models import ProgressReport, Task
+
+from galaxy_ng.app.common import metrics
+
+log = logging.getLogger(__name__)
+
+_current_instrumentation = contextvars.ContextVar("galaxy_task_instrumentation", default=None)
+
+
+class TaskInstrumentation:
+    def __init__(self, name):
+        self.name = name
+        self.phases = {}
+        self.items = 0
+        self.queries = 0
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def report(self, duration):
+        metrics.task_duration_seconds.labels(task=self.name).observe(duration)
+        metrics.task_db_queries.labels(task=self.name).observe(self.queries)
+        metrics.task_items_processed.labels(task=self.name).inc(self.items)
+        for phase, seconds in self.phases.items():
+            metrics.task_phase_seconds.labels(task=self.name, phase=phase).observe(seconds)
+
+        rate = self.items / duration if duration else 0
+        summary = (
+            f"Processed {self.items} items in {duration:.2f}s"
+            f" ({rate:.2f} items/s, {self.queries} queries)"
+        )
+        log.info("%s: %s", self.name, summary)
+
+        try:
+            task = Task.current()
+        except Exception:
+            task = None
+        if task is None:
+            return
+
+        reports = [
+            ProgressReport(
+                message=summary,
+                code=f"galaxy.{self.name}",
+                state=TASK_STATES.COMPLETED,
+                total=self.items,
+                done=self.items,
+                task=task,
+            )
+        ]
+        for phase, seconds in self.phases.items():
+            reports.append(
+                ProgressReport(
+                    message=f"Phase {phase}",
+                    code=f"galaxy.{self.name}.{phase}",
+                    state=TASK_STATES.COMPLETED,
+                    done=round(seconds * 1000),
+                    suffix="ms",
+                    task=task,
+                )
+            )
+        ProgressReport.objects.bulk_create(reports)
+
+
+def instrument_task(name):
+    """Decorator recording the duration, phases, items and queries of a task."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            instrumentation = TaskInstrumentation(name)
+            token = _current_instrumentation.set(instrumentation)
+            start = time.perf_counter()
+            try:
+                with connection.execute_wrapper(instrumentation.count_query):
+                    return func(*args, **kwargs)
+            finally:
+                _current_instrumentation.reset(token)
+                try:
+                    instrumentation.report(time.perf_counter() - start)
+                except Exception:
+                    # metrics must never hide the result of the task
+                    log.exception("Could not report the metrics of task %s", name)
+
+        return wrapper
+
+    return decorate
+
+
+@contextlib.contextmanager
+def task_phase(phase):
+    """Adds the time spent in the block to the phase of the running instrumented task."""
+    instrumentation = _current_instrumentation.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if instrumentation is not None:
+            instrumentation.phases[phase] = (
+                instrumentation.phases.get(phase, 0) + time.perf_counter() - start
+            )
+
+
+def task_items(count=1):
+    """Adds to the items processed by the running instrumented task."""
+    instrumentation = _current_instrumentation.get()
+    if instrumentation is not None:
+        instrumentation.items += count
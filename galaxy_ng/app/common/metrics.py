@@ -1,4 +1,4 @@
-from prometheus_client import Counter
+from prometheus_client import Counter, Histogram
 
 
 collection_import_attempts = Counter(
@@ -31,3 +31,68 @@ collection_artifact_download_successes = Counter(
     "galaxy_api_collection_artifact_download_successes",
     "count of successful collection artifact downloads"
 )
+
+api_request_latency_seconds = Histogram(
+    "galaxy_api_request_latency_seconds",
+    "time spent processing api requests, by view",
+    ["view", "method"]
+)
+
+api_request_db_queries = Histogram(
+    "galaxy_api_request_db_queries",
+    "number of SQL queries run by an api request, by view",
+    ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float("inf"))
+)
+
+api_request_db_seconds = Histogram(
+    "galaxy_api_request_db_seconds",
+    "time an api request spent running SQL queries, by view",
+    ["view"]
+)
+
+api_response_size_bytes = Histogram(
+    "galaxy_api_response_size_bytes",
+    "size of api response bodies, by view",
+    ["view"],
+    buckets=(100, 1000, 10000, 100000, 1000000, 10000000, float("inf"))
+)
+
+keycloak_basic_auth_cache = Counter(
+    "galaxy_keycloak_basic_auth_cache",
+    "count of keycloak basic auth credential cache lookups, by result (hit, miss, mismatch)",
+    ["result"]
+)
+
+access_policy_evaluation_seconds = Histogram(
+    "galaxy_access_policy_evaluation_seconds",
+    "time spent evaluating access policies, by view",
+    ["view"]
+)
+
+task_duration_seconds = Histogram(
+    "galaxy_task_duration_seconds",
+    "time spent running galaxy tasks, by task",
+    ["task"],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600, float("inf"))
+)
+
+task_phase_seconds = Histogram(
+    "galaxy_task_phase_seconds",
+    "time spent in each phase of galaxy tasks, by task and phase",
+    ["task", "phase"],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600, float("inf"))
+)
+
+task_db_queries = Histogram(
+    "galaxy_task_db_queries",
+    "number of SQL queries run by galaxy tasks, by task",
+    ["task"],
+    buckets=(10, 100, 1000, 10000, 100000, 1000000, float("inf"))
+)
+
+task_items_processed = Counter(
+    "galaxy_task_items_processed",
+    "count of items processed by galaxy tasks, by task",
+    ["task"]
+)
@@ -0,0 +1,83 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from galaxy_ng.app.access_control.access_policy import get_view_metrics_label
+from galaxy_ng.app.common import metrics
+from galaxy_ng.app.common.profiler import RequestProfiler, should_profile
+
+log = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """Exports per view latency, SQL query count and time, and response size to prometheus.
+
+    Views are labelled by their url pattern, see `get_view_metrics_label`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = {"count": 0, "seconds": 0.0}
+
+        def _count_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries["count"] += 1
+                queries["seconds"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(_count_query):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        view = getattr(request, "_galaxy_metrics_view", "unresolved")
+        metrics.api_request_latency_seconds.labels(view=view, method=request.method).observe(
+            duration
+        )
+        metrics.api_request_db_queries.labels(view=view).observe(queries["count"])
+        metrics.api_request_db_seconds.labels(view=view).observe(queries["seconds"])
+        if not response.streaming:
+            metrics.api_response_size_bytes.labels(view=view).observe(len(response.content))
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+        request._galaxy_metrics_view = get_view_metrics_label(view, request)
+
+
+class RequestProfilerMiddleware:
+    """Profiles a sample of the requests, see `galaxy_ng.app.common.profiler`.
+
+    Only installed when GALAXY_REQUEST_PROFILER_ENABLED is set, the requests are
+    then chosen with the GALAXY_REQUEST_PROFILER_SAMPLE_RATE and
+    GALAXY_REQUEST_PROFILER_URL_PATTERNS dynamic settings.
+    """
+
+    def __init__(self, get_response):
+        if not settings.get("GALAXY_REQUEST_PROFILER_ENABLED", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not should_profile(request.path):
+            return self.get_response(request)
+
+        with RequestProfiler() as profiler:
+            response = self.get_response(request)
+
+        try:
+            path = profiler.write(request, response)
+        except OSError:
+            log.exception("Failed to write the profile of %s", request.path)
+        else:
+            log.info("Profiled %s %s to %s", request.method, request.path, path)
+
+        return response
@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+
+log = logging.getLogger(__name__)
+
+# Longest SQL statement kept in a profile
+MAX_SQL_LENGTH = 2000
+
+# Seconds the sample rate and url patterns are kept per process before the
+# dynamic settings are read again
+SETTINGS_TTL = 30
+
+_settings = {}
+
+
+@lru_cache(maxsize=16)
+def _compile_patterns(patterns):
+    """Compile the url patterns, invalid regexes are logged once and skipped."""
+    compiled = []
+    for pattern in patterns:
+        try:
+            compiled.append(re.compile(pattern))
+        except (re.error, TypeError) as e:
+            log.error("Invalid GALAXY_REQUEST_PROFILER_URL_PATTERNS regex %r: %s", pattern, e)
+    return compiled
+
+
+def _profiler_settings():
+    """The sample rate and compiled url patterns, read again every SETTINGS_TTL seconds.
+
+    GALAXY_REQUEST_PROFILER_SAMPLE_RATE and GALAXY_REQUEST_PROFILER_URL_PATTERNS
+    are dynamic settings, reading them may query redis or the database.
+    """
+    now = time.monotonic()
+    if now >= _settings.get("expires", 0):
+        sample_rate = settings.get("GALAXY_REQUEST_PROFILER_SAMPLE_RATE", 0)
+        patterns = settings.get("GALAXY_REQUEST_PROFILER_URL_PATTERNS", []) if sample_rate else []
+        _settings.update(
+            sample_rate=sample_rate,
+            patterns=_compile_patterns(tuple(patterns or ())),
+            expires=now + SETTINGS_TTL,
+        )
+    return _settings["sample_rate"], _settings["patterns"]
+
+
+def should_profile(path, rng=None):
+    """Whether a request to ``path`` is sampled by the request profiler."""
+    sample_rate, patterns = _profiler_settings()
+    if not sample_rate or not any(p.search(path) for p in patterns):
+        return False
+
+    return (rng or random.random)() < sample_rate
+
+
+def _prune(directory, max_profiles):
+    """Delete the oldest profiles of ``directory`` beyond ``max_profiles``, 0 keeps all."""
+    if not max_profiles:
+        return
+
+    profiles = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".folded"):
+            try:
+                profiles.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+
+    for _, folded_path in sorted(profiles)[:-max_profiles]:
+        for path in (folded_path, folded_path[:-len(".folded")] + ".json"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+
+
+class RequestProfiler:
+    """Samples the stack of the current thread and times its SQL queries.
+
+    Used as a context manager around a request; on exit ``write`` saves the
+    stacks in the folded format (one ``frame;frame;frame count`` line per
+    distinct stack, what flamegraph.pl and speedscope read) and the request
+    information and queries, slowest first, as json.
+    """
+
+    def __init__(self, interval=None):
+        self.interval = interval or settings.get("GALAXY_REQUEST_PROFILER_INTERVAL", 0.005)
+        self.stacks = Counter()
+        self.queries = []
+        self.duration = None
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def _time_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((time.perf_counter() - start, sql))
+
+    def __enter__(self):
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._execute_wrapper = connection.execute_wrapper(self._time_query)
+        self._execute_wrapper.__enter__()
+        self._start = time.perf_counter()
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.duration = time.perf_counter() - self._start
+        self._stop.set()
+        self._sampler.join()
+        self._execute_wrapper.__exit__(*exc_info)
+
+    def write(self, request, response=None, directory=None):
+        """Save the profile of ``request``, returns the path of the folded stacks file."""
+        directory = directory or settings.get("GALAXY_REQUEST_PROFILER_DIR") or os.path.join(
+            settings.WORKING_DIRECTORY, "request_profiles"
+        )
+        os.makedirs(directory, exist_ok=True)
+
+        name = "{}-{}-{}".format(
+            time.strftime("%Y%m%dT%H%M%S"),
+            re.sub(r"[^\w]+", "_", request.path).strip("_")[:100],
+            uuid.uuid4().hex[:8],
+        )
+        folded_path = os.path.join(directory, f"{name}.folded")
+        with open(folded_path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        queries = sorted(self.queries, reverse=True)
+        with open(os.path.join(directory, f"{name}.json"), "w") as f:
+            json.dump({
+                "method": request.method,
+                "path": request.get_full_path(),
+                "view": getattr(request, "_galaxy_metrics_view", None),
+                "status": getattr(response, "status_code", None),
+                "duration": self.duration,
+                "interval": self.interval,
+                "samples": sum(self.stacks.values()),
+                "db_queries": len(queries),
+                "db_seconds": sum(duration for duration, _ in queries),
+                "queries": [
+                    {"seconds": duration, "sql": sql[:MAX_SQL_LENGTH]}
+                    for duration, sql in queries
+                ],
+            }, f, indent=2)
+
+        _prune(directory, settings.get("GALAXY_REQUEST_PROFILER_MAX_PROFILES", 100))
+        return folded_path
@@ -342,7 +342,10 @@ def configure_logging(settings: Dynaconf) -> Dict[str, Any]:
                         "token",
                         "username",
                     ],
+                    "max_size": 64 * 1024,
                     "query": True,
+                    "rules": [],
+                    "sample_rate": 1.0,
                 },
                 "exclude": {
                     "applications": [],
@@ -9,8 +9,20 @@ on the settings model.
 
 The feature is enabled on `dynaconf_hooks.py`
 """
+import re
+
 from dynaconf import Validator
 
+
+def _is_regex_list(patterns):
+    try:
+        for pattern in patterns:
+            re.compile(pattern)
+    except (re.error, TypeError):
+        return False
+    return True
+
+
 DYNAMIC_SETTINGS_SCHEMA = {
     "GALAXY_REQUIRE_CONTENT_APPROVAL": {
         "validator": Validator(is_type_of=bool),
@@ -64,6 +76,27 @@ DYNAMIC_SETTINGS_SCHEMA = {
             "description": "Feature flags for galaxy_ng",
         },
     },
+    "GALAXY_REQUEST_PROFILER_SAMPLE_RATE": {
+        "validator": Validator(gte=0, lte=1),
+        "schema": {
+            "type": "number",
+            "default": 0,
+            "description": "Fraction of the matching requests that are profiled, 0 disables it",
+        }
+    },
+    "GALAXY_REQUEST_PROFILER_URL_PATTERNS": {
+        "validator": Validator(
+            is_type_of=list,
+            condition=_is_regex_list,
+            messages={"condition": "{name} must be a list of valid regular expressions"},
+        ),
+        "schema": {
+            "type": "array",
+            "items": {"type": "string"},
+            "default": [],
+            "description": "Regexes of the request paths the profiler samples",
+        }
+    },
     # For 1816 PR
     "INSIGHTS_TRACKING_STATE": {},
     "AUTOMATION_ANALYTICS_URL": {},
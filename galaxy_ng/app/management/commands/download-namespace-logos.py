@@ -8,7 +8,7 @@ from pulpcore.plugin.constants import TASK_FINAL_STATES, TASK_STATES
 from pulpcore.plugin.tasking import dispatch
 
 from galaxy_ng.app.models import Namespace
-from galaxy_ng.app.tasks.namespaces import _create_pulp_namespace
+from galaxy_ng.app.tasks.namespaces import create_pulp_namespaces_with_avatars
 
 # Set logging_uid, this does not seem to get generated when task called via management command
 django_guid.set_guid(django_guid.utils.generate_guid())
@@ -105,9 +105,6 @@ def download_all_logos(namespace_name=None, only_missing_sha=False):
             last_created_pulp_metadata__avatar_sha256__isnull=True
         )
 
-    for namespace in qs:
-        download_logo = False
-        if namespace._avatar_url:
-            download_logo = True
-
-        _create_pulp_namespace(namespace.pk, download_logo=download_logo)
+    # avatars are downloaded concurrently and the new metadata is added with a
+    # single version per repository, this task already holds every repository lock.
+    create_pulp_namespaces_with_avatars(qs)
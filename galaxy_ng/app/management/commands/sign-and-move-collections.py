@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from pulp_ansible.app.models import AnsibleRepository, CollectionVersion
+from pulpcore.plugin.models import SigningService
+
+from galaxy_ng.app.tasks import call_bulk_sign_and_move_task
+
+
+class Command(BaseCommand):
+    """Signs the collection versions of a repository and moves them to another one.
+
+    One task is dispatched for each batch of collection versions. The task runs the
+    signing service concurrently for the whole batch and moves it in a single
+    repository version.
+
+    Example:
+
+    django-admin sign-and-move-collections --source=staging --destination=published
+    django-admin sign-and-move-collections --source=staging --namespace=foo --batch-size=500
+    """
+
+    def echo(self, message):
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", type=str, help="Source repository name", required=True)
+        parser.add_argument(
+            "--destination",
+            type=str,
+            help="Destination repository name",
+            default=settings.get("GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH", "published"),
+        )
+        parser.add_argument(
+            "--signing-service",
+            type=str,
+            help="Signing service name",
+            default=settings.get("GALAXY_COLLECTION_SIGNING_SERVICE", "ansible-default"),
+        )
+        parser.add_argument(
+            "--namespace", type=str, help="Only the collections of this namespace", default=None
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Collection versions signed and moved by each task",
+            default=100,
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be greater than 0")
+
+        try:
+            source = AnsibleRepository.objects.get(name=options["source"])
+            destination = AnsibleRepository.objects.get(name=options["destination"])
+        except AnsibleRepository.DoesNotExist as e:
+            raise CommandError(str(e))
+
+        try:
+            signing_service = SigningService.objects.get(name=options["signing_service"])
+        except SigningService.DoesNotExist:
+            raise CommandError(f"Signing service {options['signing_service']} not found")
+
+        collection_versions = CollectionVersion.objects.filter(
+            pk__in=source.latest_version().content
+        ).exclude(
+            pk__in=destination.latest_version().content
+        ).order_by("namespace", "name", "pulp_created")
+        if options["namespace"]:
+            collection_versions = collection_versions.filter(namespace=options["namespace"])
+        collection_versions = list(collection_versions)
+
+        batch_size = options["batch_size"]
+        for start in range(0, len(collection_versions), batch_size):
+            batch = collection_versions[start:start + batch_size]
+            task = call_bulk_sign_and_move_task(signing_service, batch, source, destination)
+            self.echo(
+                f"Dispatched task {task.pk} to sign and move {len(batch)} collection versions"
+            )
+
+        self.echo(
+            f"{len(collection_versions)} collection versions will be signed and moved "
+            f"from {source.name} to {destination.name}"
+        )
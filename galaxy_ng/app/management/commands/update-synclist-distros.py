@@ -1,8 +1,13 @@
 import logging
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.utils import timezone
 from pulp_ansible.app.models import AnsibleDistribution, AnsibleRepository
+from pulp_ansible.app.tasks.collectionversion_index import update_index
+from pulpcore.app.util import cache_key
+from pulpcore.cache import Cache
 
 log = logging.getLogger(__name__)
 
@@ -11,10 +16,25 @@ class Command(BaseCommand):
     """This command updates all AnsibleDistribution in the format of #####-synclists
     to point to the published repo.
 
+    The distributions are updated with a single UPDATE, without calling save()
+    on each of them, so their AFTER_UPDATE hooks are skipped and done here
+    instead: pulp_last_updated is set by the update, the content cache of the
+    updated base paths is invalidated, like Distribution.invalidate_cache, and
+    the collection version index of the published repo is updated once, like
+    AnsibleDistribution._update_index does for each distribution.
+
     Example:
     django-admin update-synclist-distros
+    django-admin update-synclist-distros --dry-run
     """
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many distributions would be updated",
+        )
+
     def handle(self, *args, **options):
         log.info(
             "Updating all AnsibleDistribution in the format of #####-synclists "
@@ -23,10 +43,32 @@ class Command(BaseCommand):
 
         published_repo = AnsibleRepository.objects.get(name="published")
 
+        synclist_distros = AnsibleDistribution.objects.filter(base_path__endswith="-synclist")
+        outdated_distros = synclist_distros.exclude(repository=published_repo)
+
+        if options["dry_run"]:
+            total = synclist_distros.count()
+            outdated = outdated_distros.count()
+            if options["verbosity"] > 1:
+                for name in outdated_distros.values_list("name", flat=True).iterator():
+                    self.stdout.write(f"distro to edit: {name}")
+            self.stdout.write(
+                f"{outdated} of {total} synclist distributions would point to "
+                f"{published_repo.name}"
+            )
+            return
+
         with transaction.atomic():
-            synclist_distros = AnsibleDistribution.objects.filter(base_path__endswith="-synclist")
-            for distro in synclist_distros:
-                if not distro.repository or distro.repository.pk != published_repo.pk:
-                    distro.repository = published_repo
-                    distro.save()
-                    log.info("distro edited: %s", distro.name)
+            base_paths = list(outdated_distros.values_list("base_path", flat=True))
+            updated = outdated_distros.update(
+                repository=published_repo, pulp_last_updated=timezone.now()
+            )
+
+        if base_paths:
+            update_index(repository=published_repo, is_latest=True)
+
+        if base_paths and settings.CACHE_ENABLED:
+            Cache().delete(base_key=cache_key(base_paths))
+
+        log.info("distros edited: %s", updated)
+        self.stdout.write(f"{updated} synclist distributions now point to {published_repo.name}")
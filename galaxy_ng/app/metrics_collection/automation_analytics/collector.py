@@ -2,6 +2,10 @@ from django.conf import settings
 
 from galaxy_ng.app.metrics_collection.collector import Collector as BaseCollector
 from galaxy_ng.app.metrics_collection.automation_analytics.package import Package
+from galaxy_ng.app.models import MetricsCollectionState
+
+# key of the persisted watermarks, see MetricsCollectionState
+COLLECTOR_NAME = "automation_analytics"
 
 
 class Collector(BaseCollector):
@@ -41,29 +45,13 @@ class Collector(BaseCollector):
         return auth_valid
 
     def _last_gathering(self):
-        # TODO: Waiting for persistent DB storage in Hub
-        # https://issues.redhat.com/browse/AAH-2009
-        # return settings.AUTOMATION_ANALYTICS_LAST_GATHER
-        return None
+        return MetricsCollectionState.last_gathering(COLLECTOR_NAME)
 
     def _load_last_gathered_entries(self):
-        # TODO: Waiting for persistent DB storage in Hub
-        # https://issues.redhat.com/browse/AAH-2009
-        # from awx.conf.models import Setting
-        #
-        # last_entries = Setting.objects.filter(key='AUTOMATION_ANALYTICS_LAST_ENTRIES').first()
-        # last_gathered_entries = \
-        #   json.loads((last_entries.value if last_entries is not None else '') or '{}',
-        #               object_hook=datetime_hook)
-        last_gathered_entries = {}
-        return last_gathered_entries
+        return MetricsCollectionState.load_last_gathered_entries(COLLECTOR_NAME)
 
     def _save_last_gathered_entries(self, last_gathered_entries):
-        # TODO: Waiting for persistent DB storage in Hub
-        # https://issues.redhat.com/browse/AAH-2009
-        pass
+        MetricsCollectionState.save_last_gathered_entries(COLLECTOR_NAME, last_gathered_entries)
 
     def _save_last_gather(self):
-        # TODO: Waiting for persistent DB storage in Hub
-        # https://issues.redhat.com/browse/AAH-2009
-        pass
+        MetricsCollectionState.save_last_gather(COLLECTOR_NAME, self.gather_until)
@@ -1,7 +1,42 @@
 import os
+from django.conf import settings
 from django.db import connection
-from insights_analytics_collector import CsvFileSplitter, register
+from django.utils.timezone import now
+from insights_analytics_collector import register
 import galaxy_ng.app.metrics_collection.common_data as data
+from galaxy_ng.app.metrics_collection.csv_file_splitter import CsvFileSplitter
+from galaxy_ng.app.metrics_collection.automation_analytics.collector import COLLECTOR_NAME
+from galaxy_ng.app.models import MetricsCollectionState
+
+# Tables exported incrementally are also exported in full on this cadence,
+# so that deleted rows and rows outside the 4 weeks collection window are seen
+FULL_SYNC_INTERVAL_DAYS = settings.get("GALAXY_METRICS_COLLECTION_FULL_SYNC_INTERVAL_DAYS", 7)
+
+
+def incremental_slicing(key, last_gather, full_sync_enabled=False, since=None, until=None):
+    """Exports only the rows changed since the watermark of the collection `key`.
+
+    When a full sync is due, the whole table is exported instead.
+    """
+    if full_sync_enabled:
+        return [(None, now())]
+
+    if since is None:
+        last_entries = MetricsCollectionState.load_last_gathered_entries(COLLECTOR_NAME)
+        since = last_entries.get(key) or last_gather
+
+    return [(since, until or now())]
+
+
+def register_incremental(key, version, description):
+    return register(
+        key,
+        version,
+        format="csv",
+        description=description,
+        fnc_slicing=incremental_slicing,
+        full_sync_interval_days=FULL_SYNC_INTERVAL_DAYS,
+    )
 
 
 @register("config", "1.0", description="General platform configuration.", config=True)
@@ -14,23 +49,22 @@ def instance_info(since, **kwargs):
     return data.instance_info()
 
 
-@register("collections", "1.0", format="csv", description="Data on ansible_collection")
+@register_incremental("collections", "1.0", description="Data on ansible_collection")
 def collections(since, full_path, until, **kwargs):
-    query = data.collections_query()
+    query = data.collections_query(since, until)
 
-    return export_to_csv(full_path, "collections", query)
+    return export_to_csv(full_path, "collections", query, since, until)
 
 
-@register(
+@register_incremental(
     "collection_versions",
     "1.0",
-    format="csv",
     description="Data on ansible_collectionversion",
 )
 def collection_versions(since, full_path, until, **kwargs):
-    query = data.collection_versions_query()
+    query = data.collection_versions_query(since, until)
 
-    return export_to_csv(full_path, "collection_versions", query)
+    return export_to_csv(full_path, "collection_versions", query, since, until)
 
 
 @register(
@@ -44,38 +78,35 @@ def collection_version_tags(since, full_path, **kwargs):
     return export_to_csv(full_path, "collection_version_tags", query)
 
 
-@register(
+@register_incremental(
     "collection_tags",
     "1.0",
-    format="csv",
     description="Data on ansible_tag"
 )
-def collection_tags(since, full_path, **kwargs):
-    query = data.collection_tags_query()
-    return export_to_csv(full_path, "collection_tags", query)
+def collection_tags(since, full_path, until, **kwargs):
+    query = data.collection_tags_query(since, until)
+    return export_to_csv(full_path, "collection_tags", query, since, until)
 
 
-@register(
+@register_incremental(
     "collection_version_signatures",
     "1.0",
-    format="csv",
     description="Data on ansible_collectionversionsignature",
 )
-def collection_version_signatures(since, full_path, **kwargs):
-    query = data.collection_version_signatures_query()
+def collection_version_signatures(since, full_path, until, **kwargs):
+    query = data.collection_version_signatures_query(since, until)
 
-    return export_to_csv(full_path, "collection_version_signatures", query)
+    return export_to_csv(full_path, "collection_version_signatures", query, since, until)
 
 
-@register(
+@register_incremental(
     "signing_services",
     "1.0",
-    format="csv",
     description="Data on core_signingservice"
 )
-def signing_services(since, full_path, **kwargs):
-    query = data.signing_services_query()
-    return export_to_csv(full_path, "signing_services", query)
+def signing_services(since, full_path, until, **kwargs):
+    query = data.signing_services_query(since, until)
+    return export_to_csv(full_path, "signing_services", query, since, until)
 
 
 # @register(
@@ -93,48 +124,47 @@ def signing_services(since, full_path, **kwargs):
 #     return _simple_csv(full_path, "ansible_collectionimport", source_query)
 #
 
-@register(
+@register_incremental(
     "collection_download_logs",
     "1.0",
-    format="csv",
     description="Data from ansible_downloadlog"
 )
 def collection_download_logs(since, full_path, until, **kwargs):
-    query = data.collection_downloads_query()
-    return export_to_csv(full_path, "collection_download_logs", query)
+    query = data.collection_downloads_query(since, until)
+    return export_to_csv(full_path, "collection_download_logs", query, since, until)
 
 
-@register(
+@register_incremental(
     "collection_download_counts",
     "1.0",
-    format="csv",
     description="Data from ansible_collectiondownloadcount"
 )
 def collection_download_counts(since, full_path, until, **kwargs):
-    query = data.collection_download_counts_query()
-    return export_to_csv(full_path, "collection_download_counts", query)
+    query = data.collection_download_counts_query(since, until)
+    return export_to_csv(full_path, "collection_download_counts", query, since, until)
 
 
 def _get_csv_splitter(file_path, max_data_size=209715200):
     return CsvFileSplitter(filespec=file_path, max_file_size=max_data_size)
 
 
-def export_to_csv(full_path, file_name, query):
+def export_to_csv(full_path, file_name, query, since=None, until=None):
     copy_query = f"""COPY (
     {query}
     ) TO STDOUT WITH CSV HEADER
     """
-    return _simple_csv(full_path, file_name, copy_query, max_data_size=209715200)
+    params = {"since": since, "until": until} if since or until else None
+    return _simple_csv(full_path, file_name, copy_query, max_data_size=209715200, params=params)
 
 
-def _simple_csv(full_path, file_name, query, max_data_size=209715200):
+def _simple_csv(full_path, file_name, query, max_data_size=209715200, params=None):
     file_path = _get_file_path(full_path, file_name)
     tfile = _get_csv_splitter(file_path, max_data_size)
 
     with connection.cursor() as cursor:
-        with cursor.copy(query) as copy:
+        with cursor.copy(query, params) as copy:
             while data := copy.read():
-                tfile.write(str(data, 'utf8'))
+                tfile.write(data)
 
     return tfile.file_list()
 
@@ -1,5 +1,9 @@
-from django.db import connection
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, connections
 from insights_analytics_collector import Collector as BaseCollector
+from insights_analytics_collector.collection import Collection
 
 
 class Collector(BaseCollector):
@@ -9,3 +13,35 @@ class Collector(BaseCollector):
     @staticmethod
     def db_connection():
         return connection
+
+    def _gather_csv_collections(self):
+        """Exports the CSV collections (db tables) concurrently, each on its own connection.
+
+        With a single worker the tables are exported one by one and each one is packaged
+        before the next is gathered, so only one table is on disk at a time.
+        """
+        workers = settings.get("GALAXY_METRICS_COLLECTION_EXPORT_WORKERS", 1)
+        if workers <= 1:
+            return super()._gather_csv_collections()
+
+        max_data_size = self._package_class().max_data_size()
+
+        def _gather(collection):
+            # django connections are per thread, close the one opened by this export
+            try:
+                collection.gather(max_data_size)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_gather, self.collections[Collection.COLLECTION_TYPE_CSV]))
+
+        for collection in self.collections[Collection.COLLECTION_TYPE_CSV]:
+            if collection.is_empty() or not collection.gathering_successful:
+                continue
+
+            if len(collection.sub_collections):
+                for sub_collection in collection.sub_collections:
+                    self._add_collection_to_package(sub_collection)
+            else:
+                self._add_collection_to_package(collection)
@@ -69,19 +69,35 @@ def instance_info():
     }
 
 
-def collections_query():
-    return """
+def updated_between(column, since=None, until=None):
+    """WHERE clause limiting an export to the rows changed in the (since, until] interval.
+
+    The values are bound from the `since` and `until` query parameters.
+    """
+    conditions = []
+    if since is not None:
+        conditions.append(f"{column} > %(since)s")
+    if until is not None:
+        conditions.append(f"{column} <= %(until)s")
+    if not conditions:
+        return ""
+    return "WHERE " + " AND ".join(conditions)
+
+
+def collections_query(since=None, until=None):
+    return f"""
         SELECT "ansible_collection"."pulp_id" AS uuid,
                "ansible_collection"."pulp_created",
                "ansible_collection"."pulp_last_updated",
                "ansible_collection"."namespace",
                "ansible_collection"."name"
         FROM "ansible_collection"
+        {updated_between('"ansible_collection"."pulp_last_updated"', since, until)}
     """
 
 
-def collection_versions_query():
-    return """
+def collection_versions_query(since=None, until=None):
+    return f"""
         SELECT "ansible_collectionversion"."content_ptr_id" AS uuid,
                "core_content"."pulp_created",
                "core_content"."pulp_last_updated",
@@ -98,6 +114,7 @@ def collection_versions_query():
         INNER JOIN "core_content" ON (
             "ansible_collectionversion"."content_ptr_id" = "core_content"."pulp_id"
             )
+        {updated_between('"core_content"."pulp_last_updated"', since, until)}
     """
 
 
@@ -110,18 +127,19 @@ def collection_version_tags_query():
     """
 
 
-def collection_tags_query():
-    return """
+def collection_tags_query(since=None, until=None):
+    return f"""
             SELECT pulp_id AS uuid,
                    pulp_created,
                    pulp_last_updated,
                    name
             FROM ansible_tag
+            {updated_between("pulp_last_updated", since, until)}
     """
 
 
-def collection_version_signatures_query():
-    return """
+def collection_version_signatures_query(since=None, until=None):
+    return f"""
         SELECT "ansible_collectionversionsignature".content_ptr_id AS uuid,
                "core_content".pulp_created,
                "core_content".pulp_last_updated,
@@ -133,22 +151,24 @@ def collection_version_signatures_query():
         FROM ansible_collectionversionsignature
         INNER JOIN core_content
             ON core_content.pulp_id = "ansible_collectionversionsignature".content_ptr_id
+        {updated_between("core_content.pulp_last_updated", since, until)}
     """
 
 
-def signing_services_query():
-    return """
+def signing_services_query(since=None, until=None):
+    return f"""
         SELECT pulp_id AS uuid,
                pulp_created,
                pulp_last_updated,
                public_key,
                name
         FROM core_signingservice
+        {updated_between("pulp_last_updated", since, until)}
     """
 
 
-def collection_downloads_query():
-    return """
+def collection_downloads_query(since=None, until=None):
+    return f"""
         SELECT pulp_id AS uuid,
                pulp_created,
                pulp_last_updated,
@@ -157,11 +177,12 @@ def collection_downloads_query():
                extra_data->>'org_id' AS org_id,
                user_agent
         FROM ansible_downloadlog
+        {updated_between("pulp_last_updated", since, until)}
     """
 
 
-def collection_download_counts_query():
-    return """
+def collection_download_counts_query(since=None, until=None):
+    return f"""
         SELECT pulp_id AS uuid,
                pulp_created,
                pulp_last_updated,
@@ -169,4 +190,5 @@ def collection_download_counts_query():
                name,
                download_count
         FROM ansible_collectiondownloadcount
+        {updated_between("pulp_last_updated", since, until)}
     """
@@ -0,0 +1,55 @@
+import os
+
+from insights_analytics_collector import Package
+
+
+class CsvFileSplitter:
+    """Writes the output of `COPY ... TO STDOUT WITH CSV HEADER` into files split by size.
+
+    Same interface as `insights_analytics_collector.CsvFileSplitter`, but the data is
+    written as the raw bytes returned by the database, without decoding and encoding
+    it again. Every chunk written must contain whole rows (psycopg's `Copy.read()`
+    returns one row per call), the first one being the CSV header.
+    """
+
+    def __init__(self, filespec, max_file_size=Package.MAX_DATA_SIZE):
+        self.max_file_size = max_file_size
+        self.filespec = filespec
+        self.files = []
+        self.currentfile = None
+        self.header = None
+        self.counter = 0
+        self.cycle_file()
+
+    def cycle_file(self):
+        """Closes current file, opens new one and writes CSV header"""
+        if self.currentfile:
+            self.currentfile.close()
+        self.counter = 0
+        fname = f"{self.filespec}_split{len(self.files)}"
+        self.currentfile = open(fname, "wb")
+        self.files.append(fname)
+        if self.header:
+            self.counter += self.currentfile.write(self.header)
+
+    def write(self, data):
+        """Writes to file and creates new one if file exceeds threshold"""
+        if self.header is None:
+            self.header = bytes(data)
+        self.counter += self.currentfile.write(data)
+        if self.counter >= self.max_file_size:
+            self.cycle_file()
+
+    def file_list(self):
+        """Returns list of written files"""
+        self.currentfile.close()
+        # Check for an empty dump
+        if self.counter == len(self.header or b""):
+            os.remove(self.files.pop())
+        # If we only have one file, remove the suffix
+        if len(self.files) == 1:
+            filename = self.files.pop()
+            new_filename = filename.replace("_split0", "")
+            os.rename(filename, new_filename)
+            self.files.append(new_filename)
+        return self.files
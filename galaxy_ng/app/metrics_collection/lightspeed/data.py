@@ -1,8 +1,9 @@
 import os
 from django.db import connection
 
-from insights_analytics_collector import CsvFileSplitter, register
+from insights_analytics_collector import register
 import galaxy_ng.app.metrics_collection.common_data as data
+from galaxy_ng.app.metrics_collection.csv_file_splitter import CsvFileSplitter
 
 
 @register("config", "1.0", description="General platform configuration.", config=True)
@@ -202,7 +203,7 @@ def _simple_csv(full_path, file_name, query, max_data_size=209715200):
     with connection.cursor() as cursor:
         with cursor.copy(query) as copy:
             while data := copy.read():
-                tfile.write(str(data, 'utf8'))
+                tfile.write(data)
 
     return tfile.file_list()
 
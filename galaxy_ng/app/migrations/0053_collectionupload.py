@@ -0,0 +1,54 @@
+# Generated by Django 4.2.11 on 2026-10-19 10:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django_lifecycle.mixins
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0107_distribution_hidden"),
+        ("galaxy", "0052_alter_organization_created_by_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CollectionUpload",
+            fields=[
+                (
+                    "upload",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="galaxy_collection_upload",
+                        serialize=False,
+                        to="core.upload",
+                    ),
+                ),
+                ("filename", models.CharField(editable=False, max_length=255)),
+                ("distro_base_path", models.CharField(editable=False, max_length=255)),
+                ("committed", models.BooleanField(default=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "namespace",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="galaxy.namespace",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+            bases=(django_lifecycle.mixins.LifecycleModelMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("galaxy", "0054_metricscollectionstate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="synclist",
+            name="excludes_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.11 on 2026-10-19 18:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0107_distribution_hidden"),
+        ("galaxy", "0055_synclist_excludes_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="collectionupload",
+            name="task",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="core.task",
+            ),
+        ),
+    ]
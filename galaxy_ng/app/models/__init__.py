@@ -1,6 +1,6 @@
 from .aiindex import AIIndexDenyList
 from .auth import Group, User
-from .collectionimport import CollectionImport
+from .collectionimport import CollectionImport, CollectionUpload
 from .config import Setting
 from .container import (
     ContainerDistribution,
@@ -9,6 +9,7 @@ from .container import (
     ContainerRegistryRemote,
     ContainerRegistryRepos,
 )
+from .metricscollection import MetricsCollectionState
 from .namespace import Namespace, NamespaceLink
 from .organization import Organization, Team
 from .synclist import SyncList
@@ -21,6 +22,7 @@ __all__ = (
     "User",
     # collectionimport
     "CollectionImport",
+    "CollectionUpload",
     # config
     "Setting",
     # container
@@ -29,6 +31,8 @@ __all__ = (
     "ContainerNamespace",
     "ContainerRegistryRemote",
     "ContainerRegistryRepos",
+    # metricscollection
+    "MetricsCollectionState",
     # namespace
     "Namespace",
     "NamespaceLink",
@@ -1,13 +1,18 @@
+import os
+
+from django.conf import settings
 from django.db import models
 from django.urls import reverse
 from django_lifecycle import LifecycleModel
 
 from pulp_ansible.app.models import CollectionImport as PulpCollectionImport
+from pulpcore.plugin.models import Task, Upload, UploadChunk
 from .namespace import Namespace
 
 
 __all__ = (
     "CollectionImport",
+    "CollectionUpload",
 )
 
 
@@ -43,3 +48,48 @@ class CollectionImport(LifecycleModel):
 
     def get_absolute_url(self):
         return reverse('galaxy:api:content:collection-import', args=[str(self.task_id)])
+
+
+class CollectionUpload(LifecycleModel):
+    """
+    A resumable, chunked collection upload that has not been committed yet.
+
+    The chunks are stored by the pulp Upload, this model keeps the collection
+    details needed to check permissions and dispatch the import on commit.
+
+    Fields:
+        filename: Collection artifact filename.
+        distro_base_path: Base path of the distribution the collection is uploaded to.
+        committed: Whether the import of the upload has been dispatched.
+        created_at: Upload creation date time.
+
+    Relations:
+        upload: Reference to the pulp upload holding the chunks.
+        namespace: Reference to a namespace.
+        user: User who started the upload.
+        task: Import task dispatched by the last commit.
+    """
+    upload = models.OneToOneField(Upload,
+                                  primary_key=True,
+                                  on_delete=models.CASCADE,
+                                  related_name='galaxy_collection_upload')
+    namespace = models.ForeignKey(Namespace, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    filename = models.CharField(max_length=255, editable=False)
+    distro_base_path = models.CharField(max_length=255, editable=False)
+    committed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    task = models.ForeignKey(Task, null=True, on_delete=models.SET_NULL, related_name='+')
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def append(self, chunk, offset):
+        """Store a chunk of the upload.
+
+        Like Upload.append, but the chunk is copied to the storage in blocks
+        instead of being read in memory.
+        """
+        upload_chunk = UploadChunk(upload=self.upload, offset=offset, size=chunk.size)
+        filename = os.path.basename(upload_chunk.storage_path(""))
+        upload_chunk.file.save(filename, chunk)
@@ -0,0 +1,54 @@
+from django.db import models
+from django.utils.dateparse import parse_datetime
+
+
+class MetricsCollectionState(models.Model):
+    """Bookkeeping of the last successful metrics collection gathering.
+
+    `last_gather` is the end of the interval of the last successful run and
+    `last_gathered_entries` maps each collection key to the end of the interval
+    it was last exported for (its watermark). Keys ending with `_full` hold when
+    the last full snapshot of that collection was exported.
+    """
+
+    collector = models.CharField(max_length=64, unique=True)
+    last_gather = models.DateTimeField(null=True)
+    last_gathered_entries = models.JSONField(default=dict)
+
+    @classmethod
+    def last_gathering(cls, collector):
+        state = cls.objects.filter(collector=collector).first()
+        return state.last_gather if state else None
+
+    @classmethod
+    def load_last_gathered_entries(cls, collector):
+        state = cls.objects.filter(collector=collector).first()
+        if state is None:
+            return {}
+        return {
+            key: parse_datetime(timestamp)
+            for key, timestamp in state.last_gathered_entries.items()
+        }
+
+    @classmethod
+    def save_last_gathered_entries(cls, collector, last_gathered_entries):
+        cls.objects.update_or_create(
+            collector=collector,
+            defaults={
+                "last_gathered_entries": {
+                    key: timestamp.isoformat()
+                    for key, timestamp in last_gathered_entries.items()
+                    if timestamp is not None
+                }
+            },
+        )
+
+    @classmethod
+    def save_last_gather(cls, collector, last_gather):
+        cls.objects.update_or_create(
+            collector=collector,
+            defaults={"last_gather": last_gather},
+        )
+
+    def __str__(self):
+        return f"{self.collector} [{self.last_gather}]"
@@ -1,4 +1,6 @@
+from django.core.cache import cache
 from django.db import models
+from django.db.models import F
 from django_lifecycle import LifecycleModel
 from pulp_ansible.app.models import AnsibleDistribution, AnsibleRepository, Collection
 
@@ -36,3 +38,47 @@ class SyncList(
     )
     collections = models.ManyToManyField(Collection)
     namespaces = models.ManyToManyField(namespace_models.Namespace)
+
+    # bumped (with an UPDATE) each time the collections change, see invalidate_excludes
+    excludes_version = models.PositiveIntegerField(default=0)
+
+    EXCLUDES_CACHE_KEY = "galaxy_ng:synclist_excludes:{}:{}"
+    # the key changes with the version, the timeout only frees unused entries
+    EXCLUDES_CACHE_TTL = 3600
+
+    @property
+    def excludes_etag(self):
+        return f"{self.pk}.{self.excludes_version}"
+
+    def get_excludes(self):
+        """Return the names (namespace.name) of the synclist collections.
+
+        The names are cached per excludes_version, which is stored in the db
+        so that every process sees when the collections change.
+        """
+        key = self.EXCLUDES_CACHE_KEY.format(self.pk, self.excludes_version)
+        names = cache.get(key)
+        if names is None:
+            names = [
+                f"{namespace}.{name}"
+                for namespace, name in self.collections.order_by(
+                    "namespace", "name"
+                ).values_list("namespace", "name")
+            ]
+            cache.set(key, names, self.EXCLUDES_CACHE_TTL)
+        return names
+
+    @classmethod
+    def invalidate_excludes(cls, *pks):
+        if pks:
+            cls.objects.filter(pk__in=pks).update(excludes_version=F("excludes_version") + 1)
+
+    def save(self, *args, **kwargs):
+        # saving an instance loaded before its collections changed must not
+        # write back its old excludes_version
+        if not self._state.adding and not args and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != "excludes_version"
+            ]
+        super().save(*args, **kwargs)
@@ -87,6 +87,8 @@ DEBUG = False
 
 MIDDLEWARE = [
     'django_prometheus.middleware.PrometheusBeforeMiddleware',
+    'galaxy_ng.app.common.middleware.RequestMetricsMiddleware',
+    'galaxy_ng.app.common.middleware.RequestProfilerMiddleware',
     # BEGIN: Pulp standard middleware
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -266,6 +268,44 @@ CONNECTED_ANSIBLE_CONTROLLERS = []
 GALAXY_ENABLE_UNAUTHENTICATED_COLLECTION_ACCESS = False
 GALAXY_ENABLE_UNAUTHENTICATED_COLLECTION_DOWNLOAD = False
 
+# Seconds to reuse a content guard signed download url (standalone mode) for the
+# same distribution and filename, set to 0 to sign every download request.
+GALAXY_COLLECTION_DOWNLOAD_URL_CACHE_TTL = 10
+
+# Seconds the user, group and synclist provisioned for an x-rh-identity
+# (insights mode) are trusted before being checked again, 0 checks every request.
+GALAXY_RH_IDENTITY_CACHE_TTL = 300
+
+# Seconds the user and expiration of a valid api token are cached, so that token
+# authentication loads the user with a single query that also checks the token
+# still exists and the user is active. 0 disables the cache.
+GALAXY_TOKEN_CACHE_TTL = 60
+
+# Seconds successful keycloak basic auth credentials are remembered (as a salted
+# scrypt hash), never longer than the keycloak access token lifetime. 0 sends
+# every basic auth request to keycloak.
+GALAXY_KEYCLOAK_BASIC_AUTH_CACHE_TTL = 60
+
+# Seconds the collection (per repository version) and partner counts of the
+# insights landing page are cached, 0 counts them on every request.
+GALAXY_LANDING_PAGE_STATS_CACHE_TTL = 300
+
+# Installs the request profiler middleware, without it requests don't read the
+# profiler settings below.
+GALAXY_REQUEST_PROFILER_ENABLED = False
+# Fraction (0 to 1) of the requests whose path matches one of the regexes of
+# GALAXY_REQUEST_PROFILER_URL_PATTERNS that are profiled, 0 disables the profiler.
+# Both can be changed at runtime with dynamic settings, each process reads them
+# again every 30 seconds.
+GALAXY_REQUEST_PROFILER_SAMPLE_RATE = 0
+GALAXY_REQUEST_PROFILER_URL_PATTERNS = []
+# Seconds between two stack samples of a profiled request
+GALAXY_REQUEST_PROFILER_INTERVAL = 0.005
+# Where the profiles are written, defaults to WORKING_DIRECTORY/request_profiles
+GALAXY_REQUEST_PROFILER_DIR = None
+# Most profiles kept in GALAXY_REQUEST_PROFILER_DIR, the oldest are deleted, 0 keeps all
+GALAXY_REQUEST_PROFILER_MAX_PROFILES = 100
+
 GALAXY_ENABLE_API_ACCESS_LOG = False
 # Extra AUTOMATED_LOGGING settings are defined on dynaconf_hooks.py
 # to be overridden by the /etc/pulp/settings.py
@@ -380,6 +420,12 @@ GALAXY_METRICS_COLLECTION_REDHAT_USERNAME = None
 GALAXY_METRICS_COLLECTION_REDHAT_PASSWORD = None
 # RH account's org id (required for x-rh-identity auth type)
 GALAXY_METRICS_COLLECTION_ORG_ID = None
+# Automation Analytics exports only the rows changed since the last successful
+# gathering, the full tables are exported again every N days
+GALAXY_METRICS_COLLECTION_FULL_SYNC_INTERVAL_DAYS = 7
+# Number of tables exported at the same time by metrics collection, each
+# on its own database connection
+GALAXY_METRICS_COLLECTION_EXPORT_WORKERS = 1
 
 # When set to True will enable the DYNAMIC settings feature
 # Individual allowed dynamic keys are set on ./dynamic_settings.py
@@ -4,14 +4,16 @@ Those signals are loaded by
 galaxy_ng.app.__init__:PulpGalaxyPluginAppConfig.ready() method.
 """
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from rest_framework.authtoken.models import Token
 from pulp_ansible.app.models import (
     AnsibleDistribution,
     AnsibleRepository,
     Collection,
     AnsibleNamespaceMetadata
 )
-from galaxy_ng.app.models import Namespace
+from galaxy_ng.app.auth.token import invalidate_token_cache
+from galaxy_ng.app.models import Namespace, SyncList, User
 from pulpcore.plugin.models import ContentRedirectContentGuard
 
 
@@ -76,3 +78,43 @@ def associate_namespace_metadata(sender, instance, created, **kwargs):
 
     elif ns.metadata_sha256 != instance.metadata_sha256:
         _update_metadata()
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Deleted (and regenerated) tokens must not be accepted from the token cache."""
+
+    invalidate_token_cache(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_tokens_of_inactive_user(sender, instance, created, **kwargs):
+    """Tokens of deactivated users must not be accepted from the token cache."""
+
+    if not created and not instance.is_active:
+        for key in Token.objects.filter(user=instance).values_list("key", flat=True):
+            invalidate_token_cache(key)
+
+
+@receiver(m2m_changed, sender=SyncList.collections.through)
+def invalidate_synclist_excludes(sender, instance, action, reverse, pk_set, **kwargs):
+    """Bump the excludes version of the synclists whose collections changed."""
+
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            SyncList.invalidate_excludes(instance.pk)
+    elif action in ("post_add", "post_remove"):
+        SyncList.invalidate_excludes(*pk_set)
+    elif action == "pre_clear":
+        SyncList.invalidate_excludes(
+            *SyncList.objects.filter(collections=instance).values_list("pk", flat=True)
+        )
+
+
+@receiver(pre_delete, sender=Collection)
+def invalidate_synclist_excludes_of_collection(sender, instance, **kwargs):
+    """Deleting a collection removes it from the synclists without m2m_changed."""
+
+    SyncList.invalidate_excludes(
+        *SyncList.objects.filter(collections=instance).values_list("pk", flat=True)
+    )
@@ -14,6 +14,7 @@ from pulp_container.app import models as container_models
 
 from galaxy_ng.app.api.ui import serializers
 from galaxy_ng.app import models
+from galaxy_ng.app.common.instrumentation import instrument_task, task_items, task_phase
 
 
 log = logging.getLogger(__name__)
@@ -125,6 +126,7 @@ def create_or_update_remote_container(container_data, registry_pk, request_data)
         _update_distro_readme_and_description(distro, container_data)
 
 
+@instrument_task("index_execution_environments_from_redhat_registry")
 def index_execution_environments_from_redhat_registry(registry_pk, request_data):
     registry = models.ContainerRegistryRemote.objects.get(pk=registry_pk)
     remotes = []
@@ -143,7 +145,8 @@ def index_execution_environments_from_redhat_registry(registry_pk, request_data)
     while True:
         url = CATALOG_API + "?" + urlencode(query, quote_via=quote)
         downloader = registry.get_downloader(url=url)
-        download_result = downloader.fetch()
+        with task_phase("fetch"):
+            download_result = downloader.fetch()
         with open(download_result.path) as fd:
             data = json.load(fd)
             remotes = remotes + _parse_catalog_repositories(data)
@@ -152,6 +155,7 @@ def index_execution_environments_from_redhat_registry(registry_pk, request_data)
             else:
                 break
 
+    task_items(len(remotes))
     for remote in remotes:
         # create a subtask for each remote, so that if one fails, we can throw a usable error
         # message for the user to look at and prevent the rest of the repositories from failing.
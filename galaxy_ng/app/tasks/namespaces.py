@@ -1,24 +1,39 @@
 import aiohttp
 import asyncio
 import contextlib
+import hashlib
+import logging
+import os
+import tempfile
 import xml.etree.cElementTree as et
+from collections import defaultdict
 
+from django.core.cache import cache
 from django.db import transaction
 from django.forms.fields import ImageField
 from django.core.exceptions import ValidationError
 from pulpcore.plugin.files import PulpTemporaryUploadedFile
 
-from pulpcore.plugin.download import HttpDownloader
-
-from pulp_ansible.app.models import AnsibleNamespaceMetadata, AnsibleNamespace
+from pulp_ansible.app.models import (
+    AnsibleNamespace,
+    AnsibleNamespaceMetadata,
+    AnsibleRepository,
+)
 from pulpcore.plugin.tasking import add_and_remove, dispatch
 from pulpcore.plugin.models import RepositoryContent, Artifact, ContentArtifact
 
 from galaxy_ng.app.models import Namespace
 
+log = logging.getLogger(__name__)
 
 MAX_AVATAR_SIZE = 3 * 1024 * 1024  # 3MB
 
+# Number of avatars downloaded at the same time
+AVATAR_DOWNLOAD_CONCURRENCY = 10
+
+# ETag, Last-Modified and sha256 of the last download of an avatar url
+AVATAR_VALIDATORS_CACHE_KEY = "galaxy_ng:namespace_avatar:{url}"
+
 
 def dispatch_create_pulp_namespace_metadata(galaxy_ns, download_logo):
 
@@ -31,7 +46,7 @@ def dispatch_create_pulp_namespace_metadata(galaxy_ns, download_logo):
     )
 
 
-def _download_avatar(url, namespace_name):
+def _avatar_session():
     # User-Agent needs to be added to avoid timing out on throtled servers.
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:71.0)'  # +
@@ -39,59 +54,157 @@ def _download_avatar(url, namespace_name):
     }
     timeout = aiohttp.ClientTimeout(total=None, sock_connect=600, sock_read=600)
     conn = aiohttp.TCPConnector(force_close=True)
-    session = aiohttp.ClientSession(
+    return aiohttp.ClientSession(
         connector=conn, timeout=timeout, headers=headers, requote_redirect_url=False
     )
 
+
+async def _fetch_avatar(session, semaphore, url, validators):
+    """Fetch an avatar, sending a conditional request when it was downloaded before.
+
+    Returns a tuple with the sha256 of the image, the path of the downloaded file
+    (None if the server replied it didn't change) and the new validators.
+    """
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    async with semaphore, session.get(url, headers=headers) as response:
+        if validators and response.status == 304:
+            return validators["sha256"], None, validators
+        response.raise_for_status()
+
+        hasher = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=".", delete=False) as f:
+            try:
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    size += len(chunk)
+                    # Limit size of the avatar to avoid memory issues when validating it
+                    if size > MAX_AVATAR_SIZE:
+                        raise ValidationError(
+                            f"Avatar on {url} larger than {MAX_AVATAR_SIZE / 1024 / 1024}MB"
+                        )
+                    hasher.update(chunk)
+                    f.write(chunk)
+            except BaseException:
+                os.unlink(f.name)
+                raise
+
+        sha256 = hasher.hexdigest()
+        return sha256, f.name, {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": sha256,
+        }
+
+
+def _avatar_artifact(url, sha256, path):
+    """Return the artifact of a downloaded avatar, validating it if it's a new image."""
     try:
-        downloader = HttpDownloader(url, session=session)
-        img = downloader.fetch()
-    except:  # noqa
-        return
+        with contextlib.suppress(Artifact.DoesNotExist):
+            return Artifact.objects.get(sha256=sha256)
+
+        with open(path, "rb") as f:
+            tf = PulpTemporaryUploadedFile.from_file(f)
+            try:
+                ImageField().to_python(tf)
+            except ValidationError:
+                # Not a PIL valid image lets handle SVG case
+                tag = None
+                with contextlib.suppress(et.ParseError):
+                    f.seek(0)
+                    tag = et.parse(f).find(".").tag
+                if tag != '{http://www.w3.org/2000/svg}svg':
+                    raise ValidationError(f"Provided avatar_url {url} is not a valid image")
+
+            # the artifact has to be saved before the file is closed, or s3transfer
+            # will throw an error.
+            artifact = Artifact.init_and_validate(tf)
+            artifact.save()
+
+            return artifact
     finally:
-        asyncio.get_event_loop().run_until_complete(session.close())
+        if path:
+            os.unlink(path)
 
-    # Limit size of the avatar to avoid memory issues when validating it
-    if img.artifact_attributes["size"] > MAX_AVATAR_SIZE:
-        raise ValidationError(
-            f"Avatar for {namespace_name} on {url} larger than {MAX_AVATAR_SIZE / 1024 / 1024}MB"
-        )
 
-    with contextlib.suppress(Artifact.DoesNotExist):
-        return Artifact.objects.get(sha256=img.artifact_attributes["sha256"])
+def _download_avatars(urls):
+    """Download avatars concurrently, each distinct url only once.
 
-    with open(img.path, "rb") as f:
-        tf = PulpTemporaryUploadedFile.from_file(f)
+    Returns a dict of url to Artifact, None when the avatar couldn't be fetched,
+    or the ValidationError raised for an avatar that is too large or not an image.
+    Images that didn't change since the last download (ETag/Last-Modified) or
+    whose sha256 is already stored are not written again.
+    """
+    urls = list(dict.fromkeys(urls))
+
+    validators = {}
+    for url in urls:
+        cached = cache.get(AVATAR_VALIDATORS_CACHE_KEY.format(url=url))
+        # only send a conditional request if the image is still stored
+        if cached and Artifact.objects.filter(sha256=cached["sha256"]).exists():
+            validators[url] = cached
+
+    async def _fetch_all(urls, validators):
+        semaphore = asyncio.Semaphore(AVATAR_DOWNLOAD_CONCURRENCY)
+        async with _avatar_session() as session:
+            return await asyncio.gather(
+                *[_fetch_avatar(session, semaphore, url, validators.get(url)) for url in urls],
+                return_exceptions=True,
+            )
+
+    loop = asyncio.get_event_loop()
+    results = dict(zip(urls, loop.run_until_complete(_fetch_all(urls, validators))))
+
+    # a 304 is a cache miss if the stored image was removed since it was checked,
+    # fetch it again without the validators
+    removed = [
+        url for url, result in results.items()
+        if isinstance(result, tuple) and result[1] is None
+        and not Artifact.objects.filter(sha256=result[0]).exists()
+    ]
+    if removed:
+        results.update(zip(removed, loop.run_until_complete(_fetch_all(removed, {}))))
+
+    avatars = {}
+    for url, result in results.items():
+        if isinstance(result, ValidationError):
+            avatars[url] = result
+            continue
+        if isinstance(result, Exception):
+            log.warning("Failed to download avatar %s: %s", url, result)
+            avatars[url] = None
+            continue
+
+        sha256, path, new_validators = result
         try:
-            ImageField().to_python(tf)
-        except ValidationError:
-            # Not a PIL valid image lets handle SVG case
-            tag = None
-            with contextlib.suppress(et.ParseError):
-                f.seek(0)
-                tag = et.parse(f).find(".").tag
-            if tag != '{http://www.w3.org/2000/svg}svg':
-                raise ValidationError(
-                    f"Provided avatar_url for {namespace_name} on {url} is not a valid image"
-                )
-
-        # the artifact has to be saved before the file is closed, or s3transfer
-        # will throw an error.
-        artifact = Artifact.init_and_validate(tf)
-        artifact.save()
-
-        return artifact
+            avatars[url] = _avatar_artifact(url, sha256, path)
+        except ValidationError as exc:
+            avatars[url] = exc
+            continue
 
+        cache.set(AVATAR_VALIDATORS_CACHE_KEY.format(url=url), new_validators, None)
 
-def _create_pulp_namespace(galaxy_ns_pk, download_logo):
-    # get metadata values
-    galaxy_ns = Namespace.objects.get(pk=galaxy_ns_pk)
-    links = {x.name: x.url for x in galaxy_ns.links.all()}
+    return avatars
 
-    avatar_artifact = None
 
-    if download_logo:
-        avatar_artifact = _download_avatar(galaxy_ns._avatar_url, galaxy_ns.name)
+def _download_avatar(url, namespace_name):
+    avatar = _download_avatars([url])[url]
+    if isinstance(avatar, ValidationError):
+        raise ValidationError(f"Avatar for {namespace_name}: {avatar.message}")
+    return avatar
+
+
+def _create_namespace_metadata(galaxy_ns, avatar_artifact):
+    """Create the pulp metadata of a galaxy namespace.
+
+    Returns the new metadata, or None if the same metadata already existed.
+    """
+    links = {x.name: x.url for x in galaxy_ns.links.all()}
 
     avatar_sha = None
     if avatar_artifact:
@@ -120,44 +233,98 @@ def _create_pulp_namespace(galaxy_ns_pk, download_logo):
         content.touch()
         galaxy_ns.last_created_pulp_metadata = content
         galaxy_ns.save()
+        return None
 
-    else:
-        with transaction.atomic():
-            metadata.save()
-            ContentArtifact.objects.create(
-                artifact=avatar_artifact,
-                content=metadata,
-                relative_path=f"{metadata.name}-avatar"
-            )
-            galaxy_ns.last_created_pulp_metadata = metadata
-            galaxy_ns.save()
-
-        # get list of local repositories that have a collection with the matching
-        # namespace
-        # We're not bothering to determine if the collection is in a distro or the latest
-        # version of a repository because galaxy_ng retains one repo version by default
-        repo_content_qs = (
-            RepositoryContent.objects
-            .select_related("content__ansible_collectionversion")
-            .order_by("repository__pk")
-            .filter(
-                repository__remote=None,
-                content__ansible_collectionversion__namespace=galaxy_ns.name,
-                version_removed=None,
-            )
-            .distinct("repository__pk")
+    with transaction.atomic():
+        metadata.save()
+        ContentArtifact.objects.create(
+            artifact=avatar_artifact,
+            content=metadata,
+            relative_path=f"{metadata.name}-avatar"
         )
+        galaxy_ns.last_created_pulp_metadata = metadata
+        galaxy_ns.save()
 
-        repos = [x.repository for x in repo_content_qs]
+    return metadata
 
-        return dispatch(
-            _add_namespace_metadata_to_repos,
-            kwargs={
-                "namespace_pk": metadata.pk,
-                "repo_list": [x.pk for x in repos],
-            },
-            exclusive_resources=repos
+
+def _get_namespace_repo_pks(namespace_names):
+    """Map each namespace name to the local repositories with a collection in it."""
+    # We're not bothering to determine if the collection is in a distro or the latest
+    # version of a repository because galaxy_ng retains one repo version by default
+    repo_content_qs = (
+        RepositoryContent.objects
+        .filter(
+            repository__remote=None,
+            content__ansible_collectionversion__namespace__in=namespace_names,
+            version_removed=None,
         )
+        .values_list("content__ansible_collectionversion__namespace", "repository__pk")
+        .order_by("repository__pk")
+        .distinct()
+    )
+
+    repo_pks = defaultdict(list)
+    for namespace_name, repo_pk in repo_content_qs:
+        repo_pks[namespace_name].append(repo_pk)
+    return repo_pks
+
+
+def _create_pulp_namespace(galaxy_ns_pk, download_logo):
+    # get metadata values
+    galaxy_ns = Namespace.objects.get(pk=galaxy_ns_pk)
+
+    avatar_artifact = None
+
+    if download_logo:
+        avatar_artifact = _download_avatar(galaxy_ns._avatar_url, galaxy_ns.name)
+
+    metadata = _create_namespace_metadata(galaxy_ns, avatar_artifact)
+    if metadata is None:
+        return
+
+    # get list of local repositories that have a collection with the matching
+    # namespace
+    repo_pks = _get_namespace_repo_pks([galaxy_ns.name])[galaxy_ns.name]
+    repos = list(AnsibleRepository.objects.filter(pk__in=repo_pks))
+
+    return dispatch(
+        _add_namespace_metadata_to_repos,
+        kwargs={
+            "namespace_pk": metadata.pk,
+            "repo_list": [x.pk for x in repos],
+        },
+        exclusive_resources=repos
+    )
+
+
+def create_pulp_namespaces_with_avatars(namespaces):
+    """Create the pulp metadata of many namespaces, downloading their avatars concurrently.
+
+    The new metadata is added with one repository version per repository, so the
+    caller must hold the locks of every local ansible repository.
+    """
+    namespaces = list(namespaces.prefetch_related("links"))
+    avatars = _download_avatars([ns._avatar_url for ns in namespaces if ns._avatar_url])
+
+    new_metadata = {}
+    for galaxy_ns in namespaces:
+        avatar = avatars.get(galaxy_ns._avatar_url)
+        if isinstance(avatar, ValidationError):
+            log.error("Invalid avatar for %s: %s", galaxy_ns.name, avatar.message)
+            continue
+
+        metadata = _create_namespace_metadata(galaxy_ns, avatar)
+        if metadata:
+            new_metadata[galaxy_ns.name] = metadata.pk
+
+    repo_content = defaultdict(list)
+    for namespace_name, repo_pks in _get_namespace_repo_pks(list(new_metadata)).items():
+        for repo_pk in repo_pks:
+            repo_content[repo_pk].append(new_metadata[namespace_name])
+
+    for repo_pk, content in repo_content.items():
+        add_and_remove(repo_pk, add_content_units=content, remove_content_units=[])
 
 
 def _add_namespace_metadata_to_repos(namespace_pk, repo_list):
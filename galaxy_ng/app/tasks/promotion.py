@@ -7,12 +7,28 @@ from pulp_ansible.app.tasks.copy import move_collection
 
 from pulpcore.plugin.models import TaskGroup, SigningService
 
+from galaxy_ng.app.common.instrumentation import instrument_task, task_items, task_phase
+
 
 SIGNING_SERVICE_NAME = settings.get("GALAXY_COLLECTION_SIGNING_SERVICE", "ansible-default")
 AUTO_SIGN = settings.get("GALAXY_AUTO_SIGN_COLLECTIONS", False)
 
 
-def auto_approve(src_repo_pk, cv_pk, ns_pk=None):
+@instrument_task("auto_approve")
+def auto_approve(src_repo_pk, cv_pk=None, ns_pk=None, cv_pk_list=None, ns_pk_list=None):
+    """Approve a batch of collection versions in a single repository version.
+
+    ``cv_pk`` and ``ns_pk`` are still accepted for tasks that were dispatched
+    for a single collection version.
+    """
+    cv_pk_list = list(cv_pk_list or [])
+    if cv_pk:
+        cv_pk_list.append(cv_pk)
+
+    ns_pk_list = list(ns_pk_list or [])
+    if ns_pk:
+        ns_pk_list.append(ns_pk)
+
     published_repos = AnsibleRepository.objects.filter(pulp_labels__pipeline="approved")
     published_pks = list(published_repos.values_list("pk", flat=True))
 
@@ -21,65 +37,70 @@ def auto_approve(src_repo_pk, cv_pk, ns_pk=None):
 
     source_repo = AnsibleRepository.objects.get(pk=src_repo_pk)
 
-    add = [cv_pk]
-    if ns_pk:
-        add.append(ns_pk)
-
-    add_and_remove(
-        src_repo_pk,
-        add_content_units=add,
-        remove_content_units=[],
-    )
+    with task_phase("add"):
+        add_and_remove(
+            src_repo_pk,
+            add_content_units=cv_pk_list + ns_pk_list,
+            remove_content_units=[],
+        )
+    task_items(len(cv_pk_list))
 
     try:
         signing_service = AUTO_SIGN and SigningService.objects.get(name=SIGNING_SERVICE_NAME)
     except SigningService.DoesNotExist:
         raise RuntimeError('Signing %s service not found' % SIGNING_SERVICE_NAME)
 
-    # Sign the collection if auto sign is enabled
+    # Sign the collections if auto sign is enabled
     if AUTO_SIGN:
-        sign(
-            repository_href=source_repo,
-            content_hrefs=[cv_pk],
-            signing_service_href=signing_service.pk
-        )
+        with task_phase("sign"):
+            sign(
+                repository_href=source_repo,
+                content_hrefs=cv_pk_list,
+                signing_service_href=signing_service.pk
+            )
 
     # if source repo isn't staging, don't move it to published repos
     if source_repo.pk in staging_pks:
-        # move the new collection (along with all it's associated objects) into
+        # move the new collections (along with all their associated objects) into
         # all of the approved repos.
         dispatch(
             move_collection,
             exclusive_resources=published_repos,
             shared_resources=[source_repo],
             kwargs={
-                "cv_pk_list": [cv_pk],
+                "cv_pk_list": cv_pk_list,
                 "src_repo_pk": source_repo.pk,
                 "dest_repo_list": published_pks,
             }
         )
 
 
-def call_auto_approve_task(collection_version, repo, ns_pk):
+def call_auto_approve_task(batches, repo):
     """
-    Dispatches the auto approve task
+    Dispatches one auto approve task for each batch of collection versions
+
+    ``batches`` yields the namespace metadata pks and the collection versions of
+    each batch. The task group is finished once all the tasks are dispatched.
     """
     task_group = TaskGroup.current()
 
-    auto_approve_task = dispatch(
-        auto_approve,
-        exclusive_resources=[repo],
-        task_group=task_group,
-        kwargs=dict(
-            cv_pk=collection_version.pk,
-            src_repo_pk=repo.pk,
-            ns_pk=ns_pk,
-        ),
-    )
+    auto_approve_tasks = [
+        dispatch(
+            auto_approve,
+            exclusive_resources=[repo],
+            task_group=task_group,
+            kwargs=dict(
+                cv_pk_list=[collection_version.pk for collection_version in collection_versions],
+                src_repo_pk=repo.pk,
+                ns_pk_list=ns_pks,
+            ),
+        )
+        for ns_pks, collection_versions in batches
+    ]
 
     task_group.finish()
 
-    return auto_approve_task
+    return auto_approve_tasks
 
 
 def call_move_content_task(collection_version, source_repo, dest_repo):
@@ -1,4 +1,5 @@
 import logging
+from collections import defaultdict
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -8,6 +9,7 @@ from pulp_ansible.app.models import AnsibleRepository, CollectionVersion
 from pulpcore.plugin.tasking import general_create, add_and_remove, dispatch
 from pulpcore.plugin.models import Task
 
+from galaxy_ng.app.common.instrumentation import instrument_task, task_items, task_phase
 from galaxy_ng.app.models import Namespace
 
 from .promotion import call_auto_approve_task
@@ -34,6 +36,28 @@ def get_created_collection_versions():
     return created_collection_versions
 
 
+def group_collection_versions_by_namespace(collection_versions):
+    """Group collection versions by namespace so each group is promoted in one batch.
+
+    Namespaces are resolved with a single query. Yields a tuple with the pks of the
+    namespace metadata to promote along with the group (empty if the namespace has
+    none) and the list of collection versions.
+    """
+    groups = defaultdict(list)
+    for collection_version in collection_versions:
+        groups[collection_version.namespace].append(collection_version)
+
+    metadata_pks = dict(
+        Namespace.objects.filter(name__in=groups).values_list(
+            "name", "last_created_pulp_metadata_id"
+        )
+    )
+
+    for namespace, group in groups.items():
+        metadata_pk = metadata_pks.get(namespace)
+        yield ([metadata_pk] if metadata_pk else []), group
+
+
 def _upload_collection(**kwargs):
     # don't add the collection to the repository in general_create, so that
     # we don't have to lock the repo while the import is running
@@ -67,34 +91,37 @@ def _upload_collection(**kwargs):
     return repo
 
 
+@instrument_task("import_to_staging")
 def import_to_staging(username, **kwargs):
     """Import collection version and move to staging repository.
 
     Custom task to call pulpcore's general_create() task then
-    enqueue two tasks to add to staging repo.
+    enqueue one task per namespace to add to staging repo.
 
     This task will not wait for the enqueued tasks to finish.
     """
-    repo = _upload_collection(**kwargs)
+    with task_phase("import"):
+        repo = _upload_collection(**kwargs)
 
     created_collection_versions = get_created_collection_versions()
+    task_items(len(created_collection_versions))
+
+    with task_phase("stage"):
+        for ns_pks, collection_versions in group_collection_versions_by_namespace(
+            created_collection_versions
+        ):
+            dispatch(
+                add_and_remove,
+                exclusive_resources=[repo],
+                kwargs=dict(
+                    add_content_units=[cv.pk for cv in collection_versions] + ns_pks,
+                    repository_pk=repo.pk,
+                    remove_content_units=[],
+                ),
+            )
 
-    for collection_version in created_collection_versions:
-        add = [collection_version.pk]
-        ns = Namespace.objects.get(name=collection_version.namespace)
-        if ns.last_created_pulp_metadata:
-            add.append(ns.last_created_pulp_metadata.pk)
-        dispatch(
-            add_and_remove,
-            exclusive_resources=[repo],
-            kwargs=dict(
-                add_content_units=add,
-                repository_pk=repo.pk,
-                remove_content_units=[],
-            ),
-        )
-
-        if settings.GALAXY_ENABLE_API_ACCESS_LOG:
+    if settings.GALAXY_ENABLE_API_ACCESS_LOG:
+        for collection_version in created_collection_versions:
             _log_collection_upload(
                 username,
                 collection_version.namespace,
@@ -103,6 +130,7 @@ def import_to_staging(username, **kwargs):
             )
 
 
+@instrument_task("import_and_auto_approve")
 def import_and_auto_approve(username, **kwargs):
     """Import collection version and automatically approve.
 
@@ -112,18 +140,19 @@ def import_and_auto_approve(username, **kwargs):
     """
 
     # add the content to the staging repo.
-    repo = _upload_collection(**kwargs)
+    with task_phase("import"):
+        repo = _upload_collection(**kwargs)
 
     created_collection_versions = get_created_collection_versions()
+    task_items(len(created_collection_versions))
 
-    for collection_version in created_collection_versions:
-        ns = Namespace.objects.get(name=collection_version.namespace)
-        ns_pk = None
-        if ns.last_created_pulp_metadata:
-            ns_pk = ns.last_created_pulp_metadata.pk
-        call_auto_approve_task(collection_version, repo, ns_pk)
+    with task_phase("approve"):
+        call_auto_approve_task(
+            group_collection_versions_by_namespace(created_collection_versions), repo
+        )
 
-        if settings.GALAXY_ENABLE_API_ACCESS_LOG:
+    if settings.GALAXY_ENABLE_API_ACCESS_LOG:
+        for collection_version in created_collection_versions:
             _log_collection_upload(
                 username,
                 collection_version.namespace,
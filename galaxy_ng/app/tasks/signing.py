@@ -2,6 +2,7 @@ import logging
 from pulpcore.plugin.tasking import dispatch
 from pulp_ansible.app.tasks.signature import sign
 
+from galaxy_ng.app.common.instrumentation import instrument_task, task_items, task_phase
 from .promotion import move_collection
 
 log = logging.getLogger(__name__)
@@ -13,10 +14,23 @@ def call_sign_and_move_task(signing_service, collection_version, source_repo, de
     This is a wrapper to group sign, copy_content and remove_content tasks
     because those 3 must run in sequence ensuring the same locks.
     """
+    return call_bulk_sign_and_move_task(
+        signing_service, [collection_version], source_repo, dest_repo
+    )
+
+
+def call_bulk_sign_and_move_task(signing_service, collection_versions, source_repo, dest_repo):
+    """Dispatches a single sign and move task for many collection versions
+
+    The signing service runs concurrently for all the collection versions
+    (bounded by ANSIBLE_SIGNING_TASK_LIMITER) and all of them are moved in
+    a single repository version, instead of one task per collection version.
+    """
+    collection_version_pks = [cv.pk for cv in collection_versions]
     log.info(
-        'Signing with `%s` and moving collection version `%s` from `%s` to `%s`',
+        'Signing with `%s` and moving collection versions `%s` from `%s` to `%s`',
         signing_service.name,
-        collection_version.pk,
+        collection_version_pks,
         source_repo.name,
         dest_repo.name
     )
@@ -26,29 +40,47 @@ def call_sign_and_move_task(signing_service, collection_version, source_repo, de
         exclusive_resources=[source_repo, dest_repo],
         kwargs=dict(
             signing_service_pk=signing_service.pk,
-            collection_version_pk=collection_version.pk,
+            collection_version_pks=collection_version_pks,
             source_repo_pk=source_repo.pk,
             dest_repo_pk=dest_repo.pk,
         )
     )
 
 
-def sign_and_move(signing_service_pk, collection_version_pk, source_repo_pk, dest_repo_pk):
-    """Sign collection version and then move to the destination repo"""
+@instrument_task("sign_and_move")
+def sign_and_move(
+    signing_service_pk,
+    source_repo_pk,
+    dest_repo_pk,
+    collection_version_pk=None,
+    collection_version_pks=None,
+):
+    """Sign collection versions and then move them to the destination repo
 
-    # Sign while in the source repository
-    sign(
-        repository_href=source_repo_pk,
-        content_hrefs=[collection_version_pk],
-        signing_service_href=signing_service_pk
-    )
+    ``collection_version_pk`` is still accepted for tasks that were dispatched
+    for a single collection version.
+    """
+    collection_version_pks = list(collection_version_pks or [])
+    if collection_version_pk:
+        collection_version_pks.append(collection_version_pk)
+
+    # Sign while in the source repository, pulp_ansible runs the signing
+    # service concurrently and reports the progress of each signature
+    with task_phase("sign"):
+        sign(
+            repository_href=source_repo_pk,
+            content_hrefs=collection_version_pks,
+            signing_service_href=signing_service_pk
+        )
 
     # Move content from source to destination
-    move_collection(
-        cv_pk_list=[collection_version_pk, ],
-        src_repo_pk=source_repo_pk,
-        dest_repo_list=[dest_repo_pk],
-    )
+    with task_phase("move"):
+        move_collection(
+            cv_pk_list=collection_version_pks,
+            src_repo_pk=source_repo_pk,
+            dest_repo_list=[dest_repo_pk],
+        )
+    task_items(len(collection_version_pks))
 
 
 def call_sign_task(signing_service, repository, content_units):
@@ -0,0 +1,164 @@
+"""Latency and query count measurement for the performance benchmarks.
+
+Results are written as json to GALAXY_BENCHMARK_RESULTS (if set) and, when
+GALAXY_BENCHMARK_BASELINE points to the results of a previous run, compared
+against them. Query counts are deterministic and must not grow; latencies
+may grow up to GALAXY_BENCHMARK_TOLERANCE (a ratio, 0.5 by default) before
+being reported as a regression.
+
+Two result files can also be compared from the command line::
+
+    python -m galaxy_ng.tests.performance.benchmark baseline.json results.json
+"""
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+DEFAULT_ITERATIONS = 20
+DEFAULT_WARMUP = 2
+DEFAULT_TOLERANCE = 0.5
+
+# latency stats that are compared against the baseline
+COMPARED_STATS = ("p50", "p90")
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(__file__),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(client, url, iterations=None, warmup=DEFAULT_WARMUP, **extra):
+    """Request ``url`` with a test client and return its latency and query stats.
+
+    Latencies are in milliseconds. The query count is the one of the last
+    request, after the warmup requests filled the caches.
+    """
+    if iterations is None:
+        iterations = int(os.environ.get("GALAXY_BENCHMARK_ITERATIONS", DEFAULT_ITERATIONS))
+
+    for _ in range(warmup):
+        client.get(url, **extra)
+
+    samples = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.get(url, **extra)
+            samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "url": url,
+        "status": response.status_code,
+        "iterations": iterations,
+        "queries": len(queries),
+        "p50": round(percentile(samples, 50), 3),
+        "p90": round(percentile(samples, 90), 3),
+        "p99": round(percentile(samples, 99), 3),
+        "max": round(max(samples), 3),
+    }
+
+
+def compare_results(baseline, results, tolerance=DEFAULT_TOLERANCE):
+    """Return a list of regressions of ``results`` against ``baseline``."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+
+        if current["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name}: {current['queries']} queries, baseline {previous['queries']}"
+            )
+
+        for stat in COMPARED_STATS:
+            limit = previous[stat] * (1 + tolerance)
+            if current[stat] > limit:
+                regressions.append(
+                    f"{name}: {stat} {current[stat]}ms, baseline {previous[stat]}ms "
+                    f"(+{tolerance:.0%} allowed)"
+                )
+
+    return regressions
+
+
+class BenchmarkResults:
+    """Collects the measures of a benchmark run, writes them and checks the baseline."""
+
+    def __init__(self, **metadata):
+        self.metadata = {"commit": get_commit(), **metadata}
+        self.results = {}
+        self.tolerance = float(os.environ.get("GALAXY_BENCHMARK_TOLERANCE", DEFAULT_TOLERANCE))
+
+        self.baseline = {}
+        baseline_path = os.environ.get("GALAXY_BENCHMARK_BASELINE")
+        if baseline_path:
+            with open(baseline_path) as f:
+                self.baseline = json.load(f)["results"]
+
+    def add(self, name, result):
+        """Store a result and return its regressions against the baseline."""
+        self.results[name] = result
+        return compare_results(self.baseline, {name: result}, tolerance=self.tolerance)
+
+    def as_dict(self):
+        return {**self.metadata, "results": self.results}
+
+    def write(self, path=None):
+        path = path or os.environ.get("GALAXY_BENCHMARK_RESULTS")
+        if not path:
+            return
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=2, sort_keys=True)
+
+    def summary(self):
+        lines = [f"{'benchmark':<32}{'status':>7}{'queries':>9}{'p50':>10}{'p90':>10}{'p99':>10}"]
+        for name, r in sorted(self.results.items()):
+            lines.append(
+                f"{name:<32}{r['status']:>7}{r['queries']:>9}"
+                f"{r['p50']:>10.1f}{r['p90']:>10.1f}{r['p99']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("usage: benchmark.py BASELINE RESULTS", file=sys.stderr)
+        return 2
+
+    with open(argv[0]) as f:
+        baseline = json.load(f)
+    with open(argv[1]) as f:
+        results = json.load(f)
+
+    tolerance = float(os.environ.get("GALAXY_BENCHMARK_TOLERANCE", DEFAULT_TOLERANCE))
+    regressions = compare_results(baseline["results"], results["results"], tolerance)
+    print(f"{baseline.get('commit')} -> {results.get('commit')}")
+    for regression in regressions:
+        print(regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""Replay ansible-galaxy CLI traffic against a running galaxy_ng instance.
+
+The request mix is the one ``ansible-galaxy role install`` and
+``ansible-galaxy collection install`` produce: v1 role lookups by
+owner__username and name, v1 role versions, v3 collection version listings
+and details, and collection artifact downloads. Roles and collections are
+discovered from the server first, so seed it with create-test-collections
+(and legacy roles when GALAXY_ENABLE_LEGACY_ROLES is on) beforehand.
+
+Downloads are redirected to the content app; ``--stub-content-port`` starts
+a stub content app that answers every request with ``--stub-size`` bytes, so
+point CONTENT_ORIGIN of the instance to it to keep pulp-content out of the
+measures::
+
+    python -m galaxy_ng.tests.performance.loadgen \\
+        --server http://localhost:5001/api/galaxy/ --username admin --password admin \\
+        --concurrency 20 --duration 60 --stub-content-port 24817
+
+Throughput and the latency percentiles of each request kind are printed at the
+end, and written as json with ``--output``.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+
+import aiohttp
+from aiohttp import web
+
+from galaxy_ng.tests.performance.benchmark import percentile
+
+# relative weight of each request kind in the replayed traffic
+DEFAULT_MIX = {
+    "role_lookup": 40,
+    "role_versions": 10,
+    "collection_versions": 25,
+    "collection_version": 15,
+    "collection_download": 10,
+}
+
+DISCOVERY_PAGE_SIZE = 100
+
+
+def parse_mix(value):
+    """Parse a "kind=weight,kind=weight" request mix."""
+    mix = {}
+    for item in value.split(","):
+        kind, _, weight = item.partition("=")
+        if kind not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown request kind {kind}")
+        mix[kind] = int(weight)
+    return mix
+
+
+class LoadGenerator:
+    def __init__(self, server, distro="published", concurrency=10, duration=30,
+                 max_requests=None, mix=None, auth=None, headers=None, seed=0):
+        self.server = server.rstrip("/") + "/"
+        self.distro = distro
+        self.concurrency = concurrency
+        self.duration = duration
+        self.max_requests = max_requests
+        self.mix = mix or DEFAULT_MIX
+        self.auth = auth
+        self.headers = headers or {}
+        self.rng = random.Random(seed)
+
+        self.roles = []
+        self.collection_versions = []
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.sent = 0
+        self.elapsed = 0
+
+    def collections_url(self, path=""):
+        return (
+            f"{self.server}v3/plugin/ansible/content/{self.distro}/collections/index/{path}"
+        )
+
+    async def _get_json(self, session, url):
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def discover(self, session):
+        """Find roles and collection versions to request."""
+        if self.mix.get("role_lookup") or self.mix.get("role_versions"):
+            try:
+                data = await self._get_json(
+                    session, f"{self.server}v1/roles/?page_size={DISCOVERY_PAGE_SIZE}"
+                )
+            except aiohttp.ClientResponseError as exc:
+                print(f"v1 roles are not available ({exc.status}), skipping them")
+            else:
+                self.roles = [
+                    (role["id"], role["summary_fields"]["namespace"]["name"], role["name"])
+                    for role in data["results"]
+                ]
+
+        data = await self._get_json(
+            session, self.collections_url(f"?limit={DISCOVERY_PAGE_SIZE}")
+        )
+        for collection in data["data"]:
+            version = await self._get_json(
+                session, self.collections_url(
+                    f"{collection['namespace']}/{collection['name']}"
+                    f"/versions/{collection['highest_version']['version']}/"
+                )
+            )
+            self.collection_versions.append(
+                (collection["namespace"], collection["name"], version["version"],
+                 version["download_url"])
+            )
+
+        kinds = {kind: weight for kind, weight in self.mix.items() if weight > 0}
+        if not self.roles:
+            kinds.pop("role_lookup", None)
+            kinds.pop("role_versions", None)
+        if not self.collection_versions:
+            for kind in ("collection_versions", "collection_version", "collection_download"):
+                kinds.pop(kind, None)
+        if not kinds:
+            raise RuntimeError("Found no roles nor collections to request")
+        self.mix = kinds
+
+    def next_request(self):
+        kind = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+
+        if kind in ("role_lookup", "role_versions"):
+            pk, owner, name = self.rng.choice(self.roles)
+            if kind == "role_lookup":
+                return kind, f"{self.server}v1/roles/?owner__username={owner}&name={name}"
+            return kind, f"{self.server}v1/roles/{pk}/versions/"
+
+        namespace, name, version, download_url = self.rng.choice(self.collection_versions)
+        if kind == "collection_versions":
+            return kind, self.collections_url(f"{namespace}/{name}/versions/?limit=100")
+        if kind == "collection_version":
+            return kind, self.collections_url(f"{namespace}/{name}/versions/{version}/")
+        return kind, download_url
+
+    async def _worker(self, session, deadline):
+        while time.monotonic() < deadline:
+            if self.max_requests is not None and self.sent >= self.max_requests:
+                return
+            self.sent += 1
+
+            kind, url = self.next_request()
+            start = time.perf_counter()
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+                    status = response.status
+            except aiohttp.ClientError:
+                status = None
+            latency = (time.perf_counter() - start) * 1000
+
+            if status is None or status >= 400:
+                self.errors[kind] += 1
+            else:
+                self.samples[kind].append(latency)
+
+    async def run(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(
+            connector=connector, auth=self.auth, headers=self.headers
+        ) as session:
+            await self.discover(session)
+
+            start = time.monotonic()
+            deadline = start + self.duration
+            await asyncio.gather(
+                *[self._worker(session, deadline) for _ in range(self.concurrency)]
+            )
+            self.elapsed = time.monotonic() - start
+
+    def report(self):
+        def stats(samples, errors):
+            result = {"requests": len(samples) + errors, "errors": errors}
+            if samples:
+                result.update({
+                    "p50": round(percentile(samples, 50), 3),
+                    "p90": round(percentile(samples, 90), 3),
+                    "p99": round(percentile(samples, 99), 3),
+                    "max": round(max(samples), 3),
+                })
+            return result
+
+        kinds = {
+            kind: stats(self.samples[kind], self.errors[kind])
+            for kind in sorted(set(self.samples) | set(self.errors))
+        }
+        all_samples = [s for samples in self.samples.values() for s in samples]
+        total = stats(all_samples, sum(self.errors.values()))
+        total["throughput"] = round(total["requests"] / self.elapsed, 3) if self.elapsed else 0
+
+        return {
+            "server": self.server,
+            "concurrency": self.concurrency,
+            "duration": round(self.elapsed, 3),
+            "mix": self.mix,
+            "total": total,
+            "kinds": kinds,
+        }
+
+
+def format_report(report):
+    total = report["total"]
+    lines = [
+        f"{total['requests']} requests in {report['duration']:.1f}s "
+        f"with concurrency {report['concurrency']}: {total['throughput']:.1f} req/s, "
+        f"{total['errors']} errors",
+        f"{'kind':<24}{'requests':>9}{'errors':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}",
+    ]
+    for kind, r in [*report["kinds"].items(), ("total", total)]:
+        lines.append(
+            f"{kind:<24}{r['requests']:>9}{r['errors']:>8}"
+            + "".join(f"{r.get(stat, 0):>10.1f}" for stat in ("p50", "p90", "p99", "max"))
+        )
+    return "\n".join(lines)
+
+
+async def start_stub_content_app(port, size):
+    """Serve ``size`` bytes for any path, standing in for pulp-content."""
+    body = b"\0" * size
+
+    async def handler(request):
+        return web.Response(body=body, content_type="application/gzip")
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, port=port).start()
+    return runner
+
+
+async def _main(args):
+    runner = None
+    if args.stub_content_port:
+        runner = await start_stub_content_app(args.stub_content_port, args.stub_size)
+
+    auth = None
+    if args.username:
+        auth = aiohttp.BasicAuth(args.username, args.password or "")
+    headers = {"User-Agent": "ansible-galaxy/2.15.0 (galaxy_ng loadgen)"}
+    if args.token:
+        headers["Authorization"] = f"Token {args.token}"
+
+    generator = LoadGenerator(
+        args.server,
+        distro=args.distro,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        max_requests=args.requests,
+        mix=args.mix,
+        auth=auth,
+        headers=headers,
+        seed=args.seed,
+    )
+    try:
+        await generator.run()
+    finally:
+        if runner:
+            await runner.cleanup()
+
+    return generator.report()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--server", required=True, help="galaxy api root, ex: http://localhost:5001/api/galaxy/"
+    )
+    parser.add_argument("--distro", default="published", help="distribution base path")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--mix", type=parse_mix, help="ex: role_lookup=40,collection_download=10")
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--token")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stub-content-port", type=int)
+    parser.add_argument("--stub-size", type=int, default=64 * 1024, help="bytes per download")
+    parser.add_argument("--output", help="write the report as json to this file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(_main(args))
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if report["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Seed realistic data volumes for the performance benchmarks.
+
+The data mimics what ``django-admin create-test-collections --strategy faux``
+generates (lowercase alpha names, random x.y.z versions, three of the test
+TAGS and dependencies on previously created collections) plus synthetic
+legacy roles, but it is written straight to the database instead of being
+uploaded, so no import tasks or workers are involved.
+
+All the randomness comes from a seeded generator so the same scale always
+produces the same data and results can be compared across commits.
+"""
+import os
+import random
+import string
+
+from django.conf import settings
+from pulp_ansible.app.models import (
+    AnsibleRepository,
+    Collection,
+    CollectionVersion,
+    Tag,
+)
+
+from galaxy_ng.app.api.v1.models import (
+    LegacyNamespace,
+    LegacyRole,
+    LegacyRoleDownloadCount,
+    LegacyRoleTag,
+)
+from galaxy_ng.app.models import Namespace
+from galaxy_ng.tests.constants import TAGS
+
+# Number of namespaces, collections per namespace, versions per collection,
+# legacy namespaces and roles per legacy namespace at scale 1.
+BASE_VOLUMES = {
+    "namespaces": 10,
+    "collections": 5,
+    "versions": 3,
+    "legacy_namespaces": 20,
+    "roles": 10,
+}
+
+PLATFORMS = ["EL", "Fedora", "Debian", "Ubuntu", "opensuse"]
+
+
+def get_scale():
+    """Multiplier applied to BASE_VOLUMES, from GALAXY_BENCHMARK_SCALE."""
+    return max(int(os.environ.get("GALAXY_BENCHMARK_SCALE", 1)), 1)
+
+
+def get_volumes(scale=None):
+    scale = scale or get_scale()
+    volumes = dict(BASE_VOLUMES)
+    # collections per namespace and versions per collection stay constant,
+    # a bigger scale means more namespaces and more roles.
+    volumes["namespaces"] *= scale
+    volumes["legacy_namespaces"] *= scale
+    return volumes
+
+
+def gen_name(rng, length, taken):
+    """Lowercase alpha name, like fauxfactory.gen_string("alpha", length).lower()."""
+    while True:
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+        if name not in taken:
+            taken.add(name)
+            return name
+
+
+def gen_version(rng):
+    """Same version format as the create-test-collections command."""
+    x = rng.randint(0, 3)
+    y = rng.randint(1, 9)
+    z = rng.randint(0, 9)
+    return f"{x}.{y}.{z}"
+
+
+def gen_versions(rng, count):
+    versions = set()
+    while len(versions) < count:
+        versions.add(gen_version(rng))
+    return sorted(versions, key=lambda v: tuple(int(p) for p in v.split(".")))
+
+
+def gen_description(rng, words=8):
+    return " ".join(gen_name(rng, rng.randint(3, 9), set()) for _ in range(words))
+
+
+def seed_collections(repository=None, volumes=None, seed=0):
+    """Create namespaces and collection versions and add them to ``repository``.
+
+    Defaults to the repository of GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH.
+    Returns the list of created collection versions.
+    """
+    rng = random.Random(seed)
+    volumes = volumes or get_volumes()
+    if repository is None:
+        repository = AnsibleRepository.objects.get(
+            name=settings.GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH
+        )
+
+    tags = {name: Tag.objects.get_or_create(name=name)[0] for name in TAGS}
+
+    namespace_names = set()
+    dependency_pool = []
+    collection_versions = []
+
+    for _ in range(volumes["namespaces"]):
+        namespace = Namespace.objects.create(
+            name=gen_name(rng, 8, namespace_names),
+            company=gen_description(rng, words=2),
+            description=gen_description(rng),
+        )
+
+        collection_names = set()
+        for i in range(volumes["collections"]):
+            name = gen_name(rng, 10, collection_names)
+            collection = Collection.objects.create(namespace=namespace.name, name=name)
+
+            dependencies = {}
+            if i > 2:
+                dependencies = dict(rng.sample(dependency_pool, rng.randint(1, 3)))
+
+            versions = gen_versions(rng, volumes["versions"])
+            for version in versions:
+                collection_version = CollectionVersion.objects.create(
+                    collection=collection,
+                    namespace=namespace.name,
+                    name=name,
+                    version=version,
+                    description=gen_description(rng),
+                    dependencies=dependencies,
+                    requires_ansible=">=2.13",
+                    is_highest=version == versions[-1],
+                    contents=[
+                        {
+                            "name": gen_name(rng, 6, set()),
+                            "content_type": "module",
+                            "description": gen_description(rng, words=4),
+                        }
+                        for _ in range(3)
+                    ],
+                )
+                collection_version.tags.add(*[tags[t] for t in rng.sample(TAGS, 3)])
+                collection_versions.append(collection_version)
+
+            dependency_pool.append((f"{namespace.name}.{name}", "*"))
+
+    with repository.new_version() as new_version:
+        new_version.add_content(
+            CollectionVersion.objects.filter(pk__in=[cv.pk for cv in collection_versions])
+        )
+
+    return collection_versions
+
+
+def seed_legacy_roles(volumes=None, seed=0):
+    """Create legacy namespaces with roles, tags and download counts.
+
+    Returns the list of created roles.
+    """
+    rng = random.Random(seed)
+    volumes = volumes or get_volumes()
+
+    tags = {name: LegacyRoleTag.objects.get_or_create(name=name)[0] for name in TAGS}
+
+    namespace_names = set()
+    roles = []
+
+    for _ in range(volumes["legacy_namespaces"]):
+        github_user = gen_name(rng, 8, namespace_names)
+        namespace = LegacyNamespace.objects.create(
+            name=github_user,
+            company=gen_description(rng, words=2),
+        )
+
+        role_names = set()
+        for _ in range(volumes["roles"]):
+            name = gen_name(rng, 10, role_names)
+            role_tags = rng.sample(TAGS, 3)
+            role = LegacyRole.objects.create(
+                namespace=namespace,
+                name=name,
+                full_metadata={
+                    "github_user": github_user,
+                    "github_repo": f"ansible-role-{name}",
+                    "github_reference": "master",
+                    "description": gen_description(rng),
+                    "tags": role_tags,
+                    "platforms": [
+                        {"name": p, "versions": ["all"]} for p in rng.sample(PLATFORMS, 2)
+                    ],
+                    "versions": [
+                        {"name": v, "version": v, "tag": v}
+                        for v in gen_versions(rng, rng.randint(1, 5))
+                    ],
+                },
+            )
+            role.tags.add(*[tags[t] for t in role_tags])
+            roles.append(role)
+
+    LegacyRoleDownloadCount.objects.bulk_create([
+        LegacyRoleDownloadCount(legacyrole=role, count=rng.randint(0, 100000))
+        for role in roles
+    ])
+
+    return roles
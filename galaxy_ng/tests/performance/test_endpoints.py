@@ -0,0 +1,115 @@
+"""Latency and query count benchmarks of the hot API endpoints.
+
+Not part of the unit tests, run them with::
+
+    GALAXY_BENCHMARK_RESULTS=/tmp/results.json django-admin test galaxy_ng.tests.performance
+
+and compare a later run against those results with GALAXY_BENCHMARK_BASELINE.
+The v1 roles endpoints are only benchmarked when GALAXY_ENABLE_LEGACY_ROLES is set.
+"""
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.test import override_settings
+from django.urls import NoReverseMatch, reverse
+
+from galaxy_ng.app.constants import DeploymentMode
+from galaxy_ng.tests.unit.api.base import BaseTestCase, get_current_ui_url
+
+from . import seed
+from .benchmark import BenchmarkResults, measure
+
+PAGE_SIZE = 10
+
+
+@override_settings(GALAXY_DEPLOYMENT_MODE=DeploymentMode.STANDALONE.value)
+class TestEndpointBenchmarks(BaseTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = BenchmarkResults(scale=seed.get_scale(), volumes=seed.get_volumes())
+
+    @classmethod
+    def tearDownClass(cls):
+        print("\n" + cls.results.summary())
+        cls.results.write()
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.collection_versions = seed.seed_collections()
+        cls.roles = seed.seed_legacy_roles()
+        cls.distro_base_path = settings.GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH
+
+    def benchmark(self, name, url, expected_status=200, **params):
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        result = measure(self.client, url)
+
+        self.assertEqual(result["status"], expected_status, url)
+        self.assertEqual(self.results.add(name, result), [])
+
+    def legacy_url(self, name):
+        try:
+            return reverse(f"galaxy:api:v1:{name}")
+        except NoReverseMatch:
+            self.skipTest("GALAXY_ENABLE_LEGACY_ROLES is not enabled")
+
+    def test_v1_roles_list(self):
+        url = self.legacy_url("legacy_role-list")
+        self.benchmark("v1_roles_list", url, page_size=PAGE_SIZE)
+
+    def test_v1_roles_lookup(self):
+        # what `ansible-galaxy role install owner.name` requests
+        url = self.legacy_url("legacy_role-list")
+        role = self.roles[len(self.roles) // 2]
+        self.benchmark(
+            "v1_roles_lookup", url, owner__username=role.namespace.name, name=role.name
+        )
+
+    def test_v1_roles_search(self):
+        url = self.legacy_url("legacy_role-search")
+        self.benchmark("v1_roles_search", url, keywords="database", page_size=PAGE_SIZE)
+
+    def test_ui_search(self):
+        url = get_current_ui_url("search-view")
+        self.benchmark("ui_search", url, limit=PAGE_SIZE)
+
+    def test_ui_search_keywords(self):
+        url = get_current_ui_url("search-view")
+        self.benchmark("ui_search_keywords", url, keywords="database", limit=PAGE_SIZE)
+
+    def test_v3_collections_list(self):
+        url = reverse(
+            "galaxy:api:v3:collections-list",
+            kwargs={"distro_base_path": self.distro_base_path},
+        )
+        self.benchmark("v3_collections_list", url, limit=PAGE_SIZE)
+
+    def test_v3_collection_versions_list(self):
+        collection_version = self.collection_versions[0]
+        url = reverse(
+            "galaxy:api:v3:collection-versions-list",
+            kwargs={
+                "distro_base_path": self.distro_base_path,
+                "namespace": collection_version.namespace,
+                "name": collection_version.name,
+            },
+        )
+        self.benchmark("v3_collection_versions_list", url, limit=PAGE_SIZE)
+
+    def test_v3_namespaces_list(self):
+        url = reverse("galaxy:api:v3:namespaces-list")
+        self.benchmark("v3_namespaces_list", url, limit=PAGE_SIZE)
+
+    def test_v3_collection_download(self):
+        collection_version = self.collection_versions[0]
+        filename = "{}-{}-{}.tar.gz".format(
+            collection_version.namespace, collection_version.name, collection_version.version
+        )
+        url = reverse(
+            "galaxy:api:v3:collection-artifact-download",
+            kwargs={"distro_base_path": self.distro_base_path, "filename": filename},
+        )
+        self.benchmark("v3_collection_download", url, expected_status=302)
@@ -0,0 +1,37 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from galaxy_ng.app.api.ui.views import landing_page
+from galaxy_ng.app.models import Namespace
+
+
+@override_settings(GALAXY_LANDING_PAGE_STATS_CACHE_TTL=60)
+class TestLandingPageStats(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.namespaces = [Namespace.objects.create(name=f"partner{i}") for i in range(3)]
+
+    def test_partner_count_is_cached(self):
+        self.assertEqual(landing_page.get_partner_count(), 3)
+
+        Namespace.objects.create(name="partner3")
+        with self.assertNumQueries(0):
+            self.assertEqual(landing_page.get_partner_count(), 3)
+
+    def test_random_partner(self):
+        with mock.patch.object(landing_page, "randrange", return_value=1):
+            self.assertEqual(landing_page.get_random_partner(3), self.namespaces[1])
+
+        # a stale count falls back to the first namespace
+        with mock.patch.object(landing_page, "randrange", return_value=5):
+            self.assertEqual(landing_page.get_random_partner(6), self.namespaces[0])
+
+    def test_collection_count_is_cached_per_repository_version(self):
+        count = landing_page.get_collection_count("published")
+
+        # the distribution and the latest repository version are still looked up
+        with self.assertNumQueries(2):
+            self.assertEqual(landing_page.get_collection_count("published"), count)
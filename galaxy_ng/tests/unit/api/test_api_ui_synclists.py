@@ -3,6 +3,7 @@ import unittest
 
 from django.test import override_settings
 from django.conf import settings
+from pulp_ansible.app.models import Collection
 from rest_framework import status as http_code
 
 from galaxy_ng.app.models import auth as auth_models
@@ -103,6 +104,39 @@ class BaseUiSynclistViewSet:
         self.assertEqual(response.data["name"], self.synclist_name)
         self.assertEqual(response.data["policy"], "include")
 
+    def test_synclist_patch_changes(self):
+        ns1 = self._create_namespace("unittestnamespace1", groups=[self.group])
+        ns2 = self._create_namespace("unittestnamespace2", groups=[self.group])
+        collections = [
+            Collection.objects.create(namespace="unittestnamespace1", name=name)
+            for name in ("one", "two", "three")
+        ]
+        self.synclist.collections.set(collections[:2])
+        self.synclist.namespaces.set([ns1])
+
+        synclists_detail_url = base.get_current_ui_url(
+            "synclists-detail", kwargs={"pk": self.synclist.id}
+        )
+        post_data = {
+            "add_collections": [{"namespace": "unittestnamespace1", "name": "three"}],
+            "remove_collections": [{"namespace": "unittestnamespace1", "name": "one"}],
+            "add_namespaces": [ns2.name],
+            "remove_namespaces": [ns1.name],
+        }
+
+        response = self.client.patch(synclists_detail_url, post_data, format="json")
+
+        self.assertEqual(response.status_code, http_code.HTTP_200_OK, msg=response.data)
+        self.assertEqual(
+            sorted(c["name"] for c in response.data["collections"]), ["three", "two"]
+        )
+        self.assertEqual(response.data["namespaces"], [ns2.name])
+
+        post_data = {"add_collections": [{"namespace": "unittestnamespace1", "name": "four"}]}
+        response = self.client.patch(synclists_detail_url, post_data, format="json")
+        self.assertEqual(response.status_code, http_code.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.synclist.collections.count(), 2)
+
     def test_synclist_list(self):
         log.debug('GALAXY_DEPLOYMENT_MODE: %s', settings.GALAXY_DEPLOYMENT_MODE)
 
@@ -243,6 +277,17 @@ class DeniedSynclistViewSet(BaseUiSynclistViewSet):
 
         self.assertEqual(response.status_code, http_code.HTTP_403_FORBIDDEN, msg=response.data)
 
+    def test_synclist_patch_changes(self):
+        post_data = {"add_namespaces": [], "remove_collections": []}
+
+        synclists_detail_url = base.get_current_ui_url(
+            "synclists-detail", kwargs={"pk": self.synclist.id}
+        )
+
+        response = self.client.patch(synclists_detail_url, post_data, format="json")
+
+        self.assertEqual(response.status_code, http_code.HTTP_403_FORBIDDEN, msg=response.data)
+
     def test_synclist_delete(self):
         synclists_detail_url = base.get_current_ui_url(
             "synclists-detail", kwargs={"pk": self.synclist.id}
@@ -1,10 +1,16 @@
 import logging
 from unittest.case import skip
+from unittest.mock import MagicMock, patch
+import hashlib
 from uuid import uuid4
 
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test.utils import override_settings
 from django.urls.base import reverse
 from orionutils.generator import build_collection
+from pulpcore.plugin.constants import TASK_STATES
+from pulpcore.plugin.models import Task
 from pulp_ansible.app.models import (
     AnsibleDistribution,
     AnsibleRepository,
@@ -17,6 +23,8 @@ from pulp_ansible.app.galaxy.v3.views import get_collection_dependents, get_uniq
 from rest_framework import status
 
 from galaxy_ng.app import models
+from galaxy_ng.app.api.v3.viewsets import collection as collection_viewsets
+from galaxy_ng.app.api.v3.viewsets.collection import CollectionArtifactDownloadView
 from galaxy_ng.app.constants import DeploymentMode
 from galaxy_ng.tests.constants import TEST_COLLECTION_CONFIGS
 
@@ -180,6 +188,162 @@ class TestCollectionViewsets(BaseTestCase):
             self.assertEqual(collection[1].status_code, 202)
         # Upload is performed but the collection is not yet imported
 
+    def test_chunked_upload(self):
+        self.client.force_authenticate(user=self.admin_user)
+        filename = f"{self.namespace.name}-{self.collection.name}-2.0.0.tar.gz"
+
+        response = self.client.post(
+            reverse("galaxy:api:v3:collection-artifact-chunked-upload"),
+            {"filename": filename, "size": 10},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["received"], [])
+        upload_id = response.data["id"]
+
+        detail_url = reverse(
+            "galaxy:api:v3:collection-artifact-chunked-upload-detail",
+            kwargs={"pk": upload_id},
+        )
+
+        # content range larger than the upload is refused
+        response = self.client.put(
+            detail_url,
+            {"file": SimpleUploadedFile("chunk", b"0123456789")},
+            HTTP_CONTENT_RANGE="bytes 5-14/10",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.put(
+            detail_url,
+            {"file": SimpleUploadedFile("chunk", b"01234")},
+            HTTP_CONTENT_RANGE="bytes 0-4/10",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # chunk digest is checked when given
+        response = self.client.put(
+            detail_url,
+            {
+                "file": SimpleUploadedFile("chunk", b"56789"),
+                "sha256": hashlib.sha256(b"98765").hexdigest(),
+            },
+            HTTP_CONTENT_RANGE="bytes 5-9/10",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(detail_url)
+        self.assertEqual(response.data["received"], [{"offset": 0, "size": 5}])
+
+        # an incomplete upload can't be committed
+        response = self.client.post(
+            reverse(
+                "galaxy:api:v3:collection-artifact-chunked-upload-commit",
+                kwargs={"pk": upload_id},
+            ),
+            {"sha256": "a" * 64},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_chunked_upload_commit(self):
+        self.client.force_authenticate(user=self.admin_user)
+        filename = f"{self.namespace.name}-{self.collection.name}-2.0.0.tar.gz"
+        data = b"0123456789"
+
+        response = self.client.post(
+            reverse("galaxy:api:v3:collection-artifact-chunked-upload"),
+            {"filename": filename, "size": len(data)},
+            format="json",
+        )
+        upload_id = response.data["id"]
+        response = self.client.put(
+            reverse(
+                "galaxy:api:v3:collection-artifact-chunked-upload-detail",
+                kwargs={"pk": upload_id},
+            ),
+            {"file": SimpleUploadedFile("chunk", data)},
+            HTTP_CONTENT_RANGE=f"bytes 0-{len(data) - 1}/{len(data)}",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        commit_url = reverse(
+            "galaxy:api:v3:collection-artifact-chunked-upload-commit",
+            kwargs={"pk": upload_id},
+        )
+
+        # malformed digests are refused and leave the upload uncommitted
+        for sha256 in ("not-a-sha256", "z" * 64, "a" * 65):
+            response = self.client.post(commit_url, {"sha256": sha256}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data["errors"][0]["source"]["parameter"], "sha256")
+        self.assertFalse(models.CollectionUpload.objects.get(upload_id=upload_id).committed)
+
+        sha256 = hashlib.sha256(data).hexdigest()
+        with patch.object(
+            collection_viewsets,
+            "_dispatch_import_task",
+            wraps=collection_viewsets._dispatch_import_task,
+        ) as dispatch_import:
+            response = self.client.post(commit_url, {"sha256": sha256}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIn("task", response.data)
+        self.assertTrue(models.CollectionUpload.objects.get(upload_id=upload_id).committed)
+        # the whole file digest is checked by the import task
+        task_kwargs = dispatch_import.call_args.args[0]
+        self.assertEqual(task_kwargs["data"]["sha256"], sha256)
+        self.assertEqual(task_kwargs["data"]["expected_version"], "2.0.0")
+        self.assertTrue(
+            models.CollectionImport.objects.filter(
+                namespace=self.namespace, name=self.collection.name, version="2.0.0"
+            ).exists()
+        )
+
+        # an upload is committed only once
+        response = self.client.post(commit_url, {"sha256": sha256}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # unless the import task failed
+        collection_upload = models.CollectionUpload.objects.get(upload_id=upload_id)
+        Task.objects.filter(pk=collection_upload.task_id).update(state=TASK_STATES.FAILED)
+        response = self.client.post(commit_url, {"sha256": sha256}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+    def test_chunked_upload_commit_dispatch_error(self):
+        self.client.force_authenticate(user=self.admin_user)
+        filename = f"{self.namespace.name}-{self.collection.name}-2.0.0.tar.gz"
+        data = b"0123456789"
+
+        response = self.client.post(
+            reverse("galaxy:api:v3:collection-artifact-chunked-upload"),
+            {"filename": filename, "size": len(data)},
+            format="json",
+        )
+        upload_id = response.data["id"]
+        self.client.put(
+            reverse(
+                "galaxy:api:v3:collection-artifact-chunked-upload-detail",
+                kwargs={"pk": upload_id},
+            ),
+            {"file": SimpleUploadedFile("chunk", data)},
+            HTTP_CONTENT_RANGE=f"bytes 0-{len(data) - 1}/{len(data)}",
+        )
+
+        # the upload is released when the task can't be dispatched
+        with patch.object(
+            collection_viewsets, "_dispatch_import_task", side_effect=RuntimeError
+        ), self.assertRaises(RuntimeError):
+            self.client.post(
+                reverse(
+                    "galaxy:api:v3:collection-artifact-chunked-upload-commit",
+                    kwargs={"pk": upload_id},
+                ),
+                {"sha256": hashlib.sha256(data).hexdigest()},
+                format="json",
+            )
+        self.assertFalse(models.CollectionUpload.objects.get(upload_id=upload_id).committed)
+
     def test_collections_list(self):
         """Assert the call to v3/collections returns correct
         collections and versions
@@ -321,3 +485,40 @@ class TestCollectionViewsets(BaseTestCase):
     #     for field in ('manifest', 'files'):
     #         with self.subTest(field=field):
     #             self.assertNotIn(field, response.data[0])
+
+
+@override_settings(
+    GALAXY_DEPLOYMENT_MODE=DeploymentMode.STANDALONE.value,
+    GALAXY_COLLECTION_DOWNLOAD_URL_CACHE_TTL=10,
+)
+class TestCollectionArtifactDownloadUrlCache(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.view = CollectionArtifactDownloadView()
+        self.filename = "ns-name-1.0.0.tar.gz"
+        self.url = f"http://localhost/api/v3/artifacts/collections/published/{self.filename}"
+        self.distribution = MagicMock()
+        guard = self.distribution.content_guard.cast.return_value
+        guard.preauthenticate_url.side_effect = lambda url: f"{url}?validate_token=abc"
+        cache.clear()
+
+    def test_signed_url_is_reused(self):
+        with patch.object(
+            self.view, "_get_ansible_distribution", return_value=self.distribution
+        ) as get_distro:
+            first = self.view._get_preauthenticated_url("published", self.filename, self.url)
+            second = self.view._get_preauthenticated_url("published", self.filename, self.url)
+
+        self.assertEqual(first, second)
+        self.assertEqual(get_distro.call_count, 1)
+
+    @override_settings(GALAXY_COLLECTION_DOWNLOAD_URL_CACHE_TTL=0)
+    def test_cache_disabled(self):
+        with patch.object(
+            self.view, "_get_ansible_distribution", return_value=self.distribution
+        ) as get_distro:
+            self.view._get_preauthenticated_url("published", self.filename, self.url)
+            self.view._get_preauthenticated_url("published", self.filename, self.url)
+
+        self.assertEqual(get_distro.call_count, 2)
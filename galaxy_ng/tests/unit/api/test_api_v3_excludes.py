@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from pulp_ansible.app.models import Collection
+from rest_framework.test import APIRequestFactory
+
+from galaxy_ng.app.api.v3.views import ExcludesView
+from galaxy_ng.app.models import SyncList
+
+
+class TestSyncListExcludes(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.synclist = SyncList.objects.create(name="excludes-synclist", policy="exclude")
+        self.collection = Collection.objects.create(namespace="ns", name="one")
+        self.synclist.collections.add(self.collection)
+
+    def get(self, **headers):
+        request = APIRequestFactory().get("/excludes/", **headers)
+        with mock.patch.object(ExcludesView, "permission_classes", []):
+            return ExcludesView.as_view()(request, path="excludes-synclist")
+
+    def test_excludes_are_rebuilt_when_collections_change(self):
+        self.synclist.refresh_from_db()
+        version = self.synclist.excludes_etag
+        self.assertEqual(self.synclist.get_excludes(), ["ns.one"])
+
+        self.synclist.collections.add(Collection.objects.create(namespace="ns", name="two"))
+        self.synclist.refresh_from_db()
+        self.assertNotEqual(self.synclist.excludes_etag, version)
+        self.assertEqual(self.synclist.get_excludes(), ["ns.one", "ns.two"])
+
+        self.collection.delete()
+        self.synclist.refresh_from_db()
+        self.assertEqual(self.synclist.get_excludes(), ["ns.two"])
+
+    def test_save_keeps_excludes_version(self):
+        stale = SyncList.objects.get(pk=self.synclist.pk)
+        self.synclist.collections.clear()
+
+        stale.policy = "exclude"
+        stale.save()
+
+        self.synclist.refresh_from_db()
+        self.assertGreater(self.synclist.excludes_version, stale.excludes_version)
+
+    def test_other_processes_see_the_change(self):
+        etag = self.get()["ETag"]
+
+        # the cache of another worker does not see the invalidation
+        with mock.patch("galaxy_ng.app.models.synclist.cache") as other_cache:
+            other_cache.get.return_value = ["ns.one"]
+            self.synclist.collections.clear()
+            response = self.get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.synclist.refresh_from_db()
+        other_cache.get.assert_called_once_with(
+            SyncList.EXCLUDES_CACHE_KEY.format(self.synclist.pk, self.synclist.excludes_version)
+        )
+
+    def test_etag(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"collections": [{"name": "ns.one"}]})
+        etag = response["ETag"]
+
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.synclist.collections.clear()
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"collections": []})
+        self.assertNotEqual(response["ETag"], etag)
@@ -102,6 +102,30 @@ class TestV3NamespaceViewSet(BaseTestCase):
             log.debug("data: %s", data)
             self.assertEqual(len(data), Namespace.objects.all().count())
 
+    def test_namespace_list_groups_and_users(self):
+        self.client.force_authenticate(user=self.admin_user)
+        ns1 = self._create_namespace("unittestnamespace1", groups=[self.pe_group])
+        ns1.users = {self.regular_user: ["galaxy.collection_namespace_owner"]}
+        self._create_namespace("unittestnamespace2")
+
+        with self.settings(GALAXY_DEPLOYMENT_MODE=self.deployment_mode):
+            response = self.client.get(self.ns_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = {ns["name"]: ns for ns in response.data["data"]}
+
+        self.assertEqual(data["unittestnamespace1"]["groups"], [{
+            "id": self.pe_group.id,
+            "name": self.pe_group.name,
+            "object_roles": ["galaxy.collection_namespace_owner"],
+        }])
+        self.assertEqual(data["unittestnamespace1"]["users"], [{
+            "id": self.regular_user.id,
+            "name": self.regular_user.username,
+            "object_roles": ["galaxy.collection_namespace_owner"],
+        }])
+        self.assertEqual(data["unittestnamespace2"]["groups"], [])
+        self.assertEqual(data["unittestnamespace2"]["users"], [])
+
     def test_related_fields(self):
         self.client.force_authenticate(user=self.admin_user)
         regular_group = self._create_group("users", "regular_users", users=[self.regular_user])
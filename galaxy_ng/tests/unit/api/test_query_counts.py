@@ -0,0 +1,230 @@
+"""Guard against N+1 queries in the list endpoints.
+
+Every galaxy list endpoint is requested with two page sizes and the number of
+queries must not grow with the number of rows serialized, except for the
+endpoints listed in KNOWN_N_PLUS_ONE. Every endpoint must answer 200, except
+for the ones listed in EXPECTED_STATUS.
+
+The query counts of the large page are also checked against the baseline
+stored in query_counts.json. Until the baseline is generated ("generated" is
+false) that check is skipped. After an intended change, regenerate it with::
+
+    GALAXY_QUERY_COUNT_BASELINE_UPDATE=1 django-admin test \
+        galaxy_ng.tests.unit.api.test_query_counts
+"""
+import json
+import os
+
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.mixins import ListModelMixin
+
+from galaxy_ng.app.constants import DeploymentMode
+from galaxy_ng.app.models import Namespace
+from galaxy_ng.app.models import auth as auth_models
+from galaxy_ng.tests.performance import seed
+
+from .base import BaseTestCase
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "query_counts.json")
+
+SMALL_PAGE = 2
+LARGE_PAGE = 10
+
+# rows created for each kind of object, more than LARGE_PAGE
+ROWS = LARGE_PAGE + 2
+
+# endpoints that don't answer 200 in the standalone deployment mode
+EXPECTED_STATUS = {
+    # synclists are denied to everyone outside of insights
+    "galaxy:api:ui:v1:synclists-list": 403,
+    "galaxy:api:ui:v1:my-synclists-list": 403,
+    # redirects to the collections of the default distribution
+    "galaxy:api:v3:legacy-v3-collections-list": 302,
+}
+
+# endpoints that still run queries for each row, with the reason
+KNOWN_N_PLUS_ONE = {
+    "galaxy:api:ui:v1:collections-list": (
+        "distribution, repository, tags and signatures of the latest version "
+        "of each collection"
+    ),
+    "galaxy:api:ui:v1:collection-versions-list": (
+        "signatures, tags and repositories of each collection version"
+    ),
+    "galaxy:api:ui:v1:distributions-list": (
+        "repository, latest version and content count of each distribution"
+    ),
+    "galaxy:api:v3:collection-versions-search": (
+        "pulp_ansible view, loads the tags and repository version of each row"
+    ),
+}
+
+
+def iter_url_names(resolver=None, namespace=None):
+    """Yield the namespaced name and the view of every named url pattern."""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            child_namespace = namespace
+            if pattern.namespace:
+                child_namespace = ":".join(filter(None, [namespace, pattern.namespace]))
+            yield from iter_url_names(pattern, child_namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield ":".join(filter(None, [namespace, pattern.name])), pattern.callback
+
+
+def get_page_size_param(view_class):
+    """The query parameter that sets the page size of the view, if paginated."""
+    pagination_class = getattr(view_class, "pagination_class", None)
+    if pagination_class is None:
+        return None
+    return (
+        getattr(pagination_class, "limit_query_param", None)
+        or getattr(pagination_class, "page_size_query_param", None)
+    )
+
+
+def iter_list_endpoints(url_kwargs):
+    """Yield the name, url and page size parameter of every paginated galaxy list view.
+
+    Urls that need arguments other than the ones in ``url_kwargs`` are skipped.
+    """
+    seen = set()
+    for name, callback in iter_url_names():
+        if not name.startswith("galaxy:") or name in seen:
+            continue
+
+        view_class = getattr(callback, "cls", None)
+        actions = getattr(callback, "actions", None)
+        if view_class is None:
+            continue
+        if actions is not None:
+            if actions.get("get") != "list":
+                continue
+        elif not issubclass(view_class, ListModelMixin):
+            continue
+
+        page_size_param = get_page_size_param(view_class)
+        if page_size_param is None:
+            continue
+
+        for kwargs in ({}, url_kwargs):
+            try:
+                url = reverse(name, kwargs=kwargs)
+            except NoReverseMatch:
+                continue
+            seen.add(name)
+            yield name, url, page_size_param
+            break
+
+
+def load_baseline():
+    with open(BASELINE_FILE) as f:
+        return json.load(f)
+
+
+@override_settings(GALAXY_DEPLOYMENT_MODE=DeploymentMode.STANDALONE.value)
+class TestListEndpointQueryCounts(BaseTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed.seed_collections(volumes={"namespaces": ROWS, "collections": 1, "versions": 2})
+        seed.seed_legacy_roles(volumes={"legacy_namespaces": ROWS, "roles": 1})
+        for i in range(ROWS):
+            user = auth_models.User.objects.create(username=f"query_count_user_{i}")
+            group = auth_models.Group.objects.create(name=f"query_count_group_{i}")
+            group.user_set.add(user)
+
+    def setUp(self):
+        super().setUp()
+        self.admin_user = auth_models.User.objects.create(username="admin", is_superuser=True)
+        self.client.force_authenticate(user=self.admin_user)
+
+    def count_queries(self, url):
+        # warm up the caches (settings, feature flags, ...) before counting
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response.status_code, len(queries)
+
+    def count_namespace_queries(self, url):
+        table = f'"{Namespace._meta.db_table}"'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return sum(f"FROM {table}" in query["sql"] for query in queries.captured_queries)
+
+    def test_collections_list_loads_namespaces_in_bulk(self):
+        url = reverse(
+            "galaxy:api:ui:v1:collections-list",
+            kwargs={"distro_base_path": settings.GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH},
+        )
+        self.client.get(url)
+
+        self.assertEqual(
+            self.count_namespace_queries(f"{url}?limit={LARGE_PAGE}"),
+            self.count_namespace_queries(f"{url}?limit={SMALL_PAGE}"),
+        )
+
+    def measure(self, name, url, page_size_param):
+        """The query counts of the small and the large page of the endpoint.
+
+        Returns None when the endpoint answers the status listed in EXPECTED_STATUS.
+        """
+        expected_status = EXPECTED_STATUS.get(name, 200)
+        small_status, small = self.count_queries(f"{url}?{page_size_param}={SMALL_PAGE}")
+        large_status, large = self.count_queries(f"{url}?{page_size_param}={LARGE_PAGE}")
+        self.assertEqual(small_status, expected_status, url)
+        self.assertEqual(large_status, expected_status, url)
+        if expected_status != 200:
+            return None
+        return small, large
+
+    def test_query_counts_do_not_grow_with_page_size(self):
+        url_kwargs = {"distro_base_path": settings.GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH}
+        counts = {}
+
+        for name, url, page_size_param in iter_list_endpoints(url_kwargs):
+            with self.subTest(endpoint=name):
+                measured = self.measure(name, url, page_size_param)
+                if measured is None:
+                    continue
+
+                small, large = counts[name] = measured
+                if name not in KNOWN_N_PLUS_ONE:
+                    self.assertLessEqual(
+                        large, small,
+                        f"{url} runs {small} queries for {SMALL_PAGE} rows "
+                        f"and {large} for {LARGE_PAGE} rows"
+                    )
+
+        if os.environ.get("GALAXY_QUERY_COUNT_BASELINE_UPDATE"):
+            with open(BASELINE_FILE, "w") as f:
+                json.dump({
+                    "generated": True,
+                    "endpoints": {name: large for name, (_, large) in counts.items()},
+                }, f, indent=4, sort_keys=True)
+                f.write("\n")
+
+    def test_query_counts_match_baseline(self):
+        baseline = load_baseline()
+        if not baseline["generated"]:
+            self.skipTest("query_counts.json has not been generated yet")
+
+        url_kwargs = {"distro_base_path": settings.GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH}
+        for name, url, page_size_param in iter_list_endpoints(url_kwargs):
+            with self.subTest(endpoint=name):
+                measured = self.measure(name, url, page_size_param)
+                if measured is None:
+                    continue
+
+                self.assertIn(name, baseline["endpoints"], f"{url} is missing from the baseline")
+                large = measured[1]
+                self.assertLessEqual(
+                    large, baseline["endpoints"][name],
+                    f"{url} runs {large} queries, baseline is {baseline['endpoints'][name]}"
+                )
@@ -1,7 +1,14 @@
+from datetime import timedelta
+
 import galaxy_ng.app.metrics_collection.common_data
 from django.test import TestCase, override_settings
+from django.utils.timezone import now
 from unittest.mock import MagicMock, patch
 
+from galaxy_ng.app.metrics_collection.automation_analytics.collector import COLLECTOR_NAME
+from galaxy_ng.app.metrics_collection.automation_analytics.data import incremental_slicing
+from galaxy_ng.app.models import MetricsCollectionState
+
 
 class TestAutomationAnalyticsData(TestCase):
     @override_settings(ANSIBLE_API_HOSTNAME='https://example.com')
@@ -24,3 +31,41 @@ class TestAutomationAnalyticsData(TestCase):
         mock_request.assert_called_with("GET",
                                         'https://example.com/api-test/xxx/pulp/api/v3/status/')
         json_response.assert_called_once()
+
+    def test_updated_between(self):
+        updated_between = galaxy_ng.app.metrics_collection.common_data.updated_between
+        since = now() - timedelta(days=1)
+        until = now()
+
+        self.assertEqual(updated_between("pulp_last_updated"), "")
+        self.assertEqual(
+            updated_between("pulp_last_updated", since, until),
+            "WHERE pulp_last_updated > %(since)s AND pulp_last_updated <= %(until)s"
+        )
+        self.assertNotIn(
+            "WHERE",
+            galaxy_ng.app.metrics_collection.common_data.collection_downloads_query()
+        )
+
+    def test_incremental_slicing(self):
+        last_gather = now() - timedelta(weeks=2)
+        watermark = now() - timedelta(days=1)
+        until = now()
+
+        # no watermark yet, starts from the last gathering
+        self.assertEqual(
+            incremental_slicing("collections", last_gather, until=until),
+            [(last_gather, until)]
+        )
+
+        MetricsCollectionState.save_last_gathered_entries(
+            COLLECTOR_NAME, {"collections": watermark}
+        )
+        self.assertEqual(
+            incremental_slicing("collections", last_gather, until=until),
+            [(watermark, until)]
+        )
+
+        # full sync exports the whole table
+        since, _ = incremental_slicing("collections", last_gather, full_sync_enabled=True)[0]
+        self.assertIsNone(since)
@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+from django.test import TestCase
+
+from galaxy_ng.app.metrics_collection.csv_file_splitter import CsvFileSplitter
+
+
+class TestCsvFileSplitter(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filespec = os.path.join(self.tmp_dir, "table.csv")
+
+    def _read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_single_file(self):
+        splitter = CsvFileSplitter(filespec=self.filespec, max_file_size=1024)
+        splitter.write(memoryview(b"id,name\n"))
+        splitter.write(memoryview(b"1,foo\n"))
+
+        self.assertEqual(splitter.file_list(), [self.filespec])
+        self.assertEqual(self._read(self.filespec), b"id,name\n1,foo\n")
+
+    def test_split_repeats_header(self):
+        splitter = CsvFileSplitter(filespec=self.filespec, max_file_size=12)
+        for row in (b"id,name\n", b"1,foo\n", b"2,bar\n"):
+            splitter.write(row)
+
+        files = splitter.file_list()
+        self.assertEqual(len(files), 2)
+        self.assertEqual(self._read(files[0]), b"id,name\n1,foo\n")
+        self.assertEqual(self._read(files[1]), b"id,name\n2,bar\n")
+
+    def test_empty_dump(self):
+        splitter = CsvFileSplitter(filespec=self.filespec, max_file_size=1024)
+        splitter.write(b"id,name\n")
+
+        self.assertEqual(splitter.file_list(), [])
+        self.assertEqual(os.listdir(self.tmp_dir), [])
@@ -0,0 +1,66 @@
+import importlib
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from pulp_ansible.app.models import AnsibleRepository
+
+from galaxy_ng.tests.performance import seed
+
+command_module = importlib.import_module(
+    "galaxy_ng.app.management.commands.sign-and-move-collections"
+)
+
+
+class TestSignAndMoveCollectionsCommand(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.staging = AnsibleRepository.objects.get(name="staging")
+        self.published = AnsibleRepository.objects.get(name="published")
+        self.collection_versions = seed.seed_collections(
+            repository=self.staging,
+            volumes={"namespaces": 1, "collections": 1, "versions": 5},
+        )
+
+    def call_command(self, *args):
+        out = StringIO()
+        with mock.patch.object(command_module, "SigningService") as signing_service_class, \
+                mock.patch.object(command_module, "call_bulk_sign_and_move_task") as call_task:
+            call_command(
+                "sign-and-move-collections", "--source=staging", *args, stdout=out
+            )
+        return out.getvalue(), signing_service_class.objects.get.return_value, call_task
+
+    def test_batches(self):
+        out, signing_service, call_task = self.call_command("--batch-size=2")
+
+        self.assertIn("5 collection versions will be signed and moved", out)
+        self.assertEqual(call_task.call_count, 3)
+
+        batches = [c.args[1] for c in call_task.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(
+            sorted(cv.pk for batch in batches for cv in batch),
+            sorted(cv.pk for cv in self.collection_versions),
+        )
+        for c in call_task.call_args_list:
+            self.assertEqual(c.args[0], signing_service)
+            self.assertEqual(c.args[2], self.staging)
+            self.assertEqual(c.args[3], self.published)
+
+    def test_skips_collection_versions_in_destination(self):
+        with self.published.new_version() as new_version:
+            new_version.add_content(
+                self.staging.latest_version().content.filter(pk=self.collection_versions[0].pk)
+            )
+
+        out, _, call_task = self.call_command()
+
+        self.assertIn("4 collection versions will be signed and moved", out)
+        self.assertNotIn(self.collection_versions[0], call_task.call_args.args[1])
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(CommandError):
+            self.call_command("--batch-size=0")
@@ -0,0 +1,73 @@
+import importlib
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from pulp_ansible.app.models import AnsibleDistribution, AnsibleRepository
+
+command_module = importlib.import_module(
+    "galaxy_ng.app.management.commands.update-synclist-distros"
+)
+
+
+class TestUpdateSynclistDistrosCommand(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.published = AnsibleRepository.objects.get(name="published")
+        self.other = AnsibleRepository.objects.create(name="other-repo")
+        for name, repository in (
+            ("111-synclist", self.other),
+            ("222-synclist", None),
+            ("333-synclist", self.published),
+            ("synclist-not", self.other),
+        ):
+            AnsibleDistribution.objects.create(name=name, base_path=name, repository=repository)
+
+    def repositories(self):
+        return dict(AnsibleDistribution.objects.filter(
+            name__in=["111-synclist", "222-synclist", "333-synclist", "synclist-not"]
+        ).values_list("name", "repository"))
+
+    def call_command(self, *args):
+        out = StringIO()
+        with mock.patch.object(command_module, "Cache") as cache_class, \
+                mock.patch.object(command_module, "update_index") as update_index:
+            call_command("update-synclist-distros", *args, stdout=out)
+        self.update_index = update_index
+        return out.getvalue(), cache_class
+
+    def test_dry_run(self):
+        before = self.repositories()
+
+        out, cache_class = self.call_command("--dry-run")
+
+        self.assertIn("2 of 3 synclist distributions would point to published", out)
+        self.assertEqual(self.repositories(), before)
+        cache_class.assert_not_called()
+        self.update_index.assert_not_called()
+
+    @override_settings(CACHE_ENABLED=True, DOMAIN_ENABLED=False)
+    def test_update(self):
+        out, cache_class = self.call_command()
+
+        self.assertIn("2 synclist distributions now point to published", out)
+        self.assertEqual(self.repositories(), {
+            "111-synclist": self.published.pk,
+            "222-synclist": self.published.pk,
+            "333-synclist": self.published.pk,
+            "synclist-not": self.other.pk,
+        })
+        # the content cache of the updated distributions is invalidated
+        base_keys = cache_class.return_value.delete.call_args.kwargs["base_key"]
+        self.assertEqual(sorted(base_keys), ["111-synclist", "222-synclist"])
+        # the index of the published repo is updated once for all distributions
+        self.update_index.assert_called_once_with(repository=self.published, is_latest=True)
+
+    @override_settings(CACHE_ENABLED=False)
+    def test_update_without_cache(self):
+        out, cache_class = self.call_command()
+
+        self.assertIn("2 synclist distributions now point to published", out)
+        cache_class.assert_not_called()
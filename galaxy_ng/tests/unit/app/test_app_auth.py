@@ -1,6 +1,7 @@
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.test import override_settings
 from pulp_ansible.app.models import AnsibleDistribution, AnsibleRepository
 from pulpcore.plugin.models.role import Role
@@ -55,3 +56,25 @@ class TestRHIdentityAuth(BaseTestCase):
 
         # assert objects do not exist: repo
         self.assertFalse(AnsibleRepository.objects.filter(name=synclist_name))
+
+    @override_settings(GALAXY_RH_IDENTITY_CACHE_TTL=60)
+    def test_authenticate_cached(self):
+        cache.clear()
+        x_rh_identity = rh_auth_utils.user_x_rh_identity("user_cached_rh_auth", "13579")
+        request = Mock()
+        request.META = {"HTTP_X_RH_IDENTITY": x_rh_identity}
+        rh_id_auth = RHIdentityAuthentication()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user, _ = rh_id_auth.authenticate(request)
+
+        with patch.object(rh_id_auth, "_ensure_group") as ensure_group:
+            cached_user, auth = rh_id_auth.authenticate(request)
+        ensure_group.assert_not_called()
+        self.assertEqual(cached_user, user)
+        self.assertIn("rh_identity", auth)
+
+        # a deleted user is provisioned again
+        user.delete()
+        cached_user, _ = rh_id_auth.authenticate(request)
+        self.assertEqual(cached_user.username, "user_cached_rh_auth")
@@ -16,3 +16,15 @@ class TestInisightsStatements(BaseTestCase):
                     self.assertNotIn("has_rh_entitlements", condition)
                 else:
                     self.assertIn("has_rh_entitlements", condition)
+
+    def test_chunked_upload_statements(self):
+        for action in ("create", "retrieve_upload", "upload_chunk", "commit_upload"):
+            statements = [
+                statement for statement in INSIGHTS_STATEMENTS["CollectionViewSet"]
+                if statement["effect"] == "allow" and (
+                    statement["action"] == action or action in list(statement["action"])
+                )
+            ]
+            self.assertEqual(len(statements), 1, action)
+            self.assertIn("can_create_collection", statements[0]["condition"])
+            self.assertIn("has_rh_entitlements", statements[0]["condition"])
@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from galaxy_ng.app.auth import keycloak
+from galaxy_ng.app.auth.keycloak import KeycloakBasicAuth
+from galaxy_ng.app.models import User
+
+
+@override_settings(
+    GALAXY_KEYCLOAK_BASIC_AUTH_CACHE_TTL=60,
+    SOCIAL_AUTH_KEYCLOAK_KEY="galaxy",
+    SOCIAL_AUTH_KEYCLOAK_SECRET="secret",
+    SOCIAL_AUTH_KEYCLOAK_ACCESS_TOKEN_URL="https://keycloak/token",
+    GALAXY_VERIFY_KEYCLOAK_SSL_CERTS=False,
+)
+class TestKeycloakBasicAuthCache(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="keycloak_user")
+
+        patcher = mock.patch.object(keycloak, "requests_post")
+        self.post = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.post.return_value.status_code = 200
+        self.post.return_value.json.return_value = {"access_token": "abc", "expires_in": 300}
+
+        for name in ("load_strategy", "KeycloakOAuth2"):
+            patcher = mock.patch.object(keycloak, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        keycloak.load_strategy.return_value.authenticate.return_value = self.user
+
+    def test_credentials_are_cached(self):
+        auth = KeycloakBasicAuth()
+
+        self.assertEqual(auth.authenticate_credentials("keycloak_user", "pass"), (self.user, None))
+        self.assertEqual(auth.authenticate_credentials("keycloak_user", "pass"), (self.user, None))
+        self.assertEqual(self.post.call_count, 1)
+
+        cached = cache.get(auth._cache_key("keycloak_user"))
+        self.assertNotIn(b"pass", cached[2])
+
+        # another password is checked by keycloak
+        auth.authenticate_credentials("keycloak_user", "other")
+        self.assertEqual(self.post.call_count, 2)
+
+    def test_rejected_credentials_are_forgotten(self):
+        auth = KeycloakBasicAuth()
+        auth.authenticate_credentials("keycloak_user", "pass")
+
+        # the password was changed in keycloak
+        self.post.return_value.status_code = 401
+        with mock.patch("rest_framework.authentication.BasicAuthentication"
+                        ".authenticate_credentials") as basic_auth:
+            auth.authenticate_credentials("keycloak_user", "new")
+        basic_auth.assert_called_once()
+        self.assertIsNone(cache.get(auth._cache_key("keycloak_user")))
@@ -0,0 +1,35 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from galaxy_ng.app.auth.ldap import GalaxyLDAPBackend
+from galaxy_ng.app.models.auth import Group, User
+
+
+@override_settings(GALAXY_LDAP_MIRROR_ONLY_EXISTING_GROUPS=True)
+class TestGalaxyLDAPMirrorGroups(TestCase):
+
+    def setUp(self):
+        for name in ("admins", "developers", "operators"):
+            Group.objects.create(name=name)
+        self.user = User.objects.create(username="ldap_user")
+        self.user.groups.add(Group.objects.get(name="operators"))
+
+    def test_only_login_groups_are_loaded(self):
+        backend = GalaxyLDAPBackend()
+        ldap_user = mock.Mock(group_names=["developers", "unknown"])
+
+        with mock.patch(
+            "django_auth_ldap.backend.LDAPBackend.get_or_build_user",
+            return_value=(self.user, False),
+        ):
+            backend.get_or_build_user("ldap_user", ldap_user)
+
+        self.assertEqual(
+            backend.settings.login_group_names, {"developers", "unknown", "operators"}
+        )
+        self.assertEqual(backend.settings.MIRROR_GROUPS, {"developers", "operators"})
+
+    def test_all_groups_without_login(self):
+        backend = GalaxyLDAPBackend()
+        self.assertEqual(backend.settings.MIRROR_GROUPS, {"admins", "developers", "operators"})
@@ -0,0 +1,74 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import ResolverMatch
+from prometheus_client import REGISTRY
+
+from galaxy_ng.app.access_control.access_policy import get_view_metrics_label
+from galaxy_ng.app.common.middleware import RequestMetricsMiddleware
+from galaxy_ng.app.models import User
+
+
+class NoEndpointViewSet:
+    """Like the pulp viewsets whose endpoint_pieces is None."""
+
+    @classmethod
+    def urlpattern(cls):
+        raise TypeError("endpoint_pieces is None")
+
+
+class TestRequestMetricsMiddleware(TestCase):
+
+    def _sample(self, name, labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_get_view_metrics_label(self):
+        request = RequestFactory().get("/")
+        self.assertEqual(get_view_metrics_label(None, request), "unresolved")
+
+        request.resolver_match = ResolverMatch(
+            lambda request: None, (), {}, url_name="my-view", namespaces=["galaxy"]
+        )
+        self.assertEqual(get_view_metrics_label(None, request), "galaxy:my-view")
+
+    def test_get_view_metrics_label_without_urlpattern(self):
+        # endpoint_pieces is None, urlpattern() raises a TypeError
+        request = RequestFactory().post("/v3/artifacts/collections/")
+        request.resolver_match = ResolverMatch(
+            lambda request: None, (), {}, route="v3/artifacts/collections/"
+        )
+        self.assertEqual(
+            get_view_metrics_label(NoEndpointViewSet, request), "v3/artifacts/collections/"
+        )
+        self.assertEqual(get_view_metrics_label(NoEndpointViewSet()), "unresolved")
+
+    def test_request_metrics(self):
+        def get_response(request):
+            list(User.objects.all())
+            list(User.objects.all())
+            return HttpResponse(b"x" * 10)
+
+        middleware = RequestMetricsMiddleware(get_response)
+        request = RequestFactory().get("/")
+        middleware.process_view(request, lambda request: None, (), {})
+        view = request._galaxy_metrics_view
+
+        queries = self._sample("galaxy_api_request_db_queries_sum", {"view": view})
+        requests = self._sample(
+            "galaxy_api_request_latency_seconds_count", {"view": view, "method": "GET"}
+        )
+        size = self._sample("galaxy_api_response_size_bytes_sum", {"view": view})
+
+        middleware(request)
+
+        self.assertEqual(
+            self._sample("galaxy_api_request_db_queries_sum", {"view": view}), queries + 2
+        )
+        self.assertEqual(
+            self._sample(
+                "galaxy_api_request_latency_seconds_count", {"view": view, "method": "GET"}
+            ),
+            requests + 1
+        )
+        self.assertEqual(
+            self._sample("galaxy_api_response_size_bytes_sum", {"view": view}), size + 10
+        )
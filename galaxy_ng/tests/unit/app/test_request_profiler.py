@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+import time
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from galaxy_ng.app.common import profiler
+from galaxy_ng.app.common.middleware import RequestProfilerMiddleware
+from galaxy_ng.app.common.profiler import RequestProfiler, should_profile
+from galaxy_ng.app.dynamic_settings import DYNAMIC_SETTINGS_SCHEMA
+from galaxy_ng.app.models import User
+
+
+class TestRequestProfiler(TestCase):
+
+    def setUp(self):
+        # the profiler settings are cached per process
+        profiler._settings.clear()
+
+    @override_settings(
+        GALAXY_REQUEST_PROFILER_SAMPLE_RATE=0.5,
+        GALAXY_REQUEST_PROFILER_URL_PATTERNS=[r"/v3/collections/"],
+    )
+    def test_should_profile(self):
+        path = "/api/galaxy/v3/collections/"
+        self.assertTrue(should_profile(path, rng=lambda: 0.1))
+        self.assertFalse(should_profile(path, rng=lambda: 0.9))
+        self.assertFalse(should_profile("/api/galaxy/v3/namespaces/", rng=lambda: 0.1))
+
+        with override_settings(GALAXY_REQUEST_PROFILER_SAMPLE_RATE=0):
+            profiler._settings.clear()
+            self.assertFalse(should_profile(path, rng=lambda: 0.0))
+
+    @override_settings(
+        GALAXY_REQUEST_PROFILER_SAMPLE_RATE=1,
+        GALAXY_REQUEST_PROFILER_URL_PATTERNS=[r"/v3/collections/"],
+    )
+    def test_settings_are_cached(self):
+        path = "/api/galaxy/v3/collections/"
+        self.assertTrue(should_profile(path))
+
+        with override_settings(GALAXY_REQUEST_PROFILER_SAMPLE_RATE=0):
+            self.assertTrue(should_profile(path))
+
+            profiler._settings["expires"] = 0
+            self.assertFalse(should_profile(path))
+
+    def test_middleware_not_used_when_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestProfilerMiddleware(lambda request: HttpResponse(b"ok"))
+
+    @override_settings(
+        GALAXY_REQUEST_PROFILER_SAMPLE_RATE=1,
+        GALAXY_REQUEST_PROFILER_URL_PATTERNS=[r"/v3/(collections/", r"/v3/namespaces/"],
+    )
+    def test_invalid_pattern_is_skipped(self):
+        with self.assertLogs("galaxy_ng.app.common.profiler", level="ERROR"):
+            self.assertTrue(should_profile("/api/galaxy/v3/namespaces/"))
+        self.assertFalse(should_profile("/api/galaxy/v3/collections/"))
+
+    def test_url_patterns_validator(self):
+        validator = DYNAMIC_SETTINGS_SCHEMA["GALAXY_REQUEST_PROFILER_URL_PATTERNS"]["validator"]
+        self.assertTrue(validator.condition([r"^/api/", r"/v3/collections/"]))
+        self.assertFalse(validator.condition([r"/v3/(collections/"]))
+
+    def test_profile_is_written(self):
+        def get_response(request):
+            list(User.objects.all())
+            time.sleep(0.05)
+            return HttpResponse(b"ok")
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            GALAXY_REQUEST_PROFILER_ENABLED=True,
+            GALAXY_REQUEST_PROFILER_SAMPLE_RATE=1,
+            GALAXY_REQUEST_PROFILER_URL_PATTERNS=[r"^/slow/"],
+            GALAXY_REQUEST_PROFILER_INTERVAL=0.001,
+            GALAXY_REQUEST_PROFILER_DIR=directory,
+        ):
+            response = RequestProfilerMiddleware(get_response)(RequestFactory().get("/slow/"))
+            self.assertEqual(response.status_code, 200)
+
+            files = sorted(os.listdir(directory))
+            self.assertEqual(len(files), 2)
+            folded, info = [os.path.join(directory, f) for f in files]
+            self.assertTrue(folded.endswith(".folded"))
+
+            with open(folded) as f:
+                stacks = f.read().splitlines()
+            self.assertTrue(any("get_response" in stack for stack in stacks))
+            self.assertTrue(all(stack.rsplit(" ", 1)[1].isdigit() for stack in stacks))
+
+            with open(info) as f:
+                data = json.load(f)
+            self.assertEqual(data["path"], "/slow/")
+            self.assertEqual(data["status"], 200)
+            self.assertEqual(data["db_queries"], 1)
+
+    @override_settings(GALAXY_REQUEST_PROFILER_MAX_PROFILES=2)
+    def test_oldest_profiles_are_deleted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for age, name in ((200, "oldest"), (100, "older")):
+                for extension in ("folded", "json"):
+                    path = os.path.join(directory, f"{name}.{extension}")
+                    open(path, "w").close()
+                    os.utime(path, (time.time() - age, time.time() - age))
+
+            with RequestProfiler() as request_profiler:
+                pass
+            folded = request_profiler.write(RequestFactory().get("/slow/"), directory=directory)
+
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                sorted(["older.folded", "older.json", os.path.basename(folded),
+                        os.path.basename(folded)[:-len(".folded")] + ".json"]),
+            )
@@ -1,16 +1,29 @@
 import logging
 import os
 import tempfile
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
 
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from prometheus_client import REGISTRY
 from django.test import TestCase, override_settings
 from pulp_ansible.app.models import (
+    AnsibleRepository,
     Collection,
     CollectionVersion,
 )
 from pulpcore.plugin.models import Artifact, ContentArtifact, PulpTemporaryFile
 
-from galaxy_ng.app.tasks.publishing import _log_collection_upload
+from galaxy_ng.app.common.instrumentation import instrument_task, task_items, task_phase
+from galaxy_ng.app.models import Namespace
+from galaxy_ng.app.tasks import promotion
+from galaxy_ng.app.tasks.namespaces import AVATAR_VALIDATORS_CACHE_KEY, _download_avatars
+from galaxy_ng.app.tasks.publishing import (
+    _log_collection_upload,
+    group_collection_versions_by_namespace,
+)
+from galaxy_ng.app.tasks.signing import sign_and_move
 
 log = logging.getLogger(__name__)
 logging.getLogger().setLevel(logging.DEBUG)
@@ -53,3 +66,170 @@ class TestTaskPublish(TestCase):
                 "INFO:automated_logging:Collection uploaded by user 'admin': namespace-name-0.0.1",
                 lm.output
             )
+
+    def test_group_collection_versions_by_namespace(self):
+        Namespace.objects.get_or_create(name='my_ns')
+        collection = self.collection_version.collection
+        other_collection = Collection.objects.create(namespace='other_ns', name='my_name')
+
+        first, second = [
+            CollectionVersion.objects.create(
+                collection=collection, namespace='my_ns', name='my_name', version=version
+            )
+            for version in ('2.0.0', '3.0.0')
+        ]
+        other = CollectionVersion.objects.create(
+            collection=other_collection, namespace='other_ns', name='my_name', version='1.0.0'
+        )
+
+        groups = list(group_collection_versions_by_namespace([first, other, second]))
+
+        self.assertEqual(groups, [([], [first, second]), ([], [other])])
+
+    def test_call_auto_approve_task_finishes_task_group_once(self):
+        repo = AnsibleRepository.objects.create(name=f'auto-approve-{uuid4()}')
+        task_group = MagicMock()
+        batches = [([], [self.collection_version]), (['ns-pk'], [self.collection_version])]
+
+        with patch.object(promotion.TaskGroup, 'current', return_value=task_group), \
+                patch.object(promotion, 'dispatch') as dispatch:
+            tasks = promotion.call_auto_approve_task(iter(batches), repo)
+
+        self.assertEqual(len(tasks), 2)
+        self.assertEqual(dispatch.call_count, 2)
+        self.assertEqual(dispatch.call_args.kwargs['kwargs']['ns_pk_list'], ['ns-pk'])
+        task_group.finish.assert_called_once_with()
+
+
+class TestDownloadAvatars(TestCase):
+
+    def test_download_avatars_deduplicates_urls(self):
+        fetched = []
+
+        async def _fetch_avatar(session, semaphore, url, validators):
+            fetched.append(url)
+            if url == "https://example.com/invalid.png":
+                raise ValidationError("not an image")
+            raise ConnectionError("unreachable")
+
+        urls = [
+            "https://example.com/invalid.png",
+            "https://example.com/down.png",
+            "https://example.com/invalid.png",
+        ]
+        with patch("galaxy_ng.app.tasks.namespaces._fetch_avatar", _fetch_avatar):
+            avatars = _download_avatars(urls)
+
+        self.assertEqual(sorted(fetched), sorted(set(urls)))
+        self.assertIsInstance(avatars["https://example.com/invalid.png"], ValidationError)
+        self.assertIsNone(avatars["https://example.com/down.png"])
+
+
+class TestDownloadAvatarsNotModified(TestCase):
+
+    def test_not_modified_with_removed_artifact_is_fetched_again(self):
+        url = "https://example.com/avatar.svg"
+        validators = {"etag": "abc", "last_modified": None, "sha256": "old"}
+        new_validators = {"etag": "def", "last_modified": None, "sha256": "new"}
+        fetched = []
+
+        async def _fetch_avatar(session, semaphore, url, validators):
+            fetched.append(validators)
+            if validators:
+                return validators["sha256"], None, validators
+            return "new", "/tmp/avatar", new_validators
+
+        with patch("galaxy_ng.app.tasks.namespaces._fetch_avatar", _fetch_avatar), \
+                patch("galaxy_ng.app.tasks.namespaces._avatar_artifact") as avatar_artifact, \
+                patch("galaxy_ng.app.tasks.namespaces.Artifact") as artifact_class, \
+                patch("galaxy_ng.app.tasks.namespaces.cache") as cache:
+            cache.get.return_value = validators
+            # the stored image is removed (e.g. by orphan cleanup) after it was checked
+            artifact_class.objects.filter.return_value.exists.side_effect = [True, False]
+            avatars = _download_avatars([url])
+
+        self.assertEqual(fetched, [validators, None])
+        avatar_artifact.assert_called_once_with(url, "new", "/tmp/avatar")
+        self.assertEqual(avatars[url], avatar_artifact.return_value)
+        cache.set.assert_called_once_with(
+            AVATAR_VALIDATORS_CACHE_KEY.format(url=url), new_validators, None
+        )
+
+
+class TestSignAndMove(TestCase):
+
+    @patch("galaxy_ng.app.tasks.signing.move_collection")
+    @patch("galaxy_ng.app.tasks.signing.sign")
+    def test_sign_and_move_batch(self, sign, move_collection):
+        sign_and_move(
+            signing_service_pk="service",
+            source_repo_pk="staging",
+            dest_repo_pk="published",
+            collection_version_pks=["cv1", "cv2", "cv3"],
+        )
+
+        # a single signing task and a single move for the whole batch
+        sign.assert_called_once_with(
+            repository_href="staging",
+            content_hrefs=["cv1", "cv2", "cv3"],
+            signing_service_href="service",
+        )
+        move_collection.assert_called_once_with(
+            cv_pk_list=["cv1", "cv2", "cv3"],
+            src_repo_pk="staging",
+            dest_repo_list=["published"],
+        )
+
+    @patch("galaxy_ng.app.tasks.signing.move_collection")
+    @patch("galaxy_ng.app.tasks.signing.sign")
+    def test_sign_and_move_single_collection_version(self, sign, move_collection):
+        sign_and_move(
+            signing_service_pk="service",
+            collection_version_pk="cv1",
+            source_repo_pk="staging",
+            dest_repo_pk="published",
+        )
+
+        self.assertEqual(sign.call_args.kwargs["content_hrefs"], ["cv1"])
+        self.assertEqual(move_collection.call_args.kwargs["cv_pk_list"], ["cv1"])
+
+
+class TestTaskInstrumentation(TestCase):
+
+    def _sample(self, name, labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_instrument_task(self):
+        @instrument_task("test_task")
+        def _task():
+            with task_phase("load"):
+                list(Namespace.objects.all())
+            with task_phase("load"):
+                list(Namespace.objects.all())
+            task_items(3)
+            return "done"
+
+        labels = {"task": "test_task"}
+        runs = self._sample("galaxy_task_duration_seconds_count", labels)
+        queries = self._sample("galaxy_task_db_queries_sum", labels)
+        items = self._sample("galaxy_task_items_processed_total", labels)
+        phases = self._sample(
+            "galaxy_task_phase_seconds_count", {"task": "test_task", "phase": "load"}
+        )
+
+        self.assertEqual(_task(), "done")
+
+        self.assertEqual(self._sample("galaxy_task_duration_seconds_count", labels), runs + 1)
+        self.assertEqual(self._sample("galaxy_task_db_queries_sum", labels), queries + 2)
+        self.assertEqual(self._sample("galaxy_task_items_processed_total", labels), items + 3)
+        # the time of both blocks is added to a single observation of the phase
+        self.assertEqual(
+            self._sample(
+                "galaxy_task_phase_seconds_count", {"task": "test_task", "phase": "load"}
+            ),
+            phases + 1
+        )
+
+    def test_task_phase_outside_instrumented_task(self):
+        with task_phase("load"):
+            task_items(1)
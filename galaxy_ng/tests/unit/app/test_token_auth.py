@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+
+from galaxy_ng.app.auth.token import ExpiringTokenAuthentication, token_cache_key
+from galaxy_ng.app.models import User
+
+
+@override_settings(GALAXY_TOKEN_CACHE_TTL=60)
+class TestTokenAuthenticationCache(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="token_user")
+        self.token = Token.objects.create(user=self.user)
+        self.auth = ExpiringTokenAuthentication()
+
+    def test_cached_token_is_a_single_query(self):
+        user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            user, token = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+        self.assertEqual(len(queries), 1)
+
+    def test_deleted_token_is_rejected_by_other_processes(self):
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+        cached = cache.get(token_cache_key(key))
+
+        self.token.delete()
+        # the cache of another process still has the token
+        cache.set(token_cache_key(key), cached)
+
+        with self.assertRaisesMessage(exceptions.AuthenticationFailed, "Invalid token"):
+            self.auth.authenticate_credentials(key)
+
+    def test_regenerated_token_is_invalidated(self):
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+
+        self.token.delete()
+        Token.objects.create(user=self.user)
+
+        with self.assertRaisesMessage(exceptions.AuthenticationFailed, "Invalid token"):
+            self.auth.authenticate_credentials(key)
+
+    def test_deactivated_user_is_invalidated(self):
+        self.auth.authenticate_credentials(self.token.key)
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaisesMessage(exceptions.AuthenticationFailed, "inactive"):
+            self.auth.authenticate_credentials(self.token.key)
@@ -0,0 +1,184 @@
+import argparse
+import asyncio
+from collections import Counter
+from unittest import TestCase
+
+from galaxy_ng.tests.performance import loadgen
+from galaxy_ng.tests.performance.loadgen import (
+    DEFAULT_MIX,
+    LoadGenerator,
+    format_report,
+    parse_mix,
+)
+
+SERVER = "http://localhost:5001/api/galaxy/"
+DOWNLOAD_URL = "http://localhost:24816/download/my_ns-my_name-1.0.0.tar.gz"
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return b""
+
+
+class FakeSession:
+    """Answers requests with the status mapped to the first matching url part."""
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        for part, status in self.statuses.items():
+            if part in url:
+                return FakeResponse(status)
+        return FakeResponse(200)
+
+
+class TestLoadGenerator(TestCase):
+
+    def get_generator(self, **kwargs):
+        generator = LoadGenerator(SERVER, **kwargs)
+        generator.roles = [(1, "geerlingguy", "apache")]
+        generator.collection_versions = [("my_ns", "my_name", "1.0.0", DOWNLOAD_URL)]
+        return generator
+
+    def test_parse_mix(self):
+        self.assertEqual(
+            parse_mix("role_lookup=40,collection_download=10"),
+            {"role_lookup": 40, "collection_download": 10},
+        )
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_mix("role_lookup=40,role_import=10")
+        with self.assertRaises(ValueError):
+            parse_mix("role_lookup=many")
+
+    def test_next_request_urls(self):
+        generator = self.get_generator()
+        urls = {}
+        for kind in DEFAULT_MIX:
+            generator.mix = {kind: 1}
+            urls[kind] = generator.next_request()
+
+        self.assertEqual(urls, {
+            "role_lookup": (
+                "role_lookup", f"{SERVER}v1/roles/?owner__username=geerlingguy&name=apache"
+            ),
+            "role_versions": ("role_versions", f"{SERVER}v1/roles/1/versions/"),
+            "collection_versions": (
+                "collection_versions",
+                f"{SERVER}v3/plugin/ansible/content/published/collections/index/"
+                "my_ns/my_name/versions/?limit=100",
+            ),
+            "collection_version": (
+                "collection_version",
+                f"{SERVER}v3/plugin/ansible/content/published/collections/index/"
+                "my_ns/my_name/versions/1.0.0/",
+            ),
+            "collection_download": ("collection_download", DOWNLOAD_URL),
+        })
+
+    def test_next_request_follows_the_mix(self):
+        generator = self.get_generator(mix={"role_lookup": 3, "collection_version": 1}, seed=1)
+
+        kinds = Counter(generator.next_request()[0] for _ in range(4000))
+
+        self.assertEqual(set(kinds), {"role_lookup", "collection_version"})
+        self.assertAlmostEqual(kinds["role_lookup"] / 4000, 0.75, delta=0.03)
+
+    def test_next_request_is_seeded(self):
+        first, second = self.get_generator(seed=3), self.get_generator(seed=3)
+
+        self.assertEqual(
+            [first.next_request() for _ in range(50)],
+            [second.next_request() for _ in range(50)],
+        )
+
+    def test_discover_drops_kinds_without_content(self):
+        generator = LoadGenerator(SERVER)
+
+        async def _get_json(session, url):
+            if "/v1/roles/" in url:
+                return {"results": []}
+            if url.endswith("/versions/1.0.0/"):
+                return {"version": "1.0.0", "download_url": DOWNLOAD_URL}
+            return {"data": [
+                {"namespace": "my_ns", "name": "my_name", "highest_version": {"version": "1.0.0"}}
+            ]}
+
+        generator._get_json = _get_json
+        asyncio.run(generator.discover(session=None))
+
+        self.assertEqual(
+            generator.collection_versions, [("my_ns", "my_name", "1.0.0", DOWNLOAD_URL)]
+        )
+        self.assertEqual(set(generator.mix), {
+            "collection_versions", "collection_version", "collection_download"
+        })
+
+    def test_worker_records_samples_and_errors(self):
+        generator = self.get_generator(max_requests=200)
+        session = FakeSession({"/v1/roles/1/versions/": 500, DOWNLOAD_URL: 404})
+
+        deadline = loadgen.time.monotonic() + 60
+        asyncio.run(generator._worker(session, deadline))
+
+        self.assertEqual(generator.sent, 200)
+        self.assertEqual(len(session.urls), 200)
+        self.assertEqual(set(generator.errors), {"role_versions", "collection_download"})
+        self.assertEqual(
+            set(generator.samples), {"role_lookup", "collection_versions", "collection_version"}
+        )
+        recorded = sum(generator.errors.values()) + sum(map(len, generator.samples.values()))
+        self.assertEqual(recorded, 200)
+
+    def test_report(self):
+        generator = self.get_generator(concurrency=4)
+        generator.samples["role_lookup"] = [float(ms) for ms in range(1, 101)]
+        generator.samples["collection_version"] = [50.0, 150.0]
+        generator.errors["collection_version"] = 1
+        generator.errors["collection_download"] = 2
+        generator.elapsed = 10
+
+        report = generator.report()
+
+        self.assertEqual(report["concurrency"], 4)
+        self.assertEqual(report["duration"], 10)
+        self.assertEqual(
+            list(report["kinds"]), ["collection_download", "collection_version", "role_lookup"]
+        )
+        self.assertEqual(
+            report["kinds"]["collection_download"], {"requests": 2, "errors": 2}
+        )
+        self.assertEqual(report["kinds"]["collection_version"]["requests"], 3)
+        self.assertEqual(report["kinds"]["collection_version"]["max"], 150.0)
+        role_lookup = report["kinds"]["role_lookup"]
+        self.assertEqual(role_lookup["requests"], 100)
+        self.assertLessEqual(role_lookup["p50"], role_lookup["p90"])
+        self.assertLessEqual(role_lookup["p90"], role_lookup["p99"])
+        self.assertLessEqual(role_lookup["p99"], role_lookup["max"])
+
+        total = report["total"]
+        self.assertEqual(total["requests"], 105)
+        self.assertEqual(total["errors"], 3)
+        self.assertEqual(total["max"], 150.0)
+        self.assertEqual(total["throughput"], 10.5)
+
+        lines = format_report(report).splitlines()
+        self.assertIn("105 requests in 10.0s with concurrency 4: 10.5 req/s, 3 errors", lines[0])
+        self.assertEqual(len(lines), 2 + len(report["kinds"]) + 1)
+
+    def test_report_without_requests(self):
+        report = self.get_generator().report()
+
+        self.assertEqual(report["kinds"], {})
+        self.assertEqual(report["total"], {"requests": 0, "errors": 0, "throughput": 0})